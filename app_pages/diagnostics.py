@@ -0,0 +1,114 @@
+import streamlit as st
+from utils.copy_utils import get_copy_counts
+from utils.profiling import get_model_timings, get_page_timings, get_section_timings, request_profile
+
+
+def _timing_rows(summary, label, group='Page', count_label='Reruns'):
+    """Rows for a timing table, slowest p95 first"""
+    rows = []
+    for key, stats in summary.items():
+        row = {label: key} if isinstance(key, str) else {group: key[0], label: key[1]}
+        row.update({
+            count_label: stats['count'],
+            'p50 (ms)': round(stats['p50'], 2),
+            'p95 (ms)': round(stats['p95'], 2),
+            'p99 (ms)': round(stats['p99'], 2),
+            'Max (ms)': round(stats['max'], 2),
+        })
+        rows.append(row)
+    rows.sort(key=lambda row: row['p95 (ms)'], reverse=True)
+    return rows
+
+
+def show_response_cache():
+    """Hit and miss counters and size of the shared response cache"""
+    from utils.response_cache import get_response_cache
+
+    cache = get_response_cache()
+    stats = cache.stats()
+    st.markdown("### ♻️ Response Cache")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit rate", f"{stats['hit_rate']:.0%}")
+    col2.metric("Memory hits", stats['memory_hits'])
+    col3.metric("Disk hits", stats['disk_hits'])
+    col4.metric("Misses", stats['misses'])
+    st.caption(
+        f"{stats['disk_entries']} responses on disk ({stats['disk_bytes'] / 1024:.0f} KB of "
+        f"{cache.max_bytes / 1024 / 1024:.0f} MB), {stats['memory_entries']} in memory · "
+        f"{stats['stores']} stored, {stats['evictions']} evicted since the server started"
+    )
+    if st.button("🗑️ Clear Response Cache"):
+        cache.clear()
+        st.rerun()
+
+
+def show_startup():
+    """Prewarm timings of this server process"""
+    from utils.startup import get_startup_status
+
+    summary = get_startup_status().summary()
+    st.markdown("### 🚀 Startup")
+    if not summary['ready']:
+        st.info("Prewarm still running...")
+        return
+    st.caption(f"Process {summary['pid']} prewarmed in {summary['seconds'] * 1000:,.0f} ms.")
+    st.dataframe([{'Step': name, 'Time (ms)': round(seconds * 1000, 2), 'Error': summary['errors'].get(name, '')}
+                  for name, seconds in summary['steps'].items()], use_container_width=True, hide_index=True)
+
+
+def show_diagnostics():
+    """Display rolling rerun timings per page and section, and single-rerun profiles"""
+    st.markdown('<h2 class="section-header">🩺 Diagnostics</h2>', unsafe_allow_html=True)
+    st.caption("Timings cover the most recent reruns of every session on this server process.")
+
+    st.markdown("### ⏱️ Page Reruns")
+    page_rows = _timing_rows(get_page_timings().summary(), 'Page')
+    if page_rows:
+        st.dataframe(page_rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("No page reruns recorded yet.")
+
+    st.markdown("### 🧩 Sections")
+    section_rows = _timing_rows(get_section_timings().summary(), 'Section')
+    if section_rows:
+        st.dataframe(section_rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("No sections recorded yet.")
+
+    st.markdown("### 🧪 Model Responses")
+    model_rows = _timing_rows(get_model_timings().summary(), 'Metric', group='Backend', count_label='Calls')
+    if model_rows:
+        st.dataframe(model_rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("No prompts tested yet.")
+
+    show_response_cache()
+
+    show_startup()
+
+    st.markdown("### 📋 Copies")
+    copy_counts = get_copy_counts().counts()
+    if copy_counts:
+        st.dataframe([{'Page': page, 'Copies': count} for page, count in copy_counts.items()],
+                     use_container_width=True, hide_index=True)
+    else:
+        st.info("No copies reported yet. Browsers report copy clicks a few seconds after they happen.")
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("🔬 Profile Next Rerun", use_container_width=True,
+                     help="Run the next page you open under cProfile, then come back here to read the report"):
+            request_profile()
+            st.success("✅ The next page rerun in this session will be profiled.")
+    with col2:
+        if st.button("🧹 Reset Timings", use_container_width=True):
+            get_page_timings().clear()
+            get_section_timings().clear()
+            get_model_timings().clear()
+            get_copy_counts().clear()
+            st.rerun()
+
+    last_profile = st.session_state.get('last_profile')
+    if last_profile:
+        with st.expander(f"📄 Last Profile - {last_profile['page']}"):
+            st.code(last_profile['report'], language=None)
@@ -1,53 +1,200 @@
 import streamlit as st
 from utils.copy_utils import create_copy_button
+from utils.profiling import section
+from utils.prompt_library import CUSTOM, FAVORITE
+from utils.library_transfer import FORMATS, MIME_TYPES, detect_import_format, export_file_name
+from utils.session_state import (
+    count_saved_prompts, import_saved_prompts, library_is_linked, page_saved_prompts, remove_saved_prompt,
+    saved_prompt_subjects, saved_prompt_token_stats, saved_prompts_export, show_library_in_link
+)
+from utils.token_estimate import estimate_tokens, format_tokens
+
+PAGE_SIZES = [10, 25, 50, 100]
+SORT_ORDERS = ["Newest first", "Oldest first"]
+ALL_SUBJECTS = "All subjects"
+FORMAT_LABELS = {'jsonl': "JSON Lines", 'csv': "CSV", 'markdown': "Markdown"}
+
+
+def show_library_controls(kind):
+    """Render the filter, sort and page size controls for one tab and return their values"""
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        subject = st.selectbox(
+            "Subject:", [ALL_SUBJECTS] + saved_prompt_subjects(kind), key=f"{kind}_subject_filter"
+        )
+    with col2:
+        sort_order = st.selectbox("Sort:", SORT_ORDERS, key=f"{kind}_sort_order")
+    with col3:
+        page_size = st.selectbox("Per page:", PAGE_SIZES, key=f"{kind}_page_size")
+    return (None if subject == ALL_SUBJECTS else subject), sort_order == SORT_ORDERS[0], page_size
+
+
+def show_library_page(kind, render_entry, empty_message):
+    """Render one page of a saved prompt kind, materializing only the visible entries
+
+    Pages are fetched with keyset pagination. The start cursor of every page visited
+    is kept in session state so Previous can step back without offsets.
+    """
+    total = count_saved_prompts(kind)
+    if not total:
+        st.info(empty_message)
+        return
+
+    count, tokens = saved_prompt_token_stats(kind)
+    st.caption(f"📏 {count} saved · {format_tokens(tokens)} in total · ≈{tokens // count:,} per prompt")
+
+    subject, newest_first, page_size = show_library_controls(kind)
+
+    # Restart paging whenever the filter, order or page size changes
+    view = (subject, newest_first, page_size)
+    cursors_key = f"{kind}_page_cursors"
+    if st.session_state.get(f"{kind}_page_view") != view:
+        st.session_state[f"{kind}_page_view"] = view
+        st.session_state[cursors_key] = [None]
+    cursors = st.session_state[cursors_key]
+
+    entries, next_cursor = page_saved_prompts(kind, subject, cursors[-1], page_size, newest_first)
+    if not entries and len(cursors) > 1:
+        # The last entries on this page were deleted; step back a page
+        cursors.pop()
+        st.rerun()
+
+    for entry in entries:
+        render_entry(entry)
+
+    col_prev, col_status, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("⬅️ Previous", key=f"{kind}_prev_page", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_status:
+        status = f"Page {len(cursors)}"
+        if subject is None:
+            status += f" of {max(1, -(-total // page_size))} ({total} saved)"
+        st.caption(status)
+    with col_next:
+        if st.button("Next ➡️", key=f"{kind}_next_page", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
+
+def show_custom_prompt(prompt_data):
+    """Render one saved custom prompt"""
+    entry_id = prompt_data['id']
+    tokens = format_tokens(estimate_tokens(prompt_data['prompt'], prompt_data['digest']))
+    with st.expander(f"{prompt_data['subject']} - {prompt_data['topic']} ({prompt_data['date']}) · {tokens}"):
+        st.write(prompt_data['prompt'])
+
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            # Create copy button
+            create_copy_button(prompt_data['prompt'], "📋 Copy", key=f"copy_custom_{entry_id}")
+        with col2:
+            if st.button(f"🗑️ Delete", key=f"delete_custom_{entry_id}"):
+                remove_saved_prompt(CUSTOM, entry_id)
+                st.rerun()
+        with col3:
+            if st.button(f"🧪 Test", key=f"test_custom_{entry_id}"):
+                st.session_state.prompt_to_test = prompt_data['prompt']
+                st.session_state.test_prompt_source = f"My Prompts - {prompt_data['topic']}"
+                st.success("Prompt loaded for testing! Go to Test Prompts page.")
+
+
+def show_favorite(fav):
+    """Render one favorite template"""
+    entry_id = fav['id']
+    tokens = format_tokens(estimate_tokens(fav['prompt'], fav['digest']))
+    with st.expander(f"{fav['subject']} - {fav['category']} ({fav['date']}) · {tokens}"):
+        st.write(fav['prompt'])
+
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            # Create copy button
+            create_copy_button(fav['prompt'], "📋 Copy", key=f"copy_fav_{entry_id}")
+        with col2:
+            if st.button(f"🗑️ Remove", key=f"delete_fav_{entry_id}"):
+                remove_saved_prompt(FAVORITE, entry_id)
+                st.rerun()
+        with col3:
+            if st.button(f"🧪 Test", key=f"test_fav_{entry_id}"):
+                st.session_state.prompt_to_test = fav['prompt']
+                st.session_state.test_prompt_source = f"Favorites - {fav['category']}"
+                st.success("Prompt loaded for testing! Go to Test Prompts page.")
+
+
+def show_export():
+    """Download the whole library; the file is only built when the button is clicked"""
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        fmt = st.selectbox("Format:", FORMATS, format_func=FORMAT_LABELS.get, key="export_format",
+                           help="JSON Lines and CSV can be imported again; Markdown is for reading and printing")
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        compress = st.checkbox("gzip", key="export_gzip", help="Compress the file, typically 10-20x smaller")
+    with col3:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.download_button(
+            "📤 Export",
+            saved_prompts_export(fmt, compress),
+            file_name=export_file_name(fmt, compress),
+            mime="application/gzip" if compress else MIME_TYPES[fmt],
+            on_click="ignore",
+            use_container_width=True,
+            help="Download every saved prompt and favorite"
+        )
+
+
+def show_import():
+    """Import a JSON Lines or CSV export, skipping prompts that are already saved"""
+    upload = st.file_uploader(
+        "Import a library export (.jsonl, .csv, optionally .gz):", type=["jsonl", "json", "csv", "gz"],
+        key="import_file"
+    )
+    if upload is None or not st.button("📥 Import", key="import_library"):
+        return
+    status = st.empty()
+    report = import_saved_prompts(
+        upload, detect_import_format(upload.name),
+        progress=lambda report: status.caption(f"Imported {report['imported']:,} of {report['read']:,} read...")
+    )
+    status.empty()
+    message = (f"Imported {report['imported']:,} of {report['read']:,} records; "
+               f"{report['duplicates']:,} already saved, {report['invalid']:,} invalid.")
+    if report['imported'] or not report['errors']:
+        st.success(message)
+    else:
+        st.error(message)
+    if report['errors']:
+        st.warning("\n".join(f"- {error}" for error in report['errors']))
+
+
+def show_library_transfer():
+    """Export and import controls for the whole library"""
+    with st.expander("📦 Export / Import Library"):
+        show_export()
+        st.markdown("---")
+        show_import()
 
 
 def show_my_prompts():
     """Display saved prompts and favorites"""
     st.markdown('<h2 class="section-header">📝 My Saved Prompts</h2>', unsafe_allow_html=True)
+    if library_is_linked():
+        show_library_in_link()
+        st.caption("🔖 Your library belongs to this page's link (the `?library=` part). "
+                   "Bookmark it to come back to your prompts; anyone you share it with can see and edit them.")
+
+    with section("library transfer"):
+        show_library_transfer()
 
     tab1, tab2 = st.tabs(["💾 My Custom Prompts", "⭐ Favorites"])
 
-    with tab1:
-        if st.session_state.user_prompts:
-            for i, prompt_data in enumerate(st.session_state.user_prompts):
-                with st.expander(f"{prompt_data['subject']} - {prompt_data['topic']} ({prompt_data['date']})"):
-                    st.write(prompt_data['prompt'])
-
-                    col1, col2, col3 = st.columns([1, 1, 1])
-                    with col1:
-                        # Create copy button
-                        create_copy_button(prompt_data['prompt'], "📋 Copy", key=f"copy_custom_{i}")
-                    with col2:
-                        if st.button(f"🗑️ Delete", key=f"delete_custom_{i}"):
-                            st.session_state.user_prompts.pop(i)
-                            st.rerun()
-                    with col3:
-                        if st.button(f"🧪 Test", key=f"test_custom_{i}"):
-                            st.session_state.prompt_to_test = prompt_data['prompt']
-                            st.session_state.test_prompt_source = f"My Prompts - {prompt_data['topic']}"
-                            st.success("Prompt loaded for testing! Go to Test Prompts page.")
-        else:
-            st.info("No custom prompts saved yet. Use the Prompt Builder to create some!")
-
-    with tab2:
-        if st.session_state.favorites:
-            for i, fav in enumerate(st.session_state.favorites):
-                with st.expander(f"{fav['subject']} - {fav['category']} ({fav['date']})"):
-                    st.write(fav['prompt'])
-
-                    col1, col2, col3 = st.columns([1, 1, 1])
-                    with col1:
-                        # Create copy button
-                        create_copy_button(fav['prompt'], "📋 Copy", key=f"copy_fav_{i}")
-                    with col2:
-                        if st.button(f"🗑️ Remove", key=f"delete_fav_{i}"):
-                            st.session_state.favorites.pop(i)
-                            st.rerun()
-                    with col3:
-                        if st.button(f"🧪 Test", key=f"test_fav_{i}"):
-                            st.session_state.prompt_to_test = fav['prompt']
-                            st.session_state.test_prompt_source = f"Favorites - {fav['category']}"
-                            st.success("Prompt loaded for testing! Go to Test Prompts page.")
-        else:
-            st.info("No favorites saved yet. Browse the subject-specific prompts to add some!")
\ No newline at end of file
+    with tab1, section("custom prompts page"):
+        show_library_page(
+            CUSTOM, show_custom_prompt, "No custom prompts saved yet. Use the Prompt Builder to create some!"
+        )
+
+    with tab2, section("favorites page"):
+        show_library_page(
+            FAVORITE, show_favorite, "No favorites saved yet. Browse the subject-specific prompts to add some!"
+        )
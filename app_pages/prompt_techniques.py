@@ -1,5 +1,21 @@
 import streamlit as st
 from data.constants import PROMPT_TECHNIQUES
+from utils.html_fragments import box, escape, html_fragment
+
+
+@html_fragment("technique_card", variants=lambda: [(technique,) for technique in PROMPT_TECHNIQUES])
+def technique_card(technique):
+    """Description and side-by-side examples for one technique"""
+    details = PROMPT_TECHNIQUES[technique]
+    good = box("prompt-example", f"<strong>✅ Good Example:</strong><br>{escape(details['good_example'])}")
+    bad = box("warning-box", f"<strong>❌ Poor Example:</strong><br>{escape(details['bad_example'])}")
+    return (
+        f"<p><strong>Description:</strong> {escape(details['description'])}</p>"
+        '<div style="display:flex;gap:1rem;flex-wrap:wrap">'
+        f'<div style="flex:1 1 20rem">{good}</div>'
+        f'<div style="flex:1 1 20rem">{bad}</div>'
+        "</div>"
+    )
 
 
 def show_prompt_techniques():
@@ -8,23 +24,8 @@ def show_prompt_techniques():
 
     st.write("Master these techniques to get better responses from AI language models:")
 
-    for technique, details in PROMPT_TECHNIQUES.items():
-        with st.expander(f"🎪 {technique}"):
-            st.write(f"**Description:** {details['description']}")
-
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("**✅ Good Example:**")
-                st.markdown(f"""
-                <div class="prompt-example">
-                {details['good_example']}
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col2:
-                st.markdown("**❌ Poor Example:**")
-                st.markdown(f"""
-                <div class="warning-box">
-                {details['bad_example']}
-                </div>
-                """, unsafe_allow_html=True)
\ No newline at end of file
+    # Only the selected technique's card is sent to the browser
+    technique = st.selectbox(
+        "Choose a technique:", list(PROMPT_TECHNIQUES), format_func=lambda name: f"🎪 {name}"
+    )
+    st.markdown(technique_card(technique), unsafe_allow_html=True)
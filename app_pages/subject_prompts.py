@@ -1,5 +1,7 @@
 import streamlit as st
 from datetime import datetime
+from utils.html_fragments import box, escape, html_fragment
+from utils.session_state import add_favorite
 
 
 # Lazy imports for better performance
@@ -13,6 +15,56 @@ def get_copy_utils():
     return create_copy_button
 
 
+def get_template_engine():
+    from utils.template_engine import compile_template, slot_hint, slot_label
+    return compile_template, slot_label, slot_hint
+
+
+def _template_card_variants():
+    return [(subject, category) for subject, templates in get_subject_prompts().items() for category in templates]
+
+
+@html_fragment("template_card", variants=_template_card_variants)
+def template_card(subject, category):
+    """Template text box for one subject category"""
+    return box("prompt-example", f"<strong>Template:</strong><br>{escape(get_subject_prompts()[subject][category])}")
+
+
+def show_template_filler(template, form_key, create_copy_button):
+    """Render a fill-in form generated from the template's bracketed slots"""
+    compile_template, slot_label, slot_hint = get_template_engine()
+    compiled = compile_template(template)
+    if not compiled.required_slots:
+        return
+
+    with st.form(form_key):
+        st.markdown("**✏️ Fill in this template:**")
+        values = {}
+        col1, col2 = st.columns(2)
+        for i, slot in enumerate(compiled.required_slots):
+            with (col1 if i % 2 == 0 else col2):
+                values[slot] = st.text_input(
+                    slot_label(slot),
+                    key=f"{form_key}_{slot}",
+                    placeholder=slot_hint(slot) or "",
+                ).strip()
+        filled = st.form_submit_button("✨ Fill Template")
+
+    if filled:
+        missing = compiled.missing_slots(values)
+        if missing:
+            st.warning(f"⚠️ Still to fill in: {', '.join(slot_label(slot) for slot in missing)}")
+        filled_prompt = compiled.fill(values)
+        # The slot values are user input; escape them like the template card does
+        st.markdown(f"""
+        <div class="prompt-example">
+        <strong>Your Prompt:</strong><br>
+        {escape(filled_prompt)}
+        </div>
+        """, unsafe_allow_html=True)
+        create_copy_button(filled_prompt, "📋 Copy Filled Prompt", key=f"copy_{form_key}")
+
+
 def show_subject_prompts():
     """Display subject-specific prompt templates"""
     st.markdown('<h2 class="section-header">📚 Subject-Specific Prompt Templates</h2>', unsafe_allow_html=True)
@@ -26,32 +78,27 @@ def show_subject_prompts():
 
     st.markdown(f"### {selected_subject} Prompts")
 
-    for category, prompt in subject_prompts[selected_subject].items():
-        with st.expander(f"📋 {category}"):
-            st.markdown(f"""
-            <div class="prompt-example">
-            <strong>Template:</strong><br>
-            {prompt}
-            </div>
-            """, unsafe_allow_html=True)
-
-            col1, col2 = st.columns([1, 1])
-            with col1:
-                # Create copy button
-                create_copy_button(prompt, "📋 Copy", key=f"copy_{selected_subject}_{category}")
-            with col2:
-                if st.button(f"⭐ Save", key=f"save_{selected_subject}_{category}"):
-                    # Check if this exact prompt is already in favorites
-                    already_saved = any(
-                        fav['prompt'] == prompt for fav in st.session_state.favorites
-                    )
-                    if not already_saved:
-                        st.session_state.favorites.append({
-                            'subject': selected_subject,
-                            'category': category,
-                            'prompt': prompt,
-                            'date': datetime.now().strftime("%Y-%m-%d")
-                        })
-                        st.success("Added to favorites!")
-                    else:
-                        st.info("Already in favorites!")
\ No newline at end of file
+    # Only the selected template and its fill-in form are sent to the browser
+    templates = subject_prompts[selected_subject]
+    category = st.selectbox("Choose a template:", list(templates), format_func=lambda name: f"📋 {name}")
+    prompt = templates[category]
+    st.markdown(template_card(selected_subject, category), unsafe_allow_html=True)
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        # Create copy button
+        create_copy_button(prompt, "📋 Copy", key=f"copy_{selected_subject}_{category}")
+    with col2:
+        if st.button(f"⭐ Save", key=f"save_{selected_subject}_{category}"):
+            # add_favorite skips prompts that are already in favorites
+            if add_favorite({
+                'subject': selected_subject,
+                'category': category,
+                'prompt': prompt,
+                'date': datetime.now().strftime("%Y-%m-%d")
+            }):
+                st.success("Added to favorites!")
+            else:
+                st.info("Already in favorites!")
+
+    show_template_filler(prompt, f"fill_{selected_subject}_{category}", create_copy_button)
@@ -0,0 +1,175 @@
+import streamlit as st
+from utils.profiling import get_model_timings, section
+from utils.prompt_library import CUSTOM, FAVORITE
+from utils.session_state import count_saved_prompts, page_saved_prompts
+
+KIND_LABELS = {CUSTOM: "💾 My Custom Prompts", FAVORITE: "⭐ Favorites"}
+BATCH_SIZES = [5, 10, 25, 50, 100]
+
+
+def get_testing():
+    import utils.prompt_testing as testing
+    return testing
+
+
+def show_run_settings(testing):
+    """Backend, timeout and concurrency controls; returns (backend, timeout, workers)"""
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        backend_name = st.selectbox("Model backend:", testing.backend_names(), key="test_backend")
+    with col2:
+        timeout = st.number_input(
+            "Timeout per prompt (s):", min_value=1.0, max_value=120.0, value=testing.DEFAULT_TIMEOUT, step=1.0,
+            key="test_timeout"
+        )
+    with col3:
+        workers = st.slider("Concurrent calls:", 1, testing.MAX_WORKERS, 4, key="test_workers")
+
+    options = {}
+    if backend_name == testing.LocalModelBackend.name:
+        with st.expander("⚙️ Local model speed"):
+            col1, col2 = st.columns(2)
+            with col1:
+                options['first_token_delay'] = st.number_input(
+                    "Time to first token (ms):", min_value=0, max_value=10000, value=50, step=10, key="local_ttft"
+                ) / 1000
+            with col2:
+                options['token_delay'] = st.number_input(
+                    "Delay per token (ms):", min_value=0, max_value=1000, value=4, step=1, key="local_token_delay"
+                ) / 1000
+    backend = testing.get_backend(backend_name, **options)
+    if st.toggle("Reuse cached responses", value=True, key="test_use_cache",
+                 help="Answer prompts this backend has already answered from the response cache"):
+        from utils.response_cache import CachedBackend, get_response_cache
+        backend = CachedBackend(backend, get_response_cache())
+    return backend, timeout, workers
+
+
+def record_result(backend, result):
+    """Add a finished call to the process-wide model timings shown on the diagnostics page"""
+    timings = get_model_timings()
+    if result['cached']:
+        timings.record((backend.name, "cached response"), result['latency'])
+        return
+    if result['ttft'] is not None:
+        timings.record((backend.name, "time to first token"), result['ttft'])
+    timings.record((backend.name, "full response"), result['latency'])
+
+
+def show_run_summary(stats):
+    """Wall time, throughput and latency metrics for a finished run"""
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Wall time", f"{stats['wall']:.2f} s")
+    col2.metric("Throughput", f"{stats['throughput']:.1f} prompts/s")
+    ttft = stats.get('ttft')
+    col3.metric("TTFT p50", f"{ttft['p50']:.0f} ms" if ttft else "–")
+    latency = stats.get('latency')
+    col4.metric("Latency p95", f"{latency['p95']:.0f} ms" if latency else "–")
+    statuses = ", ".join(f"{count} {status}" for status, count in stats['statuses'].items() if count)
+    st.caption(f"{statuses} · {stats['cached']} from cache · {stats['tokens_per_second']:.0f} response tokens/s")
+
+
+def show_single_test(testing, backend, timeout):
+    """Stream the prompt handed over from the builder or My Prompts, or one typed in"""
+    st.markdown("### 🎯 Test One Prompt")
+    source = st.session_state.get('test_prompt_source')
+    if source:
+        st.caption(f"Loaded from: {source}")
+    if 'prompt_to_test' in st.session_state:
+        st.session_state.test_prompt_text = st.session_state.pop('prompt_to_test')
+
+    prompt = st.text_area("Prompt:", key="test_prompt_text", height=150,
+                          placeholder="Paste a prompt, or use 🧪 Test on a generated or saved prompt")
+    if not st.button("▶️ Run Prompt", type="primary", disabled=not prompt.strip()):
+        return
+
+    st.markdown("**Response:**")
+    # The response renders as it streams; using any other control stops it
+    meter = testing.stream_prompt(backend, prompt, timeout)
+    try:
+        with section("single run"):
+            st.write_stream(meter.chunks())
+    except testing.CallCancelled:
+        st.warning(f"⏱️ The call was stopped after {meter.latency:.1f} s (timeout {timeout:.0f} s)")
+        return
+    except Exception as error:
+        st.error(f"❌ The backend failed: {type(error).__name__}: {error}")
+        return
+
+    record_result(backend, {'ttft': meter.ttft, 'latency': meter.latency, 'cached': meter.cached})
+    if meter.cached:
+        st.caption(f"♻️ From the response cache in {meter.latency * 1000:.2f} ms · {meter.tokens} response tokens")
+        return
+    ttft = f"{meter.ttft * 1000:.0f} ms" if meter.ttft is not None else "–"
+    st.caption(
+        f"⚡ Time to first token {ttft} · {meter.tokens_per_second:.0f} tokens/s · "
+        f"total {meter.latency * 1000:.0f} ms · {meter.tokens} response tokens"
+    )
+
+
+def show_batch_test(testing, backend, timeout, workers):
+    """Run the most recent saved prompts of a kind concurrently"""
+    st.markdown("### 📦 Test Saved Prompts in a Batch")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        kind = st.radio("Prompts:", list(KIND_LABELS), format_func=KIND_LABELS.get, horizontal=True,
+                        key="test_batch_kind")
+    with col2:
+        batch_size = st.selectbox("How many (most recent):", BATCH_SIZES, index=1, key="test_batch_size")
+
+    available = count_saved_prompts(kind)
+    if not available:
+        st.info("Nothing saved here yet. Save prompts from the builder or the template pages first.")
+        return
+    if not st.button(f"▶️ Run {min(batch_size, available)} Prompts", key="test_batch_run"):
+        return
+
+    entries, _ = page_saved_prompts(kind, limit=batch_size)
+    progress = st.progress(0.0, "Starting...")
+    finished = []
+
+    def on_result(index, result):
+        finished.append(index)
+        progress.progress(len(finished) / len(entries), f"{len(finished)} of {len(entries)} finished")
+
+    # Any widget interaction reruns the script, which interrupts this run and cancels the calls left
+    with section("batch run"):
+        results, stats = testing.run_prompts(
+            backend, [entry['prompt'] for entry in entries], max_workers=workers, timeout=timeout,
+            on_result=on_result
+        )
+    progress.empty()
+    for result in results:
+        if result['status'] == testing.OK:
+            record_result(backend, result)
+    show_run_summary(stats)
+    st.dataframe(
+        [
+            {
+                'Prompt': entry.get('topic') or entry.get('category'),
+                'Subject': entry['subject'],
+                'Status': result['status'],
+                'TTFT (ms)': round(result['ttft'] * 1000) if result['ttft'] is not None else None,
+                'Latency (ms)': round(result['latency'] * 1000),
+                'Tokens': result['tokens'],
+                'Tokens/s': round(result['tokens_per_second']),
+                'Cached': result['cached'],
+            }
+            for entry, result in zip(entries, results)
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+def show_test_prompts():
+    """Run prompts against a model backend and report latency and throughput"""
+    st.markdown('<h2 class="section-header">🧪 Test Prompts</h2>', unsafe_allow_html=True)
+    st.write("Try your prompts against a model and see how quickly it answers. "
+             "The local stand-in model works offline and always gives the same answer to the same prompt.")
+
+    testing = get_testing()
+    backend, timeout, workers = show_run_settings(testing)
+    show_single_test(testing, backend, timeout)
+    st.markdown("---")
+    show_batch_test(testing, backend, timeout, workers)
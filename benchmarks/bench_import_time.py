@@ -0,0 +1,127 @@
+"""Import-time budget check
+
+Imports streamlit, then main, then every module of the app packages, in a fresh
+interpreter under `python -X importtime`. Streamlit is imported first, so each app
+module is charged only for what it adds: its own code and any dependency no
+earlier import pulled in. Each run is repeated and the median kept.
+
+Results are compared against benchmarks/import_budget.json. The check fails when
+the total for the app modules or any single module exceeds its budget; modules
+without a budget of their own get DEFAULT_MODULE_BUDGET_MS. Streamlit's own import
+time is reported but not budgeted.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time                   # check against the budget
+    python -m benchmarks.bench_import_time --update-budget   # record measured x headroom
+"""
+import argparse
+import json
+import math
+import pkgutil
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "import_budget.json"
+PACKAGES = ('data', 'config', 'components', 'utils', 'app_pages')
+DEFAULT_MODULE_BUDGET_MS = 10.0
+MIN_MODULE_BUDGET_MS = 5.0
+
+# "import time:       self [us] |  cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def app_modules():
+    """main and every module of the app packages, in import order"""
+    modules = ['main']
+    for package in PACKAGES:
+        modules.append(package)
+        modules.extend(module.name for module in pkgutil.iter_modules([str(ROOT / package)], package + "."))
+    return modules
+
+
+def measure_once(modules):
+    """{module: cumulative ms} for streamlit and each module, from one fresh interpreter"""
+    source = "\n".join(f"import {module}" for module in ['streamlit', *modules])
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", source], cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode:
+        sys.exit(f"importing the app failed:\n{completed.stderr[-2000:]}")
+    times = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Top-level lines (no indentation) are the imports of the -c source, in order
+        if match and not match.group(3) and match.group(4) in ('streamlit', *modules):
+            times[match.group(4)] = int(match.group(2)) / 1000
+    # Modules already imported by an earlier line print nothing and cost nothing
+    return {module: times.get(module, 0.0) for module in ('streamlit', *modules)}
+
+
+def measure(repeat):
+    modules = app_modules()
+    runs = [measure_once(modules) for _ in range(repeat)]
+    return {module: round(statistics.median(run[module] for run in runs), 2) for module in runs[0]}
+
+
+def check(results, budget):
+    """Return a list of budget violations"""
+    violations = []
+    total = sum(ms for module, ms in results.items() if module != 'streamlit')
+    if total > budget['total_ms']:
+        violations.append(f"app modules: {total:.1f} ms vs budget {budget['total_ms']:.1f} ms")
+    for module, ms in results.items():
+        if module == 'streamlit':
+            continue
+        limit = budget['modules'].get(module, DEFAULT_MODULE_BUDGET_MS)
+        if ms > limit:
+            violations.append(f"{module}: {ms:.1f} ms vs budget {limit:.1f} ms")
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to run (median is kept)")
+    parser.add_argument("--budget", type=Path, default=BUDGET_PATH, help="budget JSON file")
+    parser.add_argument("--update-budget", action="store_true", help="write measured times x headroom as the budget")
+    parser.add_argument("--headroom", type=float, default=2.0,
+                        help="budget as a multiple of the measured time when updating (default: 2.0)")
+    args = parser.parse_args(argv)
+
+    results = measure(args.repeat)
+    total = sum(ms for module, ms in results.items() if module != 'streamlit')
+    print(f"streamlit: {results['streamlit']:.1f} ms (not budgeted)")
+    print(f"app modules: {total:.1f} ms")
+    for module, ms in sorted(results.items(), key=lambda item: item[1], reverse=True):
+        if module != 'streamlit' and ms >= 0.5:
+            print(f"  {module:<32} {ms:8.2f} ms")
+
+    if args.update_budget:
+        budget = {
+            'total_ms': math.ceil(total * args.headroom),
+            'modules': {
+                module: math.ceil(max(MIN_MODULE_BUDGET_MS, ms * args.headroom))
+                for module, ms in results.items() if module != 'streamlit'
+            },
+        }
+        args.budget.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Budget written to {args.budget}")
+        return
+
+    if not args.budget.exists():
+        print("No budget found; run with --update-budget to record one.")
+        return
+    violations = check(results, json.loads(args.budget.read_text()))
+    if violations:
+        print("Over budget:")
+        for violation in violations:
+            print(f"  {violation}")
+        sys.exit(1)
+    print("Within the import-time budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Throughput and peak memory of library export and import
+
+Fills a temporary library with --count custom prompts and favorites, then exports
+it in every format (plain and gzip) to a file and imports each JSONL and CSV export
+into a fresh library. Peak memory is measured with tracemalloc; for a streaming
+export and import it stays flat as --count grows. The libraries get a small body
+cache so its (bounded) contents do not hide that.
+
+Run from the repository root:
+    python -m benchmarks.bench_library_transfer --count 10000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_prompt_assembly import make_cohort  # noqa: E402
+from utils.content_store import BodyCache  # noqa: E402
+from utils.library_transfer import EXTENSIONS, FORMATS, import_library, iter_export  # noqa: E402
+from utils.prompt_library import CUSTOM, FAVORITE, PromptLibrary  # noqa: E402
+from utils.prompt_utils import build_advanced_prompts  # noqa: E402
+
+BODY_CACHE_ENTRIES = 100
+
+
+def fill_library(library, count):
+    """count custom prompts built from a random cohort, and count favorites"""
+    cohort = make_cohort(count)
+    library.add_many("bench", CUSTOM, (
+        {'prompt': prompt, 'subject': prompt_data['subject_area'], 'topic': prompt_data['topic_or_question'][:50],
+         'date': "2026-10-18 09:30", 'prompt_data': prompt_data}
+        for prompt_data, prompt in zip(cohort, build_advanced_prompts(cohort))
+    ))
+    library.add_many("bench", FAVORITE, (
+        {'prompt': f"Template {number}: explain the topic step by step.", 'subject': "Mathematics",
+         'category': "Concept Explanation", 'date': "2026-10-18"}
+        for number in range(count)
+    ))
+
+
+def measure(run):
+    """(seconds, peak KB, result) of run()"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="custom prompts and favorites each")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        library = PromptLibrary(str(directory / "library.db"), BodyCache(BODY_CACHE_ENTRIES))
+        fill_library(library, args.count)
+        records = args.count * 2
+
+        print(f"{records:,} records")
+        print(f"  {'':<24} {'seconds':>8} {'records/s':>10} {'peak KB':>8} {'file KB':>9}")
+        for fmt in FORMATS:
+            for compress in (False, True):
+                path = directory / f"export.{EXTENSIONS[fmt]}{'.gz' if compress else ''}"
+
+                def export():
+                    with open(path, 'wb') as sink:
+                        for chunk in iter_export(library, "bench", fmt, compress=compress):
+                            sink.write(chunk)
+
+                elapsed, peak, _ = measure(export)
+                print(f"  export {path.name:<17} {elapsed:>8.2f} {records / elapsed:>10,.0f} {peak:>8,.0f} "
+                      f"{path.stat().st_size / 1024:>9,.0f}")
+                if fmt == 'markdown':
+                    continue
+
+                target = PromptLibrary(str(directory / f"import_{path.name}.db"), BodyCache(BODY_CACHE_ENTRIES))
+
+                def load():
+                    with open(path, 'rb') as source:
+                        return import_library(target, "bench", source, fmt)
+
+                elapsed, peak, report = measure(load)
+                if report['imported'] != records:
+                    sys.exit(f"import of {path.name} wrote {report['imported']} of {records} records: {report}")
+                print(f"  import {path.name:<17} {elapsed:>8.2f} {records / elapsed:>10,.0f} {peak:>8,.0f}")
+
+
+if __name__ == "__main__":
+    main()
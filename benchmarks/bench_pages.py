@@ -0,0 +1,272 @@
+"""Headless page-rerun benchmarks
+
+Drives main.py with streamlit.testing.v1.AppTest, with no browser or server, through
+the interactions students use most: visiting every sidebar page, submitting the
+Prompt Builder form, saving a prompt, and paging through My Prompts with libraries
+of 10, 100 and 1000 saved prompts. Every measured rerun records its wall time and
+the number of elements it rendered.
+
+Results are compared against a stored JSON baseline. A scenario that renders more
+elements than the baseline did is a regression and fails the run. Wall times depend
+on the machine, so they are compared relative to a calibration rerun of a small
+fixed script timed in the same run: a scenario whose relative time grew by more than
+the threshold is reported as slower, and only fails the run with --strict.
+
+Run from the repository root:
+    python -m benchmarks.bench_pages                     # compare against baseline
+    python -m benchmarks.bench_pages --update-baseline   # record a new baseline
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+LIBRARY_SIZES = (10, 100, 1000)
+
+# The benchmark library must be configured before the app modules are imported
+os.environ.setdefault("PROMPT_LIBRARY_PATH", os.path.join(tempfile.mkdtemp(prefix="bench_pages_"), "library.db"))
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils.prompt_library import CUSTOM, PromptLibrary  # noqa: E402
+from utils.startup import start_prewarm  # noqa: E402
+
+PAGES = [
+    "🏠 Home", "📚 Subject-Specific Prompts", "🎯 Prompt Techniques",
+    "🔧 Prompt Builder", "🧪 Test Prompts", "💡 Tips & Best Practices", "📝 My Prompts"
+]
+TOPIC = "solving quadratic equations with the quadratic formula"
+CALIBRATION_RUNS = 15
+
+# Exercises the same AppTest machinery as the scenarios, without any app code
+CALIBRATION_SCRIPT = """
+import streamlit as st
+st.markdown("## Calibration")
+choice = st.selectbox("Choice", [f"option {number}" for number in range(20)])
+columns = st.columns(3)
+for number in range(30):
+    with columns[number % 3]:
+        st.button(f"Button {number}", key=f"button_{number}")
+st.dataframe([{"a": number, "b": str(number) * 3} for number in range(50)])
+"""
+
+
+def count_elements(node):
+    """Number of nodes in a rendered element tree"""
+    children = getattr(node, 'children', None)
+    return 1 + (sum(count_elements(child) for child in children.values()) if children else 0)
+
+
+def timed_run(at, action=None):
+    """Run one rerun (optionally after an interaction) and return (wall_ms, elements)"""
+    start = time.perf_counter()
+    if action is None:
+        at.run()
+    else:
+        action(at).run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"app raised during benchmark: {at.exception[0].value}")
+    return elapsed, count_elements(at._tree)
+
+
+def new_app(library=None):
+    """Fresh headless app session, optionally bound to a named library"""
+    at = AppTest.from_file(str(ROOT / "main.py"), default_timeout=60)
+    if library:
+        at.query_params["library"] = library
+    at.run()
+    return at
+
+
+def select_page(page):
+    return lambda at: at.sidebar.selectbox[0].select(page)
+
+
+def click_label(label):
+    return lambda at: next(button for button in at.button if button.label == label).click()
+
+
+def click_key(key):
+    return lambda at: at.button(key=key).click()
+
+
+def scenario_page(page):
+    """Navigate from Home to page"""
+    def run():
+        return timed_run(new_app(), select_page(page))
+    return run
+
+
+def scenario_builder_submit():
+    """Fill in and submit the Prompt Builder form"""
+    at = new_app()
+    timed_run(at, select_page("🔧 Prompt Builder"))
+    at.text_area[0].input(TOPIC)
+    return timed_run(at, click_label("🚀 Generate Educational Prompt"))
+
+
+def scenario_builder_save():
+    """Save the generated prompt from the Prompt Builder result panel"""
+    at = new_app(library=f"bench_save_{time.perf_counter_ns()}")
+    timed_run(at, select_page("🔧 Prompt Builder"))
+    at.text_area[0].input(TOPIC)
+    timed_run(at, click_label("🚀 Generate Educational Prompt"))
+    return timed_run(at, click_label("💾 Save Prompt"))
+
+
+def seed_library(size):
+    """Fill a dedicated library with size saved prompts (once per process)"""
+    library_id = f"bench_{size}"
+    library = PromptLibrary(os.environ["PROMPT_LIBRARY_PATH"])
+    missing = size - library.count(library_id, CUSTOM)
+    if missing > 0:
+        library.add_many(library_id, CUSTOM, (
+            {
+                'subject': ["Mathematics", "History/Social Studies", "English/Literature"][i % 3],
+                'topic': f"Benchmark topic {i}",
+                'date': f"2026-01-{i % 28 + 1:02d} 10:00",
+                'prompt': f"Act as my patient and supportive tutor. Benchmark prompt number {i} for {size} entries.",
+                'prompt_data': {'grade_level': "High School (9-12)", 'topic_or_question': f"Benchmark topic {i}"},
+            }
+            for i in range(missing)
+        ))
+    return library_id
+
+
+def scenario_my_prompts(size):
+    """Open My Prompts on a library of size entries"""
+    def run():
+        at = new_app(library=seed_library(size))
+        return timed_run(at, select_page("📝 My Prompts"))
+    return run
+
+
+def scenario_my_prompts_next_page(size):
+    """Page forward through My Prompts on a library of size entries"""
+    def run():
+        at = new_app(library=seed_library(size))
+        timed_run(at, select_page("📝 My Prompts"))
+        if at.button(key="custom_next_page").disabled:
+            return timed_run(at)
+        return timed_run(at, click_key("custom_next_page"))
+    return run
+
+
+def build_scenarios():
+    scenarios = {f"page: {page}": scenario_page(page) for page in PAGES}
+    scenarios["builder: submit form"] = scenario_builder_submit
+    scenarios["builder: save prompt"] = scenario_builder_save
+    for size in LIBRARY_SIZES:
+        scenarios[f"my prompts: open ({size} saved)"] = scenario_my_prompts(size)
+        scenarios[f"my prompts: next page ({size} saved)"] = scenario_my_prompts_next_page(size)
+    return scenarios
+
+
+def calibrate():
+    """Median wall time of the calibration script, in milliseconds"""
+    at = AppTest.from_string(CALIBRATION_SCRIPT, default_timeout=60)
+    at.run()
+    return statistics.median(timed_run(at)[0] for _ in range(CALIBRATION_RUNS))
+
+
+def measure(scenarios, repeat):
+    """Run every scenario repeat times and keep the median wall time and element count"""
+    results = {}
+    for name, scenario in scenarios.items():
+        runs = [scenario() for _ in range(repeat)]
+        results[name] = {
+            'wall_ms': round(statistics.median(wall for wall, _ in runs), 2),
+            'elements': int(statistics.median(elements for _, elements in runs)),
+        }
+        print(f"  {name:<45} {results[name]['wall_ms']:9.2f} ms  {results[name]['elements']:5d} elements")
+    return results
+
+
+def compare(results, calibration_ms, baseline, threshold):
+    """Return (regressions, slowdowns): element count increases, and relative wall time increases"""
+    regressions = []
+    slowdowns = []
+    for name, current in results.items():
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            continue
+        if current['elements'] > previous['elements']:
+            regressions.append(f"{name}: {current['elements']} elements vs baseline {previous['elements']}")
+        relative = current['wall_ms'] / calibration_ms
+        if relative > previous['relative'] * (1 + threshold):
+            slowdowns.append(
+                f"{name}: {relative:.2f}x calibration vs baseline {previous['relative']:.2f}x "
+                f"(+{(relative / previous['relative'] - 1) * 100:.0f}%, {current['wall_ms']:.2f} ms)"
+            )
+    return regressions, slowdowns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless page-rerun benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario (median is kept)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative wall time increase over baseline, as a fraction (default: 0.25)")
+    parser.add_argument("--strict", action="store_true", help="also fail when a scenario is slower than baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("-k", dest="pattern", help="only run scenarios whose name contains this text")
+    args = parser.parse_args(argv)
+
+    # AppTest logs a "missing ScriptRunContext" warning for every new session; streamlit
+    # resets logger levels on each run, so drop the records with a filter instead
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: record.levelno >= logging.ERROR
+    )
+    # Prewarm up front, as tools/serve.py does, so the first scenario does not share
+    # the CPU with the background prewarm main() would otherwise start
+    start_prewarm().join()
+    scenarios = build_scenarios()
+    if args.pattern:
+        scenarios = {name: run for name, run in scenarios.items() if args.pattern in name}
+
+    print(f"Running {len(scenarios)} scenarios, {args.repeat} runs each")
+    calibration_ms = calibrate()
+    results = measure(scenarios, args.repeat)
+    # Calibrate on both sides of the scenarios, so a machine that speeds up or slows down mid-run is averaged out
+    calibration_ms = (calibration_ms + calibrate()) / 2
+    print(f"  {'calibration':<45} {calibration_ms:9.2f} ms")
+
+    if args.update_baseline:
+        # Relative times stay comparable across runs, so scenarios not rerun (-k) are kept as they are
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {'scenarios': {}}
+        baseline['calibration_ms'] = round(calibration_ms, 2)
+        for name, current in results.items():
+            baseline['scenarios'][name] = dict(current, relative=round(current['wall_ms'] / calibration_ms, 3))
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print("No baseline found; run with --update-baseline to record one.")
+        return
+
+    regressions, slowdowns = compare(results, calibration_ms, json.loads(args.baseline.read_text()), args.threshold)
+    if slowdowns:
+        print("Slower than baseline, relative to calibration:")
+        for slowdown in slowdowns:
+            print(f"  {slowdown}")
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+    if regressions or (slowdowns and args.strict):
+        sys.exit(1)
+    print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Micro-benchmark for advanced prompt assembly
+
+Compares per-prompt latency of the original build_advanced_prompt (kept below as a
+reference implementation) against the precompiled single-call and batch entry points,
+and checks that they and PromptPreview produce byte-for-byte identical output. Also reports how
+much shorter build_budgeted_prompt makes the same prompts.
+
+Run from the repository root:
+    python -m benchmarks.bench_prompt_assembly --count 20000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.options import RESPONSE_FORMATS, SUBJECT_AREAS  # noqa: E402
+from utils.prompt_utils import (  # noqa: E402
+    DETAIL_FRAGMENTS, FEEDBACK_FRAGMENTS, GOAL_FRAGMENTS, GRADE_FRAGMENTS, LEARNING_STYLE_FRAGMENTS,
+    ROLE_FRAGMENTS, STYLE_FRAGMENTS, UNDERSTANDING_FRAGMENTS, PromptPreview, build_advanced_prompt,
+    build_advanced_prompts, build_budgeted_prompt
+)
+from utils.token_estimate import count_tokens  # noqa: E402
+
+
+def legacy_build_advanced_prompt(prompt_data):
+    """build_advanced_prompt as it was before the precompiled fragment tables"""
+
+    prompt_parts = []
+
+    # 1. Role Assignment - This is crucial for educational prompts
+    role_mapping = {
+        "Patient tutor - guide me step by step": "Act as my patient and supportive tutor",
+        "Socratic teacher - ask me questions to help me discover answers": "Act as my Socratic teacher who guides learning through thoughtful questions",
+        "Study coach - help me develop learning strategies": "Act as my study coach and learning strategist",
+        "Writing mentor - provide feedback and suggestions": "Act as my writing mentor and editor",
+        "Research assistant - help me find and organize information": "Act as my research assistant and information organizer",
+        "Practice partner - quiz me and give feedback": "Act as my practice partner and learning assessor"
+    }
+
+    role_instruction = role_mapping.get(prompt_data.get('ai_role', ''), "Act as my educational assistant")
+    prompt_parts.append(f"{role_instruction}.")
+
+    # 2. Student Context - Critical for appropriate responses
+    grade_context = {
+        "Elementary (K-5)": "elementary school student",
+        "Middle School (6-8)": "middle school student",
+        "High School (9-12)": "high school student",
+        "College/University": "college student",
+        "Graduate School": "graduate student"
+    }
+
+    student_level = grade_context.get(prompt_data.get('grade_level', ''), "student")
+    subject_area = prompt_data.get('subject_area', 'general studies')
+    prompt_parts.append(f"I'm a {student_level} studying {subject_area.lower()}.")
+
+    # 3. Current Understanding Level - Helps AI calibrate response
+    understanding_context = {
+        "Complete beginner - never studied this before": "I'm completely new to this topic and have never studied it before",
+        "Basic understanding - know a little but confused": "I have basic understanding but I'm confused about key parts",
+        "Moderate understanding - get the basics but struggle with applications": "I understand the basics but struggle with applying the concepts",
+        "Good understanding - just need help with specific parts": "I have good overall understanding but need help with specific aspects",
+        "Advanced - want to deepen or extend my knowledge": "I have advanced understanding and want to deepen my knowledge further"
+    }
+
+    current_understanding = prompt_data.get('current_understanding', '')
+    if current_understanding in understanding_context:
+        prompt_parts.append(understanding_context[current_understanding] + ".")
+
+    # 4. Background Context - User's specific situation
+    background_context = prompt_data.get('background_context', '').strip()
+    if background_context:
+        prompt_parts.append(f"Background: {background_context}")
+
+    # 5. Specific Learning Request
+    learning_goal_context = {
+        "Understand a concept I'm confused about": "Please help me understand this concept by breaking it down clearly",
+        "Get help solving problems step-by-step": "Please guide me through solving this step-by-step, letting me try each step",
+        "Prepare for a test or assignment": "Please help me prepare for assessment by focusing on key concepts and likely questions",
+        "Connect ideas to real-world applications": "Please help me see how this connects to real-world situations and applications",
+        "Improve my study techniques": "Please help me develop better study strategies for this material",
+        "Analyze and interpret information": "Please guide me through analyzing and interpreting this information",
+        "Get feedback on my work": "Please review my work and provide constructive feedback for improvement"
+    }
+
+    learning_goal = prompt_data.get('learning_goal', '')
+    goal_instruction = learning_goal_context.get(learning_goal, "Please help me with")
+    topic_or_question = prompt_data.get('topic_or_question', 'this topic')
+    prompt_parts.append(f"{goal_instruction}: {topic_or_question}")
+
+    # 6. Interaction Style Preferences
+    style_instructions = {
+        "Guide me to discover answers myself": "Instead of giving me direct answers, guide me to discover the solutions through questions and hints",
+        "Explain clearly then let me practice": "First explain the concept clearly, then give me practice opportunities to apply it",
+        "Show examples then help me try similar problems": "Show me examples first, then help me work through similar problems on my own",
+        "Break complex topics into simple steps": "Break this complex topic into simple, manageable steps I can follow",
+        "Connect new ideas to what I already know": "Help me connect these new ideas to concepts I already understand",
+        "Help me see real-world applications": "Show me concrete examples of how this applies to real-world situations"
+    }
+
+    interaction_style = prompt_data.get('interaction_style', '')
+    if interaction_style in style_instructions:
+        prompt_parts.append(style_instructions[interaction_style] + ".")
+
+    # 7. Response Format Preferences
+    response_format = prompt_data.get('response_format', [])
+    if response_format:
+        format_request = "Please structure your response to include: " + ", ".join(response_format[:3]).lower()
+        prompt_parts.append(format_request + ".")
+
+    # 8. Learning Style Adaptations
+    learning_styles = prompt_data.get('learning_styles', [])
+    if learning_styles:
+        style_adaptations = {
+            "Visual (diagrams, charts, visual examples)": "use visual descriptions and examples I can picture",
+            "Auditory (explanations I can 'hear' in my head)": "explain things in a conversational way I can hear in my mind",
+            "Kinesthetic (hands-on examples, real-world applications)": "include hands-on examples and real-world applications",
+            "Reading/Writing (text-based explanations, note-taking)": "provide clear text explanations that are good for note-taking",
+            "Social (discussion-style explanations)": "explain things in a discussion-style format",
+            "Logical (step-by-step reasoning, cause-and-effect)": "use step-by-step logical reasoning and show cause-and-effect relationships"
+        }
+
+        matched_styles = [style_adaptations.get(style) for style in learning_styles if style in style_adaptations]
+        if matched_styles:
+            prompt_parts.append(f"Please adapt your teaching to {', '.join(matched_styles[:2])}.")
+
+    # 9. Feedback and Assessment Preferences
+    feedback_preference = prompt_data.get('feedback_preference', [])
+    if feedback_preference:
+        feedback_requests = []
+        feedback_mapping = {
+            "Check my understanding along the way": "check my understanding at key points",
+            "Point out common mistakes to avoid": "warn me about common mistakes students make",
+            "Suggest study strategies that match my learning style": "suggest study strategies that work for my learning style",
+            "Provide memory tricks and mnemonics": "include memory tricks and mnemonics",
+            "Give me practice problems at different difficulty levels": "provide practice problems at different difficulty levels",
+            "Help me make connections between topics": "help me see connections to other topics I've learned"
+        }
+
+        for pref in feedback_preference[:3]:  # Limit to avoid overly long prompts
+            if pref in feedback_mapping:
+                feedback_requests.append(feedback_mapping[pref])
+
+        if feedback_requests:
+            prompt_parts.append(f"Please also {', and '.join(feedback_requests)}.")
+
+    # 10. Follow-up and Engagement
+    followup_support = prompt_data.get('followup_support', True)
+    if followup_support:
+        prompt_parts.append("Ask me follow-up questions to ensure I truly understand the material.")
+
+    # 11. Special Considerations
+    special_requests = []
+    if prompt_data.get('common_mistakes', False):
+        special_requests.append("highlight common mistakes students make with this topic")
+    if prompt_data.get('exam_focus', False):
+        special_requests.append("focus on aspects most likely to appear on tests")
+    if prompt_data.get('career_connections', False):
+        special_requests.append("explain how this connects to future careers")
+    if prompt_data.get('prerequisite_check', False):
+        special_requests.append("check if I have the prerequisite knowledge needed")
+
+    if special_requests:
+        prompt_parts.append(f"Additionally, please {', and '.join(special_requests)}.")
+
+    # 12. Detail Level Instruction
+    detail_instructions = {
+        "Brief overview": "Keep your explanation concise and focused on the most important points",
+        "Moderate detail": "Provide a moderately detailed explanation with key examples",
+        "Comprehensive explanation": "Give a comprehensive explanation with multiple examples and detailed reasoning",
+        "In-depth analysis": "Provide an in-depth analysis with extensive examples, connections, and implications"
+    }
+
+    detail_level = prompt_data.get('detail_level', '')
+    if detail_level in detail_instructions:
+        prompt_parts.append(detail_instructions[detail_level] + ".")
+
+    # Combine all parts into a coherent prompt
+    return " ".join(prompt_parts)
+
+
+def make_cohort(count, seed=0):
+    """Generate a reproducible cohort of prompt_data dicts covering every option"""
+    rng = random.Random(seed)
+    cohort = []
+    for i in range(count):
+        cohort.append({
+            'grade_level': rng.choice(list(GRADE_FRAGMENTS)),
+            'subject_area': rng.choice(SUBJECT_AREAS),
+            'learning_goal': rng.choice(list(GOAL_FRAGMENTS)),
+            'current_understanding': rng.choice(list(UNDERSTANDING_FRAGMENTS)),
+            'ai_role': rng.choice(list(ROLE_FRAGMENTS)),
+            'interaction_style': rng.choice(list(STYLE_FRAGMENTS)),
+            'feedback_preference': rng.sample(list(FEEDBACK_FRAGMENTS), rng.randint(0, 4)),
+            'topic_or_question': f"student {i} topic: solving quadratic equations by factoring",
+            'background_context': rng.choice(["", "  I understand linear equations but get lost with x squared.  "]),
+            'response_format': rng.sample(RESPONSE_FORMATS, rng.randint(0, 4)),
+            'detail_level': rng.choice(list(DETAIL_FRAGMENTS)),
+            'followup_support': rng.random() < 0.8,
+            'learning_styles': rng.sample(list(LEARNING_STYLE_FRAGMENTS), rng.randint(0, 3)),
+            'common_mistakes': rng.random() < 0.3,
+            'exam_focus': rng.random() < 0.3,
+            'career_connections': rng.random() < 0.3,
+            'prerequisite_check': rng.random() < 0.3
+        })
+    return cohort
+
+
+def time_per_prompt(func, cohort, repeat):
+    """Best-of-repeat wall time per prompt, in microseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(cohort)
+        best = min(best, time.perf_counter() - start)
+    return best / len(cohort) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="prompts per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant (best is reported)")
+    args = parser.parse_args(argv)
+
+    cohort = make_cohort(args.count)
+
+    expected = [legacy_build_advanced_prompt(data) for data in cohort]
+    if [build_advanced_prompt(data) for data in cohort] != expected:
+        sys.exit("build_advanced_prompt output differs from the reference implementation")
+    if list(build_advanced_prompts(cohort)) != expected:
+        sys.exit("build_advanced_prompts output differs from the reference implementation")
+    preview = PromptPreview()
+    for data, prompt in zip(cohort[:2000], expected):
+        preview.update(data)
+        if preview.prompt != prompt:
+            sys.exit("PromptPreview (ADVANCED_SECTIONS) output differs from the reference implementation")
+
+    before = time_per_prompt(lambda c: [legacy_build_advanced_prompt(d) for d in c], cohort, args.repeat)
+    single = time_per_prompt(lambda c: [build_advanced_prompt(d) for d in c], cohort, args.repeat)
+    batch = time_per_prompt(lambda c: list(build_advanced_prompts(c)), cohort, args.repeat)
+
+    print(f"{args.count} prompts, best of {args.repeat} runs (output verified identical)")
+    print(f"  before  build_advanced_prompt   {before:8.2f} us/prompt")
+    print(f"  after   build_advanced_prompt   {single:8.2f} us/prompt  ({before / single:.2f}x)")
+    print(f"  after   build_advanced_prompts  {batch:8.2f} us/prompt  ({before / batch:.2f}x)")
+
+    # Prompt size with repeated instructions removed, and under a budget
+    sample = cohort[:2000]
+    full = sum(count_tokens(prompt) for prompt in expected[:2000]) / len(sample)
+    print(f"estimated tokens per prompt, first {len(sample)} prompts")
+    print(f"  build_advanced_prompt            {full:8.1f}")
+    for budget in (None, 120, 80):
+        shortened = sum(count_tokens(build_budgeted_prompt(data, budget)) for data in sample) / len(sample)
+        label = f"build_budgeted_prompt({budget or 'no budget'})"
+        print(f"  {label:<32} {shortened:8.1f}  ({(1 - shortened / full) * 100:.0f}% shorter)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Micro-benchmark for the prompt test response cache
+
+Runs a set of prompts through the local stand-in model three times: uncached, from
+a fresh ResponseCache over the same store (as after a server restart, so every
+lookup is a disk hit) and again from the same cache (memory hits). Model delays
+are set to zero so the uncached figure is the cost of generating the response,
+not of waiting for it.
+
+Run from the repository root:
+    python -m benchmarks.bench_response_cache --count 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.prompt_testing import LocalModelBackend, run_prompt  # noqa: E402
+from utils.response_cache import CachedBackend, ResponseCache  # noqa: E402
+
+
+def time_per_prompt(backend, prompts):
+    """Wall time per prompt through run_prompt in microseconds, and the responses"""
+    start = time.perf_counter()
+    results = [run_prompt(backend, prompt) for prompt in prompts]
+    return (time.perf_counter() - start) / len(prompts) * 1e6, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000, help="distinct prompts")
+    args = parser.parse_args(argv)
+
+    prompts = [f"Act as my tutor. Please help me understand: topic number {i}" for i in range(args.count)]
+    model = LocalModelBackend(first_token_delay=0, token_delay=0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "responses.db")
+        uncached, expected = time_per_prompt(model, prompts)
+        filling, _ = time_per_prompt(CachedBackend(model, ResponseCache(path)), prompts)
+        cache = ResponseCache(path)
+        disk, from_disk = time_per_prompt(CachedBackend(model, cache), prompts)
+        memory, from_memory = time_per_prompt(CachedBackend(model, cache), prompts)
+        stats = cache.stats()
+
+    responses = [result['response'] for result in expected]
+    for results in (from_disk, from_memory):
+        if [result['response'] for result in results] != responses or not all(r['cached'] for r in results):
+            sys.exit("cached responses differ from the model's")
+
+    print(f"{args.count} prompts through run_prompt (cached responses verified identical)")
+    print(f"  uncached        {uncached:10.1f} us/prompt")
+    print(f"  miss + store    {filling:10.1f} us/prompt")
+    print(f"  disk hit        {disk:10.1f} us/prompt")
+    print(f"  memory hit      {memory:10.1f} us/prompt")
+    print(f"cache: {stats['disk_hits']} disk hits, {stats['memory_hits']} memory hits, {stats['misses']} misses, "
+          f"{stats['disk_bytes'] / 1024:.0f} KB on disk")
+
+
+if __name__ == "__main__":
+    main()
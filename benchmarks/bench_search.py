@@ -0,0 +1,100 @@
+"""Query latency of the full-text search index
+
+Builds a frozen index of --docs synthetic documents, standing in for the static
+content, and an unfrozen index of --saved documents, standing in for one session's
+saved prompts. Words are drawn from a Zipf-like vocabulary so that short prefixes
+expand to many terms. Reports median and p99 latency of exact-word queries and
+search-as-you-type queries ending in a 2 or 3 letter prefix, and exits non-zero when
+any kind's p99 is over --max-p99-us (default MAX_P99_US, the sub-millisecond goal).
+
+Run from the repository root:
+    python -m benchmarks.bench_search --docs 30000
+"""
+import argparse
+import random
+import statistics
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.search import SearchIndex, search_indexes, tokenize  # noqa: E402
+
+VOCABULARY_SIZE = 20000
+WORDS_PER_DOC = 40
+MAX_P99_US = 1000
+
+
+def make_vocabulary(rng):
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))))
+    return sorted(words)
+
+
+def make_index(rng, vocabulary, weights, count, prefix):
+    index = SearchIndex()
+    for number in range(count):
+        text = " ".join(rng.choices(vocabulary, weights, k=WORDS_PER_DOC))
+        index.add((prefix, number), text, {'title': f"{prefix} {number}"})
+    return index
+
+
+def time_queries(indexes, queries):
+    """(median, p99) latency in microseconds"""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        search_indexes(indexes, query, limit=8)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=30000, help="documents in the frozen index")
+    parser.add_argument("--saved", type=int, default=200, help="documents in the session index")
+    parser.add_argument("--queries", type=int, default=2000, help="queries per kind")
+    parser.add_argument("--max-p99-us", type=float, default=MAX_P99_US,
+                        help=f"fail when a query kind's p99 is above this (default: {MAX_P99_US})")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng)
+    rng.shuffle(vocabulary)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    indexes = (
+        make_index(rng, vocabulary, weights, args.docs, 'static').freeze(),
+        make_index(rng, vocabulary, weights, args.saved, 'saved'),
+    )
+
+    def words(count):
+        return " ".join(rng.choices(vocabulary, weights, k=count))
+
+    kinds = {
+        'exact, 2 words': [words(2) + " " for _ in range(args.queries)],
+        'exact + 3-letter prefix': [f"{words(1)} {words(1)[:3]}" for _ in range(args.queries)],
+        'exact + 2-letter prefix': [f"{words(1)} {words(1)[:2]}" for _ in range(args.queries)],
+    }
+    print(f"{args.docs:,} frozen + {args.saved:,} session documents")
+    print(f"  {'query':<26} {'p50 us':>8} {'p99 us':>8}")
+    over = []
+    for name, queries in kinds.items():
+        queries = [query for query in queries if tokenize(query)]
+        median, p99 = time_queries(indexes, queries)
+        print(f"  {name:<26} {median:>8.0f} {p99:>8.0f}")
+        if p99 > args.max_p99_us:
+            over.append(f"{name}: p99 {p99:.0f} us")
+    if over:
+        print(f"Over the {args.max_p99_us:.0f} us p99 bound:")
+        for line in over:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"Every p99 is within {args.max_p99_us:.0f} us.")
+
+
+if __name__ == "__main__":
+    main()
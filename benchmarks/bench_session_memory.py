@@ -0,0 +1,98 @@
+"""Memory held per saved prompt: prompt_data dicts vs compact PromptSelections
+
+Builds a cohort of saved-prompt entries (prompt text, subject, topic, date and the
+builder selections) and measures with tracemalloc what keeping them in memory
+costs, first with the selections as a prompt_data dict, as sessions used to hold
+every saved prompt, then as data.options.PromptSelections. Option labels are
+shared with the catalogue in both layouts, as they are when they come from the
+builder widgets, so the difference is the per-entry containers and codes alone.
+Also reports the stored size of the selections in the prompt library.
+
+Run from the repository root:
+    python -m benchmarks.bench_session_memory --count 1000
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_prompt_assembly import make_cohort  # noqa: E402
+from data.options import PromptSelections  # noqa: E402
+from utils.prompt_library import _encode_prompt_data  # noqa: E402
+from utils.prompt_utils import build_advanced_prompts  # noqa: E402
+
+
+def copy_prompt_data(prompt_data):
+    """A fresh prompt_data dict with fresh lists, as the builder hands over on every run"""
+    return {key: list(value) if isinstance(value, list) else value for key, value in prompt_data.items()}
+
+
+def make_entries(cohort, prompts, compact):
+    """Saved-prompt entries as the builder stores them, with dict or compact selections"""
+    entries = []
+    for prompt_data, prompt in zip(cohort, prompts):
+        topic = prompt_data['topic_or_question']
+        entries.append({
+            'prompt': prompt,
+            'subject': prompt_data['subject_area'],
+            'topic': topic[:50] + "..." if len(topic) > 50 else topic,
+            'date': "2026-10-18 09:30",
+            'prompt_data': PromptSelections.from_prompt_data(prompt_data) if compact else copy_prompt_data(prompt_data),
+        })
+    return entries
+
+
+def measure(build):
+    """Bytes still allocated after build() returns, and its result"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return allocated, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000, help="saved prompts per session")
+    args = parser.parse_args(argv)
+
+    cohort = make_cohort(args.count)
+    for prompt_data in cohort:
+        prompt_data.update(optimize_length=False, token_budget=0)
+    prompts = list(build_advanced_prompts(cohort))
+    for prompt_data in cohort:
+        if PromptSelections.from_prompt_data(prompt_data).to_prompt_data() != prompt_data:
+            sys.exit("PromptSelections does not round-trip the cohort")
+
+    text_bytes = sum(sys.getsizeof(prompt) for prompt in prompts)
+    dict_bytes, _ = measure(lambda: make_entries(cohort, prompts, compact=False))
+    compact_bytes, _ = measure(lambda: make_entries(cohort, prompts, compact=True))
+    selections_dict, _ = measure(lambda: [copy_prompt_data(prompt_data) for prompt_data in cohort])
+    selections_compact, _ = measure(lambda: [PromptSelections.from_prompt_data(prompt_data) for prompt_data in cohort])
+    stored_json = sum(len(json.dumps(d).encode("utf-8")) for d in cohort) / args.count
+    stored_codes = sum(len(_encode_prompt_data(d).encode("utf-8")) for d in cohort) / args.count
+
+    print(f"{args.count} saved prompts; the prompt texts themselves take {text_bytes / args.count:,.0f} bytes "
+          f"each in both layouts and are not counted below")
+    print(f"  {'':<34} {'total KB':>10} {'bytes/entry':>12}")
+    for label, allocated in (
+        ("entries, prompt_data dicts", dict_bytes),
+        ("entries, PromptSelections", compact_bytes),
+        ("selections only, dicts", selections_dict),
+        ("selections only, PromptSelections", selections_compact),
+    ):
+        print(f"  {label:<34} {allocated / 1024:>10,.0f} {allocated / args.count:>12,.0f}")
+    print(f"selections only: {(1 - selections_compact / selections_dict) * 100:.0f}% smaller; "
+          f"whole entries: {(1 - compact_bytes / dict_bytes) * 100:.0f}% smaller")
+    print(f"stored per entry in the library: JSON object {stored_json:,.0f} bytes, codes {stored_codes:,.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Load test for the HTTP JSON API (tools/api_server.py)
+
+Starts the API server in a subprocess (or targets a running one with --url), then
+drives it from concurrent keep-alive clients for a fixed time and reports
+requests/sec and latency percentiles per endpoint. Any non-2xx/304 response is
+counted as an error.
+
+Run from the repository root:
+    python -m benchmarks.load_test_api --clients 8 --duration 10
+    python -m benchmarks.load_test_api --url http://127.0.0.1:8765 --scenario templates
+"""
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from data.options import AI_ROLES, GRADE_LEVELS, RESPONSE_FORMATS, SUBJECT_AREAS  # noqa: E402
+from utils.profiling import summarize_durations  # noqa: E402
+
+
+def advanced_item(rng):
+    return {
+        'ai_role': rng.choice(AI_ROLES),
+        'grade_level': rng.choice(GRADE_LEVELS),
+        'subject_area': rng.choice(SUBJECT_AREAS),
+        'topic_or_question': f"topic number {rng.randrange(100000)}",
+        'response_format': rng.sample(RESPONSE_FORMATS, 2),
+        'followup_support': rng.random() < 0.5,
+    }
+
+
+def build_requests(scenario, subjects, rng):
+    """Return a function producing (label, method, path, body, headers) for the next request"""
+    etags = {}
+
+    def templates():
+        path = "/subjects/" + quote(rng.choice(subjects))
+        headers = {'If-None-Match': etags[path]} if path in etags and rng.random() < 0.5 else {}
+        return "GET /subjects/<subject>", "GET", path, None, headers
+
+    def techniques():
+        return "GET /techniques", "GET", "/techniques", None, {}
+
+    def advanced():
+        return "POST /prompts/advanced", "POST", "/prompts/advanced", json.dumps(advanced_item(rng)), {}
+
+    def batch():
+        body = json.dumps({'items': [advanced_item(rng) for _ in range(50)]})
+        return "POST /prompts/advanced/batch (50)", "POST", "/prompts/advanced/batch", body, {}
+
+    scenarios = {
+        'templates': [templates],
+        'advanced': [advanced],
+        'batch': [batch],
+        'mix': [templates, templates, techniques, advanced, advanced, batch],
+    }
+    choices = scenarios[scenario]
+    return (lambda: rng.choice(choices)()), etags
+
+
+def client(host, port, scenario, subjects, deadline, seed, samples, errors):
+    """One keep-alive connection sending requests until the deadline"""
+    rng = random.Random(seed)
+    next_request, etags = build_requests(scenario, subjects, rng)
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    while time.perf_counter() < deadline:
+        label, method, path, body, headers = next_request()
+        if body is not None:
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(label)
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        elapsed = time.perf_counter() - start
+        if response.status == 304:
+            label += " (304)"
+        elif response.status >= 300:
+            errors.append(label)
+            continue
+        etag = response.getheader("ETag")
+        if etag:
+            etags[path] = etag
+        samples.append((label, elapsed))
+    connection.close()
+
+
+def start_server():
+    """Start tools.api_server on a free port; returns (process, host, port)"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "tools.api_server", "--port", "0", "--quiet"],
+        cwd=ROOT, stderr=subprocess.PIPE, text=True
+    )
+    line = process.stderr.readline()
+    if not line.startswith("Serving on"):
+        process.kill()
+        sys.exit(f"API server failed to start: {line}{process.stderr.read()}")
+    address = urlsplit(line.split()[-1])
+    return process, address.hostname, address.port
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server (default: start one)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--scenario", choices=["mix", "templates", "advanced", "batch"], default="mix")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        address = urlsplit(args.url)
+        host, port = address.hostname, address.port or 80
+    else:
+        process, host, port = start_server()
+
+    try:
+        connection = http.client.HTTPConnection(host, port, timeout=10)
+        connection.request("GET", "/subjects")
+        subjects = json.loads(connection.getresponse().read())['subjects']
+        connection.close()
+
+        samples, errors = [], []
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=client, args=(host, port, args.scenario, subjects, deadline, seed, samples, errors))
+            for seed in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    by_label = {}
+    for label, elapsed in samples:
+        by_label.setdefault(label, []).append(elapsed)
+    print(f"{args.scenario}: {len(samples)} requests from {args.clients} clients in {wall:.1f}s "
+          f"= {len(samples) / wall:,.0f} req/s, {len(errors)} errors")
+    print(f"  {'endpoint':<40} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, durations in sorted(by_label.items()):
+        stats = summarize_durations(sorted(durations))
+        print(f"  {label:<40} {stats['count']:>9} {stats['count'] / wall:>9,.0f} "
+              f"{stats['p50']:>8.2f} {stats['p99']:>8.2f}")
+    overall = summarize_durations(sorted(elapsed for _, elapsed in samples)) if samples else None
+    if overall:
+        print(f"  {'all':<40} {overall['count']:>9} {overall['count'] / wall:>9,.0f} "
+              f"{overall['p50']:>8.2f} {overall['p99']:>8.2f}")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
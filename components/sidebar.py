@@ -1,52 +1,78 @@
 import streamlit as st
+from utils.html_fragments import html_fragment
+from utils.profiling import diagnostics_enabled
 
+PAGES = ["🏠 Home", "📚 Subject-Specific Prompts", "🎯 Prompt Techniques",
+         "🔧 Prompt Builder", "🧪 Test Prompts", "💡 Tips & Best Practices", "📝 My Prompts"]
 
-def render_sidebar():
-    """Render the sidebar navigation and prompt engineering information"""
-
-    # Navigation
-    st.sidebar.title("Navigation")
-    page = st.sidebar.selectbox(
-        "Choose a section:",
-        ["🏠 Home", "📚 Subject-Specific Prompts", "🎯 Prompt Techniques",
-         "🔧 Prompt Builder", "💡 Tips & Best Practices", "📝 My Prompts"]
+
+@html_fragment("sidebar_info")
+def sidebar_info():
+    """Prompt engineering summary, quick tips and the help header"""
+    tips = "\n".join(
+        f'<div class="sidebar-tip">✅ {tip}</div>'
+        for tip in ("Always specify your grade level", "Ask AI to be your tutor",
+                    "Be specific about what you need", "Request step-by-step guidance")
+    )
+    return "\n\n".join((
+        "---",
+        "### 🎓 Prompt Engineering",
+        "**📚 Learn to Create:**\n"
+        "- Effective educational prompts\n"
+        "- Clear learning objectives\n"
+        "- Better AI conversations",
+        "**🎯 Key Benefits:**\n"
+        "- Get better AI responses\n"
+        "- Learn more effectively\n"
+        "- Build transferable skills",
+        "---",
+        "### 💡 Quick Tips",
+        tips,
+        '<div style="font-size: 0.8em; color: #666;">'
+        "<strong>Goal:</strong> Create prompts that work with any AI system - ChatGPT, Claude, Gemini, and more!"
+        "</div>",
+        "---",
+        "### ❓ Need Help?",
+    ))
+
+
+@html_fragment("sidebar_footer")
+def sidebar_footer():
+    """Closing note under the help section"""
+    return (
+        '<div style="font-size: 0.8em; color: #666; margin-top: 20px;">'
+        "💡 <strong>Focus:</strong> Master prompt engineering to enhance your learning with any AI system!"
+        "</div>"
+    )
+
+
+@st.fragment
+def render_search():
+    """Render the sidebar search box and its results; typing reruns only this fragment"""
+    query = st.text_input(
+        "🔍 Search",
+        placeholder="Templates, techniques, tips, your prompts",
+        key="sidebar_search"
     )
+    if not query.strip():
+        return
 
-    # Prompt Engineering Information
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 🎓 Prompt Engineering")
-
-    st.sidebar.markdown("**📚 Learn to Create:**")
-    st.sidebar.markdown("• Effective educational prompts")
-    st.sidebar.markdown("• Clear learning objectives")
-    st.sidebar.markdown("• Better AI conversations")
-
-    st.sidebar.markdown("**🎯 Key Benefits:**")
-    st.sidebar.markdown("• Get better AI responses")
-    st.sidebar.markdown("• Learn more effectively")
-    st.sidebar.markdown("• Build transferable skills")
-
-    # Quick tips section
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 💡 Quick Tips")
-
-    st.sidebar.success("✅ Always specify your grade level")
-    st.sidebar.success("✅ Ask AI to be your tutor")
-    st.sidebar.success("✅ Be specific about what you need")
-    st.sidebar.success("✅ Request step-by-step guidance")
-
-    st.sidebar.markdown("""
-    <div style="font-size: 0.8em; color: #666;">
-    <strong>Goal:</strong> Create prompts that work with any AI system - ChatGPT, Claude, Gemini, and more!
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Help section
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### ❓ Need Help?")
-
-    if st.sidebar.button("📖 Quick Start Guide"):
-        st.sidebar.markdown("""
+    from utils.search import search_all
+
+    results = search_all(query)
+    if not results:
+        st.caption("No matches found.")
+        return
+    for result in results:
+        st.markdown(f"**{result['kind']}** · {result['title']}")
+        st.caption(result['snippet'])
+
+
+@st.fragment
+def render_quick_start():
+    """Quick Start Guide button; clicking it reruns only this fragment"""
+    if st.button("📖 Quick Start Guide"):
+        st.markdown("""
         **Getting Started:**
         1. 📚 Browse subject templates
         2. 🎯 Learn prompt techniques  
@@ -55,10 +81,23 @@ def render_sidebar():
         5. 💾 Save your best prompts
         """)
 
-    st.sidebar.markdown("""
-    <div style="font-size: 0.8em; color: #666; margin-top: 20px;">
-    💡 <strong>Focus:</strong> Master prompt engineering to enhance your learning with any AI system!
-    </div>
-    """, unsafe_allow_html=True)
 
-    return page
\ No newline at end of file
+def render_sidebar():
+    """Render the sidebar navigation and prompt engineering information
+
+    Changing the page reruns the app. The page body is a fragment (main.render_page),
+    so clicks on page widgets do not rerun the sidebar. Search and the Quick Start
+    Guide are fragments that rerun on their own without touching the page body, and
+    the static content is a single cached HTML element.
+    """
+    with st.sidebar:
+        st.title("Navigation")
+        pages = PAGES + ["🩺 Diagnostics"] if diagnostics_enabled() else PAGES
+        page = st.selectbox("Choose a section:", pages)
+
+        render_search()
+        st.markdown(sidebar_info(), unsafe_allow_html=True)
+        render_quick_start()
+        st.markdown(sidebar_footer(), unsafe_allow_html=True)
+
+    return page
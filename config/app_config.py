@@ -18,9 +18,16 @@ def load_custom_css():
     .prompt-example{background-color:#e8f4fd;color:#1a1a1a;padding:1rem;border-radius:0.5rem;border-left:4px solid #1f77b4;margin:1rem 0;border:1px solid #d1ecf1}
     .tip-box{background-color:#e8f5e8;color:#1a1a1a;padding:1rem;border-radius:0.5rem;border-left:4px solid #2ca02c;margin:1rem 0;border:1px solid #c3e6cb}
     .warning-box{background-color:#fff8e1;color:#1a1a1a;padding:1rem;border-radius:0.5rem;border-left:4px solid #ffc107;margin:1rem 0;border:1px solid #f5c6cb}
+    details.strategy{border:1px solid #d6d6d6;border-radius:0.5rem;padding:0.5rem 1rem;margin:0.5rem 0}
+    details.strategy summary{cursor:pointer;font-weight:600}
+    details.strategy[open] summary{margin-bottom:0.5rem}
+    .sidebar-tip{background-color:rgba(33,195,84,0.1);color:#177233;padding:0.5rem 0.75rem;border-radius:0.5rem;margin:0.35rem 0}
     .stTextInput>div>div>input,.stTextArea>div>div>textarea,.stSelectbox>div>div>select{background-color:#ffffff!important;color:#000000!important;border:1px solid #cccccc!important}
     .streamlit-expanderContent{background-color:#ffffff;color:#000000}
     .stButton>button{background-color:#ffffff;color:#000000;border:1px solid #cccccc}
     .stButton>button:hover{background-color:#f0f0f0;color:#000000}
+    .copy-button{background-color:#ffffff;color:#000000;border:1px solid #cccccc;border-radius:0.5rem;padding:0.25rem 0.75rem;min-height:2.5rem;font:inherit;cursor:pointer}
+    .copy-button:hover{background-color:#f0f0f0;border-color:#1f77b4}
+    .copy-text{background-color:#f6f8fa;color:#1a1a1a;padding:0.75rem 1rem;border-radius:0.5rem;margin:0 0 0.5rem;max-height:20rem;overflow:auto;white-space:pre-wrap;word-break:break-word;font-size:0.85rem}
     </style>
     """, unsafe_allow_html=True)
\ No newline at end of file
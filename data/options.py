@@ -0,0 +1,314 @@
+"""Option catalogue for the Prompt Builder, and compact records coded against it
+
+Every selectbox, multiselect and slider option of the builder is listed once here,
+in display order. The builder renders these tuples and utils/prompt_utils keys its
+fragment tables by them, so a label cannot drift between the form and the prompt.
+
+PromptSelections holds one prompt_data with each choice stored as its small
+integer position in the catalogue, lists as bytes of positions and the checkboxes
+as two bitmasks, in a __slots__ object instead of a dict of long label strings.
+Values that are not in the catalogue (from an older release, the bulk tool or the
+API) are kept as given, so every prompt_data round-trips unchanged. Such a value is
+tagged apart from the positions (a one-item tuple in memory, {"v": value} in the
+codes; plain strings need no tag), so a raw 7 is never read as position 7. Lists
+must be lists: a string given for a list field is rejected rather than split.
+"""
+
+GRADE_LEVELS = (
+    "Elementary (K-5)",
+    "Middle School (6-8)",
+    "High School (9-12)",
+    "College/University",
+    "Graduate School",
+)
+SUBJECT_AREAS = (
+    "Mathematics",
+    "Science (Biology/Chemistry/Physics)",
+    "English/Literature",
+    "History/Social Studies",
+    "Study Skills & Test Prep",
+    "Other",
+)
+LEARNING_GOALS = (
+    "Understand a concept I'm confused about",
+    "Get help solving problems step-by-step",
+    "Prepare for a test or assignment",
+    "Connect ideas to real-world applications",
+    "Improve my study techniques",
+    "Analyze and interpret information",
+    "Get feedback on my work",
+)
+UNDERSTANDING_LEVELS = (
+    "Complete beginner - never studied this before",
+    "Basic understanding - know a little but confused",
+    "Moderate understanding - get the basics but struggle with applications",
+    "Good understanding - just need help with specific parts",
+    "Advanced - want to deepen or extend my knowledge",
+)
+AI_ROLES = (
+    "Patient tutor - guide me step by step",
+    "Socratic teacher - ask me questions to help me discover answers",
+    "Study coach - help me develop learning strategies",
+    "Writing mentor - provide feedback and suggestions",
+    "Research assistant - help me find and organize information",
+    "Practice partner - quiz me and give feedback",
+)
+INTERACTION_STYLES = (
+    "Guide me to discover answers myself",
+    "Explain clearly then let me practice",
+    "Show examples then help me try similar problems",
+    "Break complex topics into simple steps",
+    "Connect new ideas to what I already know",
+    "Help me see real-world applications",
+)
+FEEDBACK_OPTIONS = (
+    "Check my understanding along the way",
+    "Point out common mistakes to avoid",
+    "Suggest study strategies that match my learning style",
+    "Provide memory tricks and mnemonics",
+    "Give me practice problems at different difficulty levels",
+    "Help me make connections between topics",
+)
+RESPONSE_FORMATS = (
+    "Step-by-step explanations",
+    "Real-world examples and analogies",
+    "Practice problems with solutions",
+    "Visual descriptions or diagrams",
+    "Memory aids and mnemonics",
+    "Summary of key points",
+    "Questions to test my understanding",
+)
+DETAIL_LEVELS = (
+    "Brief overview",
+    "Moderate detail",
+    "Comprehensive explanation",
+    "In-depth analysis",
+)
+LEARNING_STYLES = (
+    "Visual (diagrams, charts, visual examples)",
+    "Auditory (explanations I can 'hear' in my head)",
+    "Kinesthetic (hands-on examples, real-world applications)",
+    "Reading/Writing (text-based explanations, note-taking)",
+    "Social (discussion-style explanations)",
+    "Logical (step-by-step reasoning, cause-and-effect)",
+)
+
+# prompt_data fields by kind, each in a fixed order that the compact codes rely on
+SINGLE_CHOICE_FIELDS = (
+    ('grade_level', GRADE_LEVELS),
+    ('subject_area', SUBJECT_AREAS),
+    ('learning_goal', LEARNING_GOALS),
+    ('current_understanding', UNDERSTANDING_LEVELS),
+    ('ai_role', AI_ROLES),
+    ('interaction_style', INTERACTION_STYLES),
+    ('detail_level', DETAIL_LEVELS),
+)
+MULTI_CHOICE_FIELDS = (
+    ('feedback_preference', FEEDBACK_OPTIONS),
+    ('response_format', RESPONSE_FORMATS),
+    ('learning_styles', LEARNING_STYLES),
+)
+FLAG_FIELDS = (
+    'followup_support', 'common_mistakes', 'exam_focus', 'career_connections', 'prerequisite_check',
+    'optimize_length',
+)
+TEXT_FIELDS = ('topic_or_question', 'background_context')
+
+CODES_VERSION = 2
+RAW_TAG = 'v'
+
+_POSITIONS = {
+    field: {label: position for position, label in enumerate(options)}
+    for field, options in SINGLE_CHOICE_FIELDS + MULTI_CHOICE_FIELDS
+}
+_SINGLE_NAMES = tuple(field for field, _ in SINGLE_CHOICE_FIELDS)
+_MULTI_NAMES = tuple(field for field, _ in MULTI_CHOICE_FIELDS)
+_OPTIONS = dict(SINGLE_CHOICE_FIELDS + MULTI_CHOICE_FIELDS)
+_FLAG_BITS = {field: 1 << bit for bit, field in enumerate(FLAG_FIELDS)}
+
+
+def _is_position(code):
+    return isinstance(code, int) and not isinstance(code, bool)
+
+
+def _encode_choice(field, value):
+    """Catalogue position of value; other strings as they are, anything else tagged as (value,)"""
+    if isinstance(value, str):
+        position = _POSITIONS[field].get(value)
+        return value if position is None else position
+    return None if value is None else (value,)
+
+
+def _decode_choice(field, code):
+    if _is_position(code):
+        return _OPTIONS[field][code]
+    return code[0] if isinstance(code, tuple) else code
+
+
+def _encode_choices(field, values):
+    """bytes of positions when every value is a catalogue option, else a tuple of the values"""
+    if not isinstance(values, (list, tuple)):
+        raise TypeError(f"{field} must be a list, not {type(values).__name__}")
+    positions = _POSITIONS[field]
+    try:
+        return bytes(positions[value] for value in values)
+    except (KeyError, TypeError):
+        return tuple(values)
+
+
+def _decode_choices(field, codes):
+    if isinstance(codes, bytes):
+        options = _OPTIONS[field]
+        return [options[position] for position in codes]
+    return list(codes)
+
+
+def _choice_to_code(choice):
+    """JSON form of an in-memory single choice"""
+    return {RAW_TAG: choice[0]} if isinstance(choice, tuple) else choice
+
+
+def _choice_from_code(field, code):
+    """In-memory single choice for its JSON form; raises ValueError for a position outside the catalogue"""
+    if _is_position(code):
+        if 0 <= code < len(_OPTIONS[field]):
+            return code
+        raise ValueError(f"{field} position {code} is outside the catalogue")
+    if isinstance(code, dict):
+        return (code[RAW_TAG],)
+    if code is None or isinstance(code, str):
+        return code
+    raise ValueError(f"unexpected {field} code {code!r}")
+
+
+def _choices_to_code(choices):
+    """JSON form of in-memory list choices: positions as a list, other values tagged"""
+    if choices is None:
+        return None
+    return list(choices) if isinstance(choices, bytes) else {RAW_TAG: list(choices)}
+
+
+def _choices_from_code(field, code):
+    if code is None:
+        return None
+    if isinstance(code, dict):
+        return tuple(code[RAW_TAG])
+    if not all(_is_position(value) and 0 <= value < len(_OPTIONS[field]) for value in code):
+        raise ValueError(f"{field} positions outside the catalogue")
+    return bytes(code)
+
+
+class PromptSelections:
+    """Compact form of one builder prompt_data
+
+    Reads like a mapping (selections['ai_role'], .get, `in`) and converts back with
+    to_prompt_data(). codes() and from_codes() give a short JSON-ready list for
+    storage. Fields missing from the original prompt_data stay missing.
+    """
+
+    __slots__ = _SINGLE_NAMES + _MULTI_NAMES + TEXT_FIELDS + ('flags', 'flags_set', 'token_budget')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.flags = 0
+        self.flags_set = 0
+
+    @classmethod
+    def from_prompt_data(cls, prompt_data):
+        """Encode a prompt_data dict; an existing PromptSelections is returned as is"""
+        if isinstance(prompt_data, cls):
+            return prompt_data
+        selections = cls()
+        for field in _SINGLE_NAMES:
+            if field in prompt_data:
+                setattr(selections, field, _encode_choice(field, prompt_data[field]))
+        for field in _MULTI_NAMES:
+            values = prompt_data.get(field)
+            if values is not None:
+                setattr(selections, field, _encode_choices(field, values))
+        for field in TEXT_FIELDS:
+            if field in prompt_data:
+                setattr(selections, field, prompt_data[field])
+        flags = flags_set = 0
+        for field, bit in _FLAG_BITS.items():
+            if field in prompt_data:
+                flags_set |= bit
+                if prompt_data[field]:
+                    flags |= bit
+        selections.flags = flags
+        selections.flags_set = flags_set
+        if 'token_budget' in prompt_data:
+            selections.token_budget = prompt_data['token_budget']
+        return selections
+
+    def __getitem__(self, field):
+        if field in _FLAG_BITS:
+            bit = _FLAG_BITS[field]
+            if self.flags_set & bit:
+                return bool(self.flags & bit)
+            raise KeyError(field)
+        if field not in self.__slots__ or field in ('flags', 'flags_set'):
+            raise KeyError(field)
+        value = getattr(self, field)
+        if value is None:
+            raise KeyError(field)
+        if field in _POSITIONS:
+            return _decode_choices(field, value) if field in _MULTI_NAMES else _decode_choice(field, value)
+        return value
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def __contains__(self, field):
+        return self.get(field) is not None
+
+    def to_prompt_data(self):
+        """The equivalent prompt_data dict"""
+        prompt_data = {}
+        for field in _SINGLE_NAMES + _MULTI_NAMES + TEXT_FIELDS + tuple(_FLAG_BITS) + ('token_budget',):
+            value = self.get(field)
+            if value is not None:
+                prompt_data[field] = value
+        return prompt_data
+
+    def codes(self):
+        """Short JSON-serializable list: version, choices, lists, flags, texts, budget"""
+        codes = [CODES_VERSION]
+        codes.extend(_choice_to_code(getattr(self, field)) for field in _SINGLE_NAMES)
+        codes.extend(_choices_to_code(getattr(self, field)) for field in _MULTI_NAMES)
+        codes.extend((self.flags, self.flags_set))
+        codes.extend(getattr(self, field) for field in TEXT_FIELDS)
+        codes.append(self.token_budget)
+        return codes
+
+    @classmethod
+    def from_codes(cls, codes):
+        """Rebuild a PromptSelections from the output of codes()"""
+        if not codes or codes[0] != CODES_VERSION:
+            raise ValueError(f"unsupported prompt selection codes: {codes[:1]}")
+        selections = cls()
+        values = iter(codes[1:])
+        for field in _SINGLE_NAMES:
+            setattr(selections, field, _choice_from_code(field, next(values)))
+        for field in _MULTI_NAMES:
+            setattr(selections, field, _choices_from_code(field, next(values)))
+        selections.flags = next(values)
+        selections.flags_set = next(values)
+        for field in TEXT_FIELDS:
+            setattr(selections, field, next(values))
+        selections.token_budget = next(values)
+        return selections
+
+    def __eq__(self, other):
+        if not isinstance(other, PromptSelections):
+            return NotImplemented
+        return self.codes() == other.codes()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PromptSelections({self.to_prompt_data()!r})"
@@ -1,7 +1,13 @@
 import streamlit as st
+from utils.profiling import profiled_page
 
 
 # Lazy imports for better performance
+def get_prewarm():
+    from utils.startup import start_prewarm
+    return start_prewarm
+
+
 def get_config():
     from config.app_config import configure_page, load_custom_css
     return configure_page, load_custom_css
@@ -17,45 +23,99 @@ def get_sidebar():
     return render_sidebar
 
 
+def get_copy_reporter():
+    from utils.copy_utils import copy_event_reporter
+    return copy_event_reporter
+
+
+@profiled_page("🏠 Home")
 def load_home_page():
     """Lazy load home page"""
     from app_pages.home import show_home_page
     show_home_page()
 
 
+@profiled_page("📚 Subject-Specific Prompts")
 def load_subject_prompts():
     """Lazy load subject prompts page"""
     from app_pages.subject_prompts import show_subject_prompts
     show_subject_prompts()
 
 
+@profiled_page("🎯 Prompt Techniques")
 def load_prompt_techniques():
     """Lazy load prompt techniques page"""
     from app_pages.prompt_techniques import show_prompt_techniques
     show_prompt_techniques()
 
 
+@profiled_page("🔧 Prompt Builder")
 def load_prompt_builder():
     """Lazy load prompt builder page"""
     from app_pages.prompt_builder import show_prompt_builder
     show_prompt_builder()
 
 
+@profiled_page("🧪 Test Prompts")
+def load_test_prompts():
+    """Lazy load test prompts page"""
+    from app_pages.test_prompts import show_test_prompts
+    show_test_prompts()
+
+
+@profiled_page("💡 Tips & Best Practices")
 def load_tips_practices():
     """Lazy load tips and practices page"""
     from app_pages.tips_practices import show_tips_and_practices
     show_tips_and_practices()
 
 
+@profiled_page("📝 My Prompts")
 def load_my_prompts():
     """Lazy load my prompts page"""
     from app_pages.my_prompts import show_my_prompts
     show_my_prompts()
 
 
+@profiled_page("🩺 Diagnostics")
+def load_diagnostics():
+    """Lazy load diagnostics page"""
+    from app_pages.diagnostics import show_diagnostics
+    show_diagnostics()
+
+
+@st.fragment
+def render_page(page):
+    """Render the selected page
+
+    A fragment: a click on one of the page's widgets reruns only the page, not the
+    header or the sidebar. Changing the page in the sidebar reruns the whole app.
+    """
+    if page == "🏠 Home":
+        load_home_page()
+    elif page == "📚 Subject-Specific Prompts":
+        load_subject_prompts()
+    elif page == "🎯 Prompt Techniques":
+        load_prompt_techniques()
+    elif page == "🔧 Prompt Builder":
+        load_prompt_builder()
+    elif page == "🧪 Test Prompts":
+        load_test_prompts()
+    elif page == "💡 Tips & Best Practices":
+        load_tips_practices()
+    elif page == "📝 My Prompts":
+        load_my_prompts()
+    elif page == "🩺 Diagnostics":
+        load_diagnostics()
+
+
 def main():
     """Main application entry point - optimized for speed"""
 
+    # Warm every page's imports and caches in the background; a no-op once started,
+    # and already done when the server was launched with tools/serve.py
+    get_prewarm()()
+
     # Initialize core functions
     configure_page, load_custom_css = get_config()
     initialize_session_state = get_session_utils()
@@ -77,18 +137,10 @@ def main():
     page = render_sidebar()
 
     # Lazy load pages to reduce initial load time
-    if page == "🏠 Home":
-        load_home_page()
-    elif page == "📚 Subject-Specific Prompts":
-        load_subject_prompts()
-    elif page == "🎯 Prompt Techniques":
-        load_prompt_techniques()
-    elif page == "🔧 Prompt Builder":
-        load_prompt_builder()
-    elif page == "💡 Tips & Best Practices":
-        load_tips_practices()
-    elif page == "📝 My Prompts":
-        load_my_prompts()
+    render_page(page)
+
+    # Copy clicks are handled in the browser; their events come back here in batches
+    get_copy_reporter()()
 
 
 if __name__ == "__main__":
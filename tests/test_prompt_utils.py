@@ -0,0 +1,65 @@
+import random
+
+from data.options import RESPONSE_FORMATS
+from utils.prompt_utils import (
+    DETAIL_FRAGMENTS, FEEDBACK_FRAGMENTS, GOAL_FRAGMENTS, GRADE_FRAGMENTS, LEARNING_STYLE_FRAGMENTS,
+    ROLE_FRAGMENTS, STYLE_FRAGMENTS, UNDERSTANDING_FRAGMENTS, build_advanced_prompt, build_budgeted_prompt
+)
+from utils.token_estimate import count_tokens
+
+
+def every_option():
+    """prompt_data with every list option and every flag selected"""
+    return {
+        'grade_level': list(GRADE_FRAGMENTS)[2],
+        'subject_area': "Mathematics",
+        'learning_goal': list(GOAL_FRAGMENTS)[1],
+        'current_understanding': list(UNDERSTANDING_FRAGMENTS)[1],
+        'ai_role': list(ROLE_FRAGMENTS)[0],
+        'interaction_style': list(STYLE_FRAGMENTS)[3],
+        'topic_or_question': "solving quadratic equations by factoring",
+        'background_context': "I understand linear equations.",
+        'response_format': list(RESPONSE_FORMATS),
+        'learning_styles': list(LEARNING_STYLE_FRAGMENTS),
+        'feedback_preference': list(FEEDBACK_FRAGMENTS),
+        'detail_level': list(DETAIL_FRAGMENTS)[2],
+        'followup_support': True,
+        'common_mistakes': True,
+        'exam_focus': True,
+        'career_connections': True,
+        'prerequisite_check': True,
+    }
+
+
+def random_selections(rng):
+    return {
+        'grade_level': rng.choice(list(GRADE_FRAGMENTS)),
+        'subject_area': "Science",
+        'learning_goal': rng.choice(list(GOAL_FRAGMENTS)),
+        'current_understanding': rng.choice(list(UNDERSTANDING_FRAGMENTS)),
+        'ai_role': rng.choice(list(ROLE_FRAGMENTS)),
+        'interaction_style': rng.choice(list(STYLE_FRAGMENTS)),
+        'topic_or_question': "photosynthesis",
+        'response_format': rng.sample(RESPONSE_FORMATS, rng.randint(0, len(RESPONSE_FORMATS))),
+        'learning_styles': rng.sample(list(LEARNING_STYLE_FRAGMENTS), rng.randint(0, len(LEARNING_STYLE_FRAGMENTS))),
+        'feedback_preference': rng.sample(list(FEEDBACK_FRAGMENTS), rng.randint(0, len(FEEDBACK_FRAGMENTS))),
+        'detail_level': rng.choice(list(DETAIL_FRAGMENTS)),
+        'followup_support': rng.random() < 0.5,
+        'common_mistakes': rng.random() < 0.5,
+        'exam_focus': rng.random() < 0.5,
+        'career_connections': rng.random() < 0.5,
+        'prerequisite_check': rng.random() < 0.5,
+    }
+
+
+def test_budgeted_prompt_without_budget_is_never_longer_than_advanced():
+    rng = random.Random(0)
+    for prompt_data in [every_option()] + [random_selections(rng) for _ in range(2000)]:
+        budgeted = build_budgeted_prompt(prompt_data)
+        advanced = build_advanced_prompt(prompt_data)
+        assert count_tokens(budgeted) <= count_tokens(advanced), prompt_data
+
+
+def test_budgeted_prompt_shortens_every_option_selection():
+    prompt_data = every_option()
+    assert count_tokens(build_budgeted_prompt(prompt_data)) < count_tokens(build_advanced_prompt(prompt_data))
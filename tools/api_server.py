@@ -0,0 +1,297 @@
+"""Local HTTP JSON API for prompt building and template lookup
+
+A small stateless server for integrations (an LMS, scripts) that need prompts
+without driving the Streamlit UI. It uses only the standard library: one thread per
+connection, with HTTP/1.1 keep-alive.
+
+Endpoints (request and response bodies are JSON):
+    GET  /health                      status and content version
+    GET  /subjects                    subject names
+    GET  /subjects/<subject>          {category: template} for one subject
+    GET  /techniques                  every technique
+    GET  /techniques/<technique>      one technique
+    POST /prompts/advanced            prompt_data object -> {"prompt": ...}
+    POST /prompts/advanced/batch      {"items": [prompt_data, ...]} -> {"prompts": [...]}
+    POST /prompts/custom              {"subject", "grade_level", "task_type", "topic",
+                                       "context", "format_pref", "detail_level"} -> {"prompt": ...}
+    POST /prompts/custom/batch        {"items": [...]} -> {"prompts": [...]}
+
+The GET endpoints serve the content packs. Their bodies are serialized once per
+content version and carry an ETag; a request with a matching If-None-Match gets an
+empty 304. The content version is checked at most once per second, so pack edits are
+picked up without a restart.
+
+Run from the repository root:
+    python -m tools.api_server --port 8765
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.constants import PROMPT_TECHNIQUES, SUBJECT_PROMPTS, content_version  # noqa: E402
+from data.options import MULTI_CHOICE_FIELDS  # noqa: E402
+from utils.prompt_utils import build_advanced_prompt, build_advanced_prompts, build_custom_prompt  # noqa: E402
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH = 1000
+VERSION_CHECK_INTERVAL = 1.0
+
+CUSTOM_REQUIRED = ('subject', 'grade_level', 'task_type', 'topic')
+CUSTOM_DEFAULTS = {'context': '', 'format_pref': [], 'detail_level': 'Moderate'}
+ADVANCED_LIST_FIELDS = tuple(field for field, _ in MULTI_CHOICE_FIELDS)
+CUSTOM_LIST_FIELDS = ('format_pref',)
+
+
+class ApiError(Exception):
+    """Error reported to the client as {"error": message} with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _plain(value):
+    """Copy frozen content (read-only mappings and tuples) into JSON-serializable types"""
+    if isinstance(value, str):
+        return value
+    if hasattr(value, 'items'):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _static_payload(path):
+    """Response payload for a GET path, or ApiError(404)"""
+    if path == "/subjects":
+        return {'subjects': list(SUBJECT_PROMPTS)}
+    if path == "/techniques":
+        return {'techniques': _plain(PROMPT_TECHNIQUES)}
+    collection, _, name = path.lstrip("/").partition("/")
+    name = unquote(name)
+    if collection == "subjects" and name in SUBJECT_PROMPTS:
+        return {'subject': name, 'templates': _plain(SUBJECT_PROMPTS[name])}
+    if collection == "techniques" and name in PROMPT_TECHNIQUES:
+        return {'technique': name, **_plain(PROMPT_TECHNIQUES[name])}
+    raise ApiError(HTTPStatus.NOT_FOUND, f"no such resource: {path}")
+
+
+class StaticResponses:
+    """Serialized GET bodies and their ETags, rebuilt when the content version changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked = 0.0
+        self._bodies = {}
+
+    def version(self):
+        """Current content version, re-read at most every VERSION_CHECK_INTERVAL seconds"""
+        now = time.monotonic()
+        if now - self._checked >= VERSION_CHECK_INTERVAL:
+            version = content_version()
+            with self._lock:
+                if version != self._version:
+                    self._version = version
+                    self._bodies = {}
+                self._checked = now
+        return self._version
+
+    def get(self, path):
+        """(etag, body) for a GET path"""
+        version = self.version()
+        cached = self._bodies.get(path)
+        if cached is None:
+            body = _encode(_static_payload(path))
+            etag = f'"{version}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            cached = (etag, body)
+            with self._lock:
+                if self._version == version:
+                    self._bodies[path] = cached
+        return cached
+
+
+def _items(payload):
+    """The "items" list of a batch request"""
+    items = payload.get('items') if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        raise ApiError(HTTPStatus.BAD_REQUEST, 'expected {"items": [...]}')
+    if len(items) > MAX_BATCH:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"at most {MAX_BATCH} items per batch")
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"item {index} is not an object")
+    return items
+
+
+def _check_lists(payload, fields, where=""):
+    """ApiError(400) unless every list field present is a JSON list; a string would be read per character"""
+    for field in fields:
+        value = payload.get(field)
+        if value is not None and not isinstance(value, list):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"{where}{field} must be a list")
+
+
+def _advanced_prompts(items):
+    for index, item in enumerate(items):
+        _check_lists(item, ADVANCED_LIST_FIELDS, f"item {index}: ")
+    try:
+        return list(build_advanced_prompts(items))
+    except (TypeError, AttributeError, ValueError) as error:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"invalid prompt_data: {error}")
+
+
+def _custom_prompt(payload):
+    if not isinstance(payload, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "expected a JSON object")
+    missing = [field for field in CUSTOM_REQUIRED if not payload.get(field)]
+    if missing:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"missing fields: {', '.join(missing)}")
+    _check_lists(payload, CUSTOM_LIST_FIELDS)
+    fields = {**CUSTOM_DEFAULTS, **{key: payload[key] for key in CUSTOM_DEFAULTS if key in payload}}
+    try:
+        return build_custom_prompt(*(payload[field] for field in CUSTOM_REQUIRED),
+                                   fields['context'], tuple(fields['format_pref']), fields['detail_level'])
+    except (TypeError, AttributeError, ValueError) as error:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"invalid fields: {error}")
+
+
+def _post_advanced(payload):
+    if not isinstance(payload, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "expected a prompt_data object")
+    _check_lists(payload, ADVANCED_LIST_FIELDS)
+    try:
+        return {'prompt': build_advanced_prompt(payload)}
+    except (TypeError, AttributeError, ValueError) as error:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"invalid prompt_data: {error}")
+
+
+POST_ROUTES = {
+    "/prompts/advanced": _post_advanced,
+    "/prompts/advanced/batch": lambda payload: {'prompts': _advanced_prompts(_items(payload))},
+    "/prompts/custom": lambda payload: {'prompt': _custom_prompt(payload)},
+    "/prompts/custom/batch": lambda payload: {'prompts': [_custom_prompt(item) for item in _items(payload)]},
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Routes requests to the static content and the prompt builders"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY each response
+    # on a keep-alive connection waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = "PromptHubAPI/1.0"
+    static = StaticResponses()
+    quiet = False
+
+    def _send(self, status, body=b"", headers=()):
+        self.send_response(status)
+        if body or status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_error(self, error):
+        self._send(error.status, _encode({'error': str(error)}))
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip("/") or "/"
+        try:
+            if path == "/health":
+                self._send(HTTPStatus.OK, _encode({'status': 'ok', 'content_version': self.static.version()}))
+                return
+            etag, body = self.static.get(path)
+        except ApiError as error:
+            self._send_error(error)
+            return
+        headers = (("ETag", etag), ("Cache-Control", "no-cache"))
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self._send(HTTPStatus.NOT_MODIFIED, headers=headers)
+        else:
+            self._send(HTTPStatus.OK, body, headers)
+
+    do_HEAD = do_GET
+
+    def _content_length(self):
+        """Validated Content-Length of the request body
+
+        On any error the body is left unread, so the connection is closed after the
+        error response rather than reused.
+        """
+        header = self.headers.get("Content-Length")
+        if header is None:
+            self.close_connection = True
+            raise ApiError(HTTPStatus.LENGTH_REQUIRED, "Content-Length header required")
+        if not (header.isascii() and header.strip().isdigit()):
+            self.close_connection = True
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"invalid Content-Length: {header!r}")
+        length = int(header)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"request body over {MAX_BODY_BYTES} bytes")
+        return length
+
+    def do_POST(self):
+        route = POST_ROUTES.get(urlsplit(self.path).path.rstrip("/"))
+        try:
+            raw = self.rfile.read(self._content_length())
+            if route is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"no such endpoint: {self.path}")
+            try:
+                payload = json.loads(raw)
+            except ValueError as error:
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"invalid JSON: {error}")
+            self._send(HTTPStatus.OK, _encode(route(payload)))
+        except ApiError as error:
+            self._send_error(error)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8765, quiet=False):
+    """Build a ready-to-serve API server; call serve_forever() on it"""
+    ApiHandler.quiet = quiet
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve prompt building and template lookup over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Headless bulk prompt generation
+
+Streams prompt_data rows from a CSV or JSONL file through build_advanced_prompt and
+writes one JSON object per row (the input fields plus a "prompt" key) as JSONL.
+Rows are read, built and written in fixed-size chunks, so memory stays constant no
+matter how large the input is.
+
+CSV columns use the same keys as the Prompt Builder form. List fields
+(feedback_preference, response_format, learning_styles) hold either a JSON array or
+values separated by ";". Boolean fields accept true/false, yes/no or 1/0. Empty
+cells are treated as missing so the builder's defaults apply.
+
+A row that cannot be decoded or has a field of the wrong type (for example
+"background_context": null) is skipped and reported on stderr as "line N: reason";
+the other rows are still written, and the exit status is 1. Input that is not UTF-8
+stops the run at that point with a message on stderr and exit status 1; rows before
+it are kept.
+
+Examples, run from the repository root:
+    python -m tools.bulk_prompts students.csv -o prompts.jsonl
+    python -m tools.bulk_prompts students.jsonl -o prompts.jsonl --workers 4
+    cat students.jsonl | python -m tools.bulk_prompts - --format jsonl > prompts.jsonl
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.options import FLAG_FIELDS, MULTI_CHOICE_FIELDS, SINGLE_CHOICE_FIELDS, TEXT_FIELDS  # noqa: E402
+from utils.prompt_utils import build_advanced_prompts  # noqa: E402
+
+LIST_FIELDS = tuple(field for field, _ in MULTI_CHOICE_FIELDS)
+BOOL_FIELDS = FLAG_FIELDS
+STRING_FIELDS = tuple(field for field, _ in SINGLE_CHOICE_FIELDS) + TEXT_FIELDS
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+
+def normalize_csv_row(row):
+    """Convert a raw CSV row into a prompt_data dict"""
+    prompt_data = {}
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        value = value.strip()
+        if not value:
+            if key in LIST_FIELDS:
+                prompt_data[key] = []
+            continue
+        if key in LIST_FIELDS:
+            if value.startswith('['):
+                prompt_data[key] = json.loads(value)
+            else:
+                prompt_data[key] = [item.strip() for item in value.split(';') if item.strip()]
+        elif key in BOOL_FIELDS:
+            prompt_data[key] = value.lower() in TRUE_VALUES
+        else:
+            prompt_data[key] = value
+    return prompt_data
+
+
+def read_records(stream, fmt):
+    """Yield (line number, raw record) from an open text stream: dict rows for csv, non-blank lines for jsonl"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(stream, 1):
+            if line.strip():
+                yield line_number, line
+
+
+def validate_row(row):
+    """Raise ValueError unless every builder field of row has the type the builder expects"""
+    for field in STRING_FIELDS:
+        value = row.get(field, "")
+        if not isinstance(value, str):
+            raise ValueError(f"{field} must be a string, not {'null' if value is None else type(value).__name__}")
+    for field in LIST_FIELDS:
+        if field in row and not (isinstance(row[field], list) and all(isinstance(item, str) for item in row[field])):
+            raise ValueError(f"{field} must be a list of strings")
+    for field in BOOL_FIELDS:
+        if field in row and not isinstance(row[field], (bool, int)):
+            raise ValueError(f"{field} must be true or false")
+
+
+def decode_record(record, fmt):
+    """Turn one raw record into a validated prompt_data dict; raises ValueError for a bad record"""
+    if fmt == 'csv':
+        row = normalize_csv_row(record)
+    else:
+        row = json.loads(record)
+        if not isinstance(row, dict):
+            raise ValueError(f"expected a JSON object per line, got {type(row).__name__}")
+    validate_row(row)
+    return row
+
+
+def build_chunk(records, fmt):
+    """Decode, build and serialize one chunk of (line, record) pairs
+
+    Returns (row_count, jsonl_text, errors): rows that fail to decode are left out
+    and reported in errors as "line N: reason".
+    """
+    rows = []
+    errors = []
+    for line_number, record in records:
+        try:
+            rows.append(decode_record(record, fmt))
+        except ValueError as error:
+            errors.append(f"line {line_number}: {error}")
+    lines = []
+    for row, prompt in zip(rows, build_advanced_prompts(rows)):
+        row['prompt'] = prompt
+        lines.append(json.dumps(row, ensure_ascii=False))
+    lines.append('')
+    return len(rows), "\n".join(lines) if rows else "", errors
+
+
+def iter_chunks(records, chunk_size):
+    """Group an iterator of records into lists of at most chunk_size records"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def generate(records, fmt, chunk_size=500, workers=0):
+    """Yield build_chunk's (row_count, jsonl_text, errors) per chunk of (line, record) pairs, in input order
+
+    With workers > 0 chunks are decoded, built and serialized in a process pool. At
+    most two chunks per worker are in flight at once, which keeps memory bounded on
+    large inputs.
+    """
+    chunks = iter_chunks(records, chunk_size)
+    if workers <= 0:
+        for chunk in chunks:
+            yield build_chunk(chunk, fmt)
+        return
+
+    from multiprocessing import Pool
+
+    with Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(build_chunk, (chunk, fmt)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def detect_format(path):
+    """Guess the input format from a file extension"""
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def positive_int(text):
+    """argparse type for an integer of at least 1"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate advanced prompts in bulk from CSV or JSONL rows")
+    parser.add_argument("input", help="input file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file (default: stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="input format (default: from file extension)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: 0, build in-process)")
+    parser.add_argument("--chunk-size", type=positive_int, default=500, help="rows per chunk (default: 500)")
+    parser.add_argument("--quiet", action="store_true", help="do not report throughput on stderr")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('jsonl' if args.input == '-' else detect_format(args.input))
+    source = sys.stdin if args.input == '-' else open(args.input, newline='' if fmt == 'csv' else None, encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    total = 0
+    skipped = 0
+    stopped = None
+    start = time.perf_counter()
+    try:
+        for count, text, errors in generate(read_records(source, fmt), fmt, args.chunk_size, args.workers):
+            sink.write(text)
+            total += count
+            skipped += len(errors)
+            for error in errors:
+                print(f"Skipped {error}", file=sys.stderr)
+    except (UnicodeDecodeError, csv.Error) as error:
+        # The input is not UTF-8 (or not CSV); rows already written are kept
+        stopped = error
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed else 0.0
+        print(f"{total} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+    if stopped is not None:
+        print(f"Stopped reading {args.input}: {stopped}", file=sys.stderr)
+    if skipped:
+        print(f"{skipped} invalid rows skipped", file=sys.stderr)
+    if stopped is not None or skipped:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Export or import a whole prompt library from the command line
+
+Writes and reads the same files as the Export / Import panel on the My Prompts page
+(see utils/library_transfer.py), streaming chunk by chunk, so libraries of any size
+move between machines in constant memory.
+
+Examples, run from the repository root:
+    python -m tools.library_transfer export --library <id> -o library.jsonl.gz
+    python -m tools.library_transfer export --format markdown --library spring -o spring.md
+    python -m tools.library_transfer import library.jsonl.gz --library fall
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.library_transfer import (  # noqa: E402
+    EXTENSIONS, FORMATS, detect_import_format, import_library, iter_export
+)
+from utils.prompt_library import DEFAULT_LIBRARY_PATH, KINDS, PromptLibrary  # noqa: E402
+
+
+def detect_export_format(path):
+    """Guess the export format from a file extension, jsonl by default"""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    for fmt, extension in EXTENSIONS.items():
+        if name.endswith("." + extension):
+            return fmt
+    return 'jsonl'
+
+
+def export_command(library, args):
+    fmt = args.format or ('jsonl' if args.output == '-' else detect_export_format(args.output))
+    compress = args.gzip or args.output.lower().endswith(".gz")
+    kinds = (args.kind,) if args.kind else KINDS
+    sink = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    written = 0
+    try:
+        for chunk in iter_export(library, args.library, fmt, kinds, compress):
+            sink.write(chunk)
+            written += len(chunk)
+    finally:
+        if sink is not sys.stdout.buffer:
+            sink.close()
+    return f"{written:,} bytes of {fmt}{' (gzip)' if compress else ''}"
+
+
+def import_command(library, args):
+    fmt = args.format or ('jsonl' if args.input == '-' else detect_import_format(args.input))
+    source = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    try:
+        report = import_library(library, args.library, source, fmt)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+    for error in report['errors']:
+        print(error, file=sys.stderr)
+    return (f"{report['read']:,} records: {report['imported']:,} imported, "
+            f"{report['duplicates']:,} duplicates, {report['invalid']:,} invalid")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import a whole prompt library")
+    parser.add_argument("--db", default=DEFAULT_LIBRARY_PATH, help=f"library database (default: {DEFAULT_LIBRARY_PATH})")
+    parser.add_argument("--library", required=True,
+                        help="library id: the ?library= value of the app link, or user:<id> for a signed-in user")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write the library to a file")
+    export.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    export.add_argument("--format", choices=FORMATS, help="output format (default: from file extension)")
+    export.add_argument("--gzip", action="store_true", help="compress the output (default: when it ends in .gz)")
+    export.add_argument("--kind", choices=KINDS, help="export only custom prompts or only favorites")
+
+    import_ = commands.add_parser("import", help="add the records of an export to the library")
+    import_.add_argument("input", help="JSONL or CSV file, optionally gzip-compressed, or - for stdin")
+    import_.add_argument("--format", choices=["jsonl", "csv"], help="input format (default: from file extension)")
+    args = parser.parse_args(argv)
+
+    library = PromptLibrary(args.db)
+    start = time.perf_counter()
+    summary = export_command(library, args) if args.command == "export" else import_command(library, args)
+    print(f"{summary} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
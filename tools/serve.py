@@ -0,0 +1,43 @@
+"""Launch the app with every page prewarmed before it takes traffic
+
+Runs utils.startup.prewarm in this process, then starts the Streamlit server here
+too, so the imports and resource caches it filled are the ones sessions use. The
+server only binds its port once the prewarm is done, which makes Streamlit's
+/_stcore/health endpoint a readiness probe. Set PROMPT_HUB_READY_FILE to also get a
+JSON summary written when the process is ready.
+
+Arguments after the options are passed to `streamlit run`. Run from the repository root:
+    python -m tools.serve
+    python -m tools.serve --server.port 8080 --server.headless true
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils.startup import get_startup_status, start_prewarm  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prewarm the app, then serve it with Streamlit")
+    parser.add_argument("--no-prewarm", action="store_true", help="start serving immediately")
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    if not args.no_prewarm:
+        start_prewarm().join()
+        summary = get_startup_status().summary()
+        steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in summary['steps'].items())
+        print(f"Prewarmed in {summary['seconds'] * 1000:.0f} ms ({steps})", file=sys.stderr)
+        for name, error in summary['errors'].items():
+            print(f"Prewarm step {name!r} failed: {error}", file=sys.stderr)
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", str(ROOT / "main.py"), *streamlit_args]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
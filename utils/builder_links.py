@@ -0,0 +1,73 @@
+"""Shareable Prompt Builder links
+
+A builder configuration travels in the URL as a compact token, so any server
+replica can restore it without session or database state. The token is a version
+character followed by the URL-safe base64 (unpadded) of the raw-deflated JSON codes
+of a PromptSelections. A typical configuration with a one-line topic encodes to
+well under 200 characters.
+
+Decoded tokens come from anyone who has a link, so every value is checked against
+the option catalogue; unknown options are dropped and the builder's own defaults
+apply to them.
+"""
+import base64
+import json
+import zlib
+
+from data.options import FLAG_FIELDS, MULTI_CHOICE_FIELDS, SINGLE_CHOICE_FIELDS, TEXT_FIELDS, PromptSelections
+
+QUERY_PARAM = "builder"
+TOKEN_VERSION = "1"
+MAX_TOKEN_LENGTH = 4096
+MAX_TEXT_LENGTH = 2000
+MAX_TOKEN_BUDGET = 2000
+
+
+def encode_builder_token(prompt_data):
+    """URL-safe token for a prompt_data dict or PromptSelections"""
+    codes = PromptSelections.from_prompt_data(prompt_data).codes()
+    raw = json.dumps(codes, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    packed = compressor.compress(raw) + compressor.flush()
+    return TOKEN_VERSION + base64.urlsafe_b64encode(packed).decode("ascii").rstrip("=")
+
+
+def _sanitize(prompt_data):
+    """Keep only values the builder form can show"""
+    clean = {}
+    for field, options in SINGLE_CHOICE_FIELDS:
+        if prompt_data.get(field) in options:
+            clean[field] = prompt_data[field]
+    for field, options in MULTI_CHOICE_FIELDS:
+        values = prompt_data.get(field)
+        if isinstance(values, list):
+            clean[field] = [value for value in dict.fromkeys(values) if isinstance(value, str) and value in options]
+    for field in TEXT_FIELDS:
+        if isinstance(prompt_data.get(field), str):
+            clean[field] = prompt_data[field][:MAX_TEXT_LENGTH]
+    for field in FLAG_FIELDS:
+        if field in prompt_data:
+            clean[field] = bool(prompt_data[field])
+    budget = prompt_data.get('token_budget')
+    if isinstance(budget, int) and not isinstance(budget, bool):
+        clean['token_budget'] = min(max(budget, 0), MAX_TOKEN_BUDGET)
+    return clean
+
+
+def decode_builder_token(token):
+    """prompt_data for a token; raises ValueError if it is malformed or from an unknown version"""
+    if not token or len(token) > MAX_TOKEN_LENGTH:
+        raise ValueError("missing or oversized builder token")
+    if token[0] != TOKEN_VERSION:
+        raise ValueError(f"unsupported builder token version {token[0]!r}")
+    try:
+        packed = base64.urlsafe_b64decode(token[1:] + "=" * (-len(token[1:]) % 4))
+        decompressor = zlib.decompressobj(-15)
+        raw = decompressor.decompress(packed, MAX_TOKEN_LENGTH * 8)
+        if decompressor.unconsumed_tail:
+            raise ValueError("builder token expands too far")
+        codes = json.loads(raw)
+        prompt_data = PromptSelections.from_codes(codes).to_prompt_data()
+    except (ValueError, TypeError, KeyError, IndexError, StopIteration, zlib.error) as error:
+        raise ValueError(f"invalid builder token: {error}") from None
+    return _sanitize(prompt_data)
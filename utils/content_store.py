@@ -0,0 +1,65 @@
+"""Content addressing for prompt bodies
+
+A prompt body is identified by a digest of its normalized text, so identical prompts
+are detected with one hash lookup and stored once no matter how many library
+entries refer to them. BodyCache keeps recently used bodies in memory, shared by
+every session of the server process.
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text):
+    """Canonical form used for addressing: NFC, trimmed, runs of whitespace collapsed"""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def prompt_digest(text):
+    """Hex digest identifying a prompt body"""
+    return hashlib.blake2b(normalize_prompt(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BodyCache:
+    """Thread-safe LRU map of digest -> body text
+
+    put() returns the cached string when the digest is already present, so callers
+    end up sharing one string object per distinct body.
+    """
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._bodies = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._bodies)
+
+    def get(self, digest):
+        """Return the cached body for digest, or None"""
+        with self._lock:
+            body = self._bodies.get(digest)
+            if body is not None:
+                self._bodies.move_to_end(digest)
+            return body
+
+    def put(self, digest, body):
+        """Cache body under digest and return the shared instance"""
+        with self._lock:
+            cached = self._bodies.get(digest)
+            if cached is not None:
+                self._bodies.move_to_end(digest)
+                return cached
+            self._bodies[digest] = body
+            if len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+            return body
+
+    def discard(self, digest):
+        """Forget a body that is no longer stored"""
+        with self._lock:
+            self._bodies.pop(digest, None)
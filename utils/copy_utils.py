@@ -1,35 +1,178 @@
+"""Client-side clipboard copy
+
+The copy buttons are a small custom component (st.components.v2): the text travels
+with the button when the page renders, and a click copies it in the browser with
+no script rerun. If the Clipboard API is unavailable (plain http on another host,
+older browsers) the copy falls back to a hidden textarea and execCommand; failing
+that, the button reveals the text selected for Ctrl+C.
+
+Each mount ships its component's code, so the buttons carry only a short stub.
+The clipboard code lives in copy_event_reporter, mounted once per page inside a
+fragment. It also queues every copy and sends the queue back a couple of seconds
+after the last click, so reporting reruns only that fragment and never delays the
+copy. Counts per page are kept process-wide for the diagnostics page.
+"""
+import hashlib
+import threading
+from collections import Counter
+
 import streamlit as st
 
+from utils.profiling import current_page
 
-def create_copy_button(text, button_text="📋 Copy", key=None):
-    """Create a copy button that shows text for easy copying"""
-
-    # Create unique key
-    button_key = f"copy_btn_{key}" if key else "copy_btn"
-
-    if st.button(button_text, key=button_key):
-        # Show text in a text area for easy copying
-        st.success("📋 Text ready to copy! Select all text below and copy:")
-        st.text_area(
-            "Select all (Ctrl+A or Cmd+A) then copy (Ctrl+C or Cmd+C):",
-            value=text,
-            height=150,
-            key=f"copy_area_{button_key}",
-            help="Click in this box, press Ctrl+A (or Cmd+A on Mac) to select all, then Ctrl+C (or Cmd+C on Mac) to copy"
-        )
+REPORT_DELAY_MS = 2000
+
+# Mounted once per page. Defines the shared clipboard function the buttons call and
+# batches their copy events; the queue lives on window so events survive the
+# reporter remounting between reruns. Text is only ever assigned as a value.
+COPY_SUPPORT_JS = """
+function fallbackCopy(text) {
+  const area = document.createElement("textarea");
+  area.value = text;
+  area.setAttribute("readonly", "");
+  area.style.position = "fixed";
+  area.style.opacity = "0";
+  document.body.appendChild(area);
+  area.select();
+  let copied = false;
+  try {
+    copied = document.execCommand("copy");
+  } catch (error) {
+    copied = false;
+  }
+  area.remove();
+  return copied;
+}
+
+export default function ({ setTriggerValue }) {
+  const queue = (window.promptHubCopyQueue = window.promptHubCopyQueue || []);
+  let timer = null;
+
+  const flush = () => {
+    timer = null;
+    if (queue.length) {
+      setTriggerValue("copied", queue.splice(0));
+    }
+  };
+  const schedule = () => {
+    clearTimeout(timer);
+    timer = setTimeout(flush, %(delay)d);
+  };
+
+  window.promptHubCopy = async (text, source) => {
+    let copied = false;
+    if (navigator.clipboard && window.isSecureContext) {
+      try {
+        await navigator.clipboard.writeText(text);
+        copied = true;
+      } catch (error) {
+        // Permission denied or document not focused; try the legacy path
+      }
+    }
+    copied = copied || fallbackCopy(text);
+    if (copied) {
+      queue.push(source);
+      schedule();
+    }
+    return copied;
+  };
+
+  if (queue.length) {
+    schedule();
+  }
+  return () => clearTimeout(timer);
+}
+""" % {'delay': REPORT_DELAY_MS}
+
+# Sent with every button, so it only wires the click to window.promptHubCopy
+COPY_BUTTON_HTML = '<pre class="copy-text" hidden></pre><button type="button" class="copy-button"></button>'
+COPY_BUTTON_JS = """
+export default function ({ data, parentElement }) {
+  const button = parentElement.querySelector(".copy-button");
+  const block = parentElement.querySelector(".copy-text");
+  let timer = null;
+  button.textContent = data.label;
+  block.textContent = data.text;
+  block.hidden = !data.show;
+  button.onclick = async () => {
+    const copied = window.promptHubCopy && await window.promptHubCopy(data.text, data.source);
+    if (!copied) {
+      block.hidden = false;
+      window.getSelection().selectAllChildren(block);
+    }
+    button.textContent = copied ? "✅ Copied!" : "⌨️ Press Ctrl+C";
+    clearTimeout(timer);
+    timer = setTimeout(() => { button.textContent = data.label; }, 1500);
+  };
+  return () => clearTimeout(timer);
+}
+"""
+
+
+class CopyCounter:
+    """Thread-safe copy counts by page"""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, sources):
+        with self._lock:
+            self._counts.update(str(source) for source in sources)
 
+    def counts(self):
+        """{page: copies}, most copied first"""
+        with self._lock:
+            return dict(self._counts.most_common())
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+@st.cache_resource
+def get_copy_counts():
+    """Process-wide copy counts reported by the browser"""
+    return CopyCounter()
+
+
+# Registering an unchanged definition is a silent dict update of a few microseconds.
+# It is repeated on every mount because each server runtime has its own registry.
+# Styles come from load_custom_css rather than each button's shadow root.
+def _copy_component():
+    """Mount command of the copy button component"""
+    return st.components.v2.component("copy_button", html=COPY_BUTTON_HTML, js=COPY_BUTTON_JS,
+                                      isolate_styles=False)
+
+
+def _support_component():
+    """Mount command of the clipboard support and copy event reporter"""
+    return st.components.v2.component("copy_support", js=COPY_SUPPORT_JS)
+
+
+def create_copy_button(text, button_text="📋 Copy", key=None):
+    """Button that copies text to the clipboard in the browser, without a rerun"""
+    _copy_component()(
+        data={'text': text, 'label': button_text, 'source': current_page() or "(no page)", 'show': False},
+        key=f"copy_btn_{key}" if key else None,
+        width="content",
+    )
     return True
 
 
 def create_copy_section(text, title="Copy this prompt"):
-    """Create a section with text display and copy button"""
-
+    """Text block with a copy button; the text is sent to the browser once"""
     st.markdown(f"**{title}:**")
+    _copy_component()(
+        data={'text': text, 'label': "📋 Copy", 'source': current_page() or "(no page)", 'show': True},
+        key=f"copy_section_{hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()}",
+    )
+    return True
 
-    # Display the text in a code block for easy reading
-    st.code(text, language="text")
-
-    # Add the copy button
-    create_copy_button(text, "📋 Show Copy Area", key=f"copy_{abs(hash(text))}")
 
-    return True
\ No newline at end of file
+@st.fragment
+def copy_event_reporter():
+    """Install the browser clipboard support and collect batched copy events; reruns only this fragment"""
+    result = _support_component()(key="copy_event_reporter", on_copied_change=lambda: None, height=0)
+    if result.get('copied'):
+        get_copy_counts().record(result['copied'])
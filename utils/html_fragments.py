@@ -0,0 +1,75 @@
+"""Render-once cache for static page HTML
+
+Static sections (technique cards, tip lists, home page boxes) are the same for every
+user, so each one is rendered to a single HTML string the first time it is needed
+and reused by every session until the content packs change. Pages emit that string
+with one st.markdown call instead of building many small elements on every rerun.
+
+Register a builder with @html_fragment(name). Calling the decorated function returns
+the cached HTML for its arguments and the current content version. Builders that
+take arguments can list the ones worth rendering ahead of time with variants, a
+callable returning argument tuples; prewarm_fragments renders every builder for them.
+"""
+import html
+import inspect
+
+import streamlit as st
+
+_builders = {}
+_variants = {}
+
+
+def html_fragment(name, variants=None):
+    """Decorator registering a builder whose HTML is cached per content version and arguments"""
+    def decorator(build):
+        _builders[name] = build
+        if variants is not None:
+            _variants[name] = variants
+
+        def cached(*args):
+            from data.constants import content_version
+            return _render(name, content_version(), args)
+        cached.__name__ = build.__name__
+        cached.__doc__ = build.__doc__
+        return cached
+    return decorator
+
+
+@st.cache_resource(max_entries=512, show_spinner=False)
+def _render(name, version, args):
+    """Build one fragment; version is part of the key so content updates re-render"""
+    return _builders[name](*args)
+
+
+def prewarm_fragments():
+    """Render every registered builder for the current content, returning how many fragments were built
+
+    Builders with arguments are only rendered for their declared variants.
+    """
+    from data.constants import content_version
+
+    version = content_version()
+    rendered = 0
+    for name, build in _builders.items():
+        variants = _variants.get(name)
+        if variants is None and inspect.signature(build).parameters:
+            continue
+        for args in (variants() if variants is not None else [()]):
+            _render(name, version, tuple(args))
+            rendered += 1
+    return rendered
+
+
+def escape(text):
+    """Escape content text for inclusion in fragment HTML"""
+    return html.escape(text, quote=False)
+
+
+def box(css_class, body):
+    """A styled box around already-escaped HTML; must not contain blank lines"""
+    return f'<div class="{css_class}">{body}</div>'
+
+
+def bullet_lines(items):
+    """Escaped items as a run of "• item" lines"""
+    return "<br>".join(f"• {escape(item)}" for item in items)
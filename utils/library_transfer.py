@@ -0,0 +1,289 @@
+"""Library-wide export and import of saved prompts and favorites
+
+Export walks the library with keyset pagination (PromptLibrary.iter_entries) and
+yields the file as a sequence of byte chunks, so no step holds more than one page
+of entries or one chunk of output. Three formats are written:
+
+    jsonl      one JSON object per entry
+    csv        one row per entry, prompt_data as a JSON cell
+    markdown   a readable document; it is not read back by import
+
+Every record carries kind ("custom" or "favorite"), subject, category, topic, date,
+prompt and, for custom prompts, the builder prompt_data. With compress=True the chunks
+are compressed incrementally into a standard .gz stream.
+
+Import reads JSONL or CSV (optionally gzip-compressed, detected from the magic
+bytes) from a binary stream one record at a time. Each record is validated, and
+valid ones are written in batches of one transaction each. Prompts already in the
+library, or repeated within the file, are skipped by the library's unique digest
+index, so importing the same file twice is harmless.
+"""
+import csv
+import gzip
+import io
+import json
+import re
+import zlib
+from datetime import datetime
+
+from data.options import MULTI_CHOICE_FIELDS
+from utils.prompt_library import CUSTOM, FAVORITE, KINDS
+
+FORMATS = ('jsonl', 'csv', 'markdown')
+EXTENSIONS = {'jsonl': 'jsonl', 'csv': 'csv', 'markdown': 'md'}
+MIME_TYPES = {'jsonl': 'application/x-ndjson', 'csv': 'text/csv', 'markdown': 'text/markdown'}
+CSV_COLUMNS = ('kind', 'subject', 'category', 'topic', 'date', 'prompt', 'prompt_data')
+KIND_TITLES = {CUSTOM: "💾 Custom Prompts", FAVORITE: "⭐ Favorites"}
+LIST_FIELDS = frozenset(field for field, _ in MULTI_CHOICE_FIELDS)
+
+CHUNK_CHARS = 64 * 1024
+IMPORT_BATCH = 500
+MAX_PROMPT_CHARS = 100_000
+MAX_FIELD_CHARS = 500
+MAX_REPORTED_ERRORS = 20
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def export_record(kind, entry):
+    """Plain dict written for one library entry"""
+    record = {
+        'kind': kind,
+        'subject': entry['subject'],
+        'category': entry.get('category'),
+        'topic': entry.get('topic'),
+        'date': entry['date'],
+        'prompt': entry['prompt'],
+    }
+    prompt_data = entry.get('prompt_data')
+    if prompt_data is not None:
+        record['prompt_data'] = prompt_data.to_prompt_data()
+    return record
+
+
+def _jsonl_lines(library, library_id, kinds):
+    for kind in kinds:
+        for entry in library.iter_entries(library_id, kind):
+            yield json.dumps(export_record(kind, entry), ensure_ascii=False) + "\n"
+
+
+def _csv_lines(library, library_id, kinds):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for kind in kinds:
+        for entry in library.iter_entries(library_id, kind):
+            record = export_record(kind, entry)
+            prompt_data = record.get('prompt_data')
+            record['prompt_data'] = json.dumps(prompt_data, ensure_ascii=False) if prompt_data is not None else None
+            writer.writerow([record[column] for column in CSV_COLUMNS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _fence(text):
+    """A code fence longer than any backtick run in text"""
+    if "```" not in text:
+        return "```"
+    return "`" * (max(len(run) for run in re.findall(r"`+", text)) + 1)
+
+
+def _markdown_lines(library, library_id, kinds):
+    yield f"# My Prompt Library\n\nExported {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+    for kind in kinds:
+        yield f"\n## {KIND_TITLES[kind]} ({library.count(library_id, kind)})\n"
+        for entry in library.iter_entries(library_id, kind):
+            title = entry.get('topic') if kind == CUSTOM else entry.get('category')
+            fence = _fence(entry['prompt'])
+            yield f"\n### {entry['subject']} - {title} ({entry['date']})\n\n{fence}\n{entry['prompt']}\n{fence}\n"
+
+
+_WRITERS = {'jsonl': _jsonl_lines, 'csv': _csv_lines, 'markdown': _markdown_lines}
+
+
+def _chunked(pieces, size=CHUNK_CHARS):
+    """Join small text pieces into chunks of about size characters, encoded as UTF-8"""
+    pending, length = [], 0
+    for piece in pieces:
+        pending.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(pending).encode("utf-8")
+            pending, length = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def _gzipped(chunks):
+    """Compress byte chunks into one gzip stream"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(library, library_id, fmt='jsonl', kinds=KINDS, compress=False):
+    """Yield the export of a library as byte chunks"""
+    if fmt not in _WRITERS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    chunks = _chunked(_WRITERS[fmt](library, library_id, kinds))
+    return _gzipped(chunks) if compress else chunks
+
+
+def export_file_name(fmt, compress=False, stem="prompt_library"):
+    """Download file name for an export, e.g. prompt_library_20261018.jsonl.gz"""
+    name = f"{stem}_{datetime.now().strftime('%Y%m%d')}.{EXTENSIONS[fmt]}"
+    return name + ".gz" if compress else name
+
+
+def detect_import_format(file_name):
+    """'csv' for .csv[.gz] files, otherwise 'jsonl'"""
+    name = file_name.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return 'csv' if name.endswith(".csv") else 'jsonl'
+
+
+def _open_text(stream):
+    """Text reader over a binary stream, decompressing it when it starts with the gzip magic"""
+    stream = io.BufferedReader(stream) if not hasattr(stream, "peek") else stream
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def _jsonl_records(text):
+    """Yield (line number, record or error message) for each non-blank line"""
+    for number, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield number, f"invalid JSON: {error}"
+            continue
+        yield number, record if isinstance(record, dict) else "expected a JSON object"
+
+
+def _csv_records(text):
+    """Yield (line number, record or error message) for each CSV row"""
+    reader = csv.DictReader(text)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as error:
+            yield reader.line_num, f"unreadable CSV row: {error}"
+            continue
+        prompt_data = row.get('prompt_data')
+        if prompt_data:
+            try:
+                row['prompt_data'] = json.loads(prompt_data)
+            except ValueError as error:
+                yield reader.line_num, f"invalid prompt_data JSON: {error}"
+                continue
+        yield reader.line_num, {key: value for key, value in row.items() if key is not None and value != ''}
+
+
+def _clean_prompt_data(prompt_data):
+    """prompt_data with only JSON scalars and lists of strings; raises ValueError otherwise"""
+    if not isinstance(prompt_data, dict):
+        raise ValueError("prompt_data must be an object")
+    clean = {}
+    for field, value in prompt_data.items():
+        if field == 'token_budget' and (not isinstance(value, int) or isinstance(value, bool)):
+            raise ValueError("prompt_data.token_budget must be an integer")
+        if field in LIST_FIELDS and not isinstance(value, list) and value is not None:
+            raise ValueError(f"prompt_data.{field} must be a list of short strings")
+        if isinstance(value, list):
+            if not all(isinstance(item, str) and len(item) <= MAX_FIELD_CHARS for item in value):
+                raise ValueError(f"prompt_data.{field} must be a list of short strings")
+        elif isinstance(value, str):
+            if len(value) > MAX_PROMPT_CHARS:
+                raise ValueError(f"prompt_data.{field} is too long")
+        elif not isinstance(value, (bool, int, float)) and value is not None:
+            raise ValueError(f"prompt_data.{field} has an unsupported type")
+        clean[field] = value
+    return clean
+
+
+def _text_field(record, field, required=False, limit=MAX_FIELD_CHARS):
+    value = record.get(field)
+    if value is None or value == '':
+        if required:
+            raise ValueError(f"missing {field}")
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be a string")
+    if len(value) > limit:
+        raise ValueError(f"{field} is longer than {limit:,} characters")
+    return value
+
+
+def validate_record(record):
+    """(kind, entry) ready for PromptLibrary.add_many; raises ValueError for a bad record"""
+    kind = record.get('kind', CUSTOM if record.get('topic') is not None else FAVORITE)
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind {kind!r}")
+    prompt = _text_field(record, 'prompt', required=True, limit=MAX_PROMPT_CHARS)
+    if not prompt.strip():
+        raise ValueError("missing prompt")
+    entry = {
+        'prompt': prompt,
+        'subject': _text_field(record, 'subject') or "Other",
+        'date': _text_field(record, 'date') or datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
+    if kind == CUSTOM:
+        entry['topic'] = _text_field(record, 'topic') or ""
+        if record.get('prompt_data') is not None:
+            entry['prompt_data'] = _clean_prompt_data(record['prompt_data'])
+    else:
+        entry['category'] = _text_field(record, 'category') or ""
+    return kind, entry
+
+
+def import_library(library, library_id, stream, fmt='jsonl', batch_size=IMPORT_BATCH, progress=None):
+    """Validate and insert every record of a binary stream; returns a report dict
+
+    The report counts records read, imported, skipped as duplicates and rejected as
+    invalid, and lists the first MAX_REPORTED_ERRORS problems as "line N: message".
+    progress, if given, is called with the report after every batch.
+    """
+    report = {'read': 0, 'imported': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+    batches = {kind: [] for kind in KINDS}
+
+    def flush(kind):
+        batch = batches[kind]
+        written = library.add_many(library_id, kind, batch)
+        report['imported'] += written
+        report['duplicates'] += len(batch) - written
+        batch.clear()
+        if progress is not None:
+            progress(report)
+
+    records = _csv_records if fmt == 'csv' else _jsonl_records
+    try:
+        for line, record in records(_open_text(stream)):
+            report['read'] += 1
+            try:
+                if isinstance(record, str):
+                    raise ValueError(record)
+                kind, entry = validate_record(record)
+            except ValueError as error:
+                report['invalid'] += 1
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append(f"line {line}: {error}")
+                continue
+            batches[kind].append(entry)
+            if len(batches[kind]) >= batch_size:
+                flush(kind)
+    except (OSError, EOFError, UnicodeDecodeError, zlib.error) as error:
+        report['errors'].append(f"stopped reading: {error}")
+    for kind in KINDS:
+        if batches[kind]:
+            flush(kind)
+    return report
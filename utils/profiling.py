@@ -0,0 +1,145 @@
+"""Per-rerun timing and profiling hooks
+
+profiled_page times a page function on every rerun and section times named blocks
+inside it. Samples are kept in bounded rolling windows shared by the whole server
+process, so the diagnostics page can report p50/p95/p99 per page and per section.
+A single rerun can also be captured with cProfile on request.
+"""
+import cProfile
+import io
+import math
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import streamlit as st
+
+WINDOW_SIZE = 500
+_current_page = threading.local()
+
+
+class TimingStore:
+    """Rolling windows of durations (in seconds) keyed by name"""
+
+    def __init__(self, window_size=WINDOW_SIZE):
+        self.window_size = window_size
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, duration):
+        """Add one duration sample under key"""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window_size)
+            samples.append(duration)
+
+    def summary(self):
+        """Return {key: {'count', 'p50', 'p95', 'p99', 'max'}} with times in milliseconds"""
+        with self._lock:
+            snapshot = {key: sorted(samples) for key, samples in self._samples.items()}
+        return {key: summarize_durations(samples) for key, samples in snapshot.items()}
+
+    def clear(self):
+        """Drop every sample"""
+        with self._lock:
+            self._samples.clear()
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize_durations(ordered):
+    """Percentile summary of ascending duration samples, in milliseconds"""
+    return {
+        'count': len(ordered),
+        'p50': _percentile(ordered, 0.50) * 1000,
+        'p95': _percentile(ordered, 0.95) * 1000,
+        'p99': _percentile(ordered, 0.99) * 1000,
+        'max': ordered[-1] * 1000,
+    }
+
+
+@st.cache_resource
+def get_page_timings():
+    """Process-wide timings for whole page functions"""
+    return TimingStore()
+
+
+@st.cache_resource
+def get_section_timings():
+    """Process-wide timings for named sections, keyed by (page, section)"""
+    return TimingStore()
+
+
+@st.cache_resource
+def get_model_timings():
+    """Process-wide model response timings, keyed by (backend, metric)"""
+    return TimingStore()
+
+
+def diagnostics_enabled():
+    """The diagnostics page is opt-in for the operator: PROMPT_HUB_DIAGNOSTICS=1
+
+    Not a query parameter, since the page can clear process-wide caches and timings.
+    """
+    return os.environ.get("PROMPT_HUB_DIAGNOSTICS") == "1"
+
+
+def request_profile():
+    """Capture the next page rerun of this session with cProfile"""
+    st.session_state.profile_next_rerun = True
+
+
+def current_page():
+    """Name of the page function running on this thread, or None"""
+    return getattr(_current_page, 'name', None)
+
+
+def profiled_page(name):
+    """Decorator timing every call of a page function under name
+
+    If request_profile() was called in this session, the next call is also run
+    under cProfile and the report is stored in st.session_state.last_profile.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = None
+            if st.session_state.get('profile_next_rerun'):
+                st.session_state.profile_next_rerun = False
+                profiler = cProfile.Profile()
+
+            previous_page = getattr(_current_page, 'name', None)
+            _current_page.name = name
+            start = time.perf_counter()
+            try:
+                if profiler is not None:
+                    return profiler.runcall(func, *args, **kwargs)
+                return func(*args, **kwargs)
+            finally:
+                get_page_timings().record(name, time.perf_counter() - start)
+                _current_page.name = previous_page
+                if profiler is not None:
+                    report = io.StringIO()
+                    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+                    st.session_state.last_profile = {'page': name, 'report': report.getvalue()}
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def section(name):
+    """Time a named block inside the current page function"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        page = current_page() or "(no page)"
+        get_section_timings().record((page, name), time.perf_counter() - start)
@@ -0,0 +1,326 @@
+"""Persistent prompt library backed by SQLite
+
+Saved prompts and favorites are stored in one table, indexed by library, kind,
+subject, category and date. Queries use keyset pagination (WHERE id < last_id) so
+fetching any page costs the same no matter how deep into the library it is.
+
+Prompt bodies are content-addressed: each distinct body is stored once in
+prompt_bodies under the digest of its normalized text, with a reference count, and
+library entries hold only the digest. Duplicate checks, saves and deletes are
+single index lookups, and bodies read back are shared through one in-memory cache
+by every session. The builder selections of a custom prompt are stored as the
+compact codes of data.options.PromptSelections rather than a JSON object of labels.
+
+Every write bumps the library's revision in library_revisions, in the same
+transaction, so a session holding derived state (its search index) can tell with one
+lookup whether another session or an import changed the library.
+
+The database runs in WAL mode so readers never block the writer. Each thread gets
+its own connection; Streamlit serves every session from its own script thread.
+"""
+import json
+import os
+import sqlite3
+import threading
+
+import streamlit as st
+
+from data.options import PromptSelections
+from utils.content_store import BodyCache, prompt_digest
+
+CUSTOM = 'custom'
+FAVORITE = 'favorite'
+KINDS = (CUSTOM, FAVORITE)
+
+DEFAULT_LIBRARY_PATH = os.environ.get("PROMPT_LIBRARY_PATH", "prompt_library.db")
+
+SCHEMA_VERSION = 3
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompt_bodies (
+    digest TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    refcount INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS prompts (
+    id INTEGER PRIMARY KEY,
+    library TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    category TEXT,
+    topic TEXT,
+    digest TEXT NOT NULL REFERENCES prompt_bodies (digest),
+    prompt_data TEXT,
+    created TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_prompts_digest ON prompts (library, kind, digest);
+CREATE INDEX IF NOT EXISTS idx_prompts_kind ON prompts (library, kind, id);
+CREATE INDEX IF NOT EXISTS idx_prompts_subject ON prompts (library, kind, subject, id);
+CREATE INDEX IF NOT EXISTS idx_prompts_category ON prompts (library, kind, category, id);
+CREATE INDEX IF NOT EXISTS idx_prompts_created ON prompts (library, kind, created, id);
+CREATE TABLE IF NOT EXISTS library_revisions (
+    library TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+COLUMNS = "id, kind, subject, category, topic, digest, prompt_data, created"
+# A prompt already saved in the same library and kind is skipped, not an error;
+# any other constraint failure still raises
+INSERT_ENTRY = (
+    "INSERT INTO prompts (library, kind, subject, category, topic, digest, prompt_data, created) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (library, kind, digest) DO NOTHING"
+)
+BUMP_REVISION = (
+    "INSERT INTO library_revisions (library, revision) VALUES (?, 1) "
+    "ON CONFLICT (library) DO UPDATE SET revision = revision + 1"
+)
+RETAIN_BODY = (
+    "INSERT INTO prompt_bodies (digest, body, refcount) VALUES (?, ?, 1) "
+    "ON CONFLICT (digest) DO UPDATE SET refcount = refcount + 1"
+)
+
+
+def _row_to_entry(row, body):
+    """Convert a database row and its prompt body into the entry dict used by the pages"""
+    entry_id, kind, subject, category, topic, digest, prompt_data, created = row
+    entry = {'id': entry_id, 'subject': subject, 'prompt': body, 'digest': digest, 'date': created}
+    if kind == CUSTOM:
+        entry['topic'] = topic
+        entry['prompt_data'] = _decode_prompt_data(prompt_data)
+    else:
+        entry['category'] = category
+    return entry
+
+
+def _encode_prompt_data(prompt_data):
+    """Compact JSON codes for a prompt_data dict or PromptSelections"""
+    return json.dumps(PromptSelections.from_prompt_data(prompt_data).codes(), ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode_prompt_data(stored):
+    """PromptSelections for a stored prompt_data column of compact codes"""
+    return PromptSelections.from_codes(json.loads(stored)) if stored else PromptSelections()
+
+
+def _entry_to_row(library, kind, entry, digest):
+    """Convert an entry dict into insert parameters"""
+    prompt_data = entry.get('prompt_data')
+    return (
+        library,
+        kind,
+        entry.get('subject', ''),
+        entry.get('category'),
+        entry.get('topic'),
+        digest,
+        _encode_prompt_data(prompt_data) if prompt_data is not None else None,
+        entry.get('date', ''),
+    )
+
+
+def _execute_script(connection, script):
+    """Run each statement of script inside the current transaction"""
+    for statement in script.split(';'):
+        if statement.strip():
+            connection.execute(statement)
+
+
+class PromptLibrary:
+    """Repository for saved prompts and favorites"""
+
+    def __init__(self, path=DEFAULT_LIBRARY_PATH, body_cache=None):
+        self.path = path
+        self.bodies = body_cache if body_cache is not None else BodyCache()
+        self._local = threading.local()
+        self._create_schema()
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _create_schema(self):
+        """Create the tables if they do not exist yet"""
+        connection = self._connection()
+        with connection:
+            # DDL does not open a transaction implicitly; create everything atomically
+            connection.execute("BEGIN IMMEDIATE")
+            _execute_script(connection, SCHEMA)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def load_bodies(self, digests):
+        """Return {digest: body} for digests, reading only bodies missing from the shared cache"""
+        bodies = {}
+        missing = set()
+        for digest in digests:
+            if digest not in bodies and digest not in missing:
+                body = self.bodies.get(digest)
+                if body is None:
+                    missing.add(digest)
+                else:
+                    bodies[digest] = body
+        if missing:
+            placeholders = ", ".join("?" * len(missing))
+            for digest, body in self._connection().execute(
+                f"SELECT digest, body FROM prompt_bodies WHERE digest IN ({placeholders})", tuple(missing)
+            ):
+                bodies[digest] = self.bodies.put(digest, body)
+        return bodies
+
+    def _attach_bodies(self, rows):
+        """Build entries for rows, reading only bodies missing from the shared cache"""
+        bodies = self.load_bodies(row[5] for row in rows)
+        return [_row_to_entry(row, bodies[row[5]]) for row in rows]
+
+    def _insert(self, connection, library, kind, entry):
+        """Insert one entry and retain its body; returns the new id, or None for a duplicate"""
+        body = entry['prompt']
+        digest = prompt_digest(body)
+        cursor = connection.execute(INSERT_ENTRY, _entry_to_row(library, kind, entry, digest))
+        if not cursor.rowcount:
+            return None
+        connection.execute(RETAIN_BODY, (digest, body))
+        self.bodies.put(digest, body)
+        return cursor.lastrowid
+
+    def add(self, library, kind, entry):
+        """Insert one entry and return its id, or None if the same prompt is already saved"""
+        with self._connection() as connection:
+            entry_id = self._insert(connection, library, kind, entry)
+            if entry_id is not None:
+                connection.execute(BUMP_REVISION, (library,))
+            return entry_id
+
+    def add_many(self, library, kind, entries):
+        """Insert many entries in a single transaction, skipping duplicates; returns how many were written"""
+        written = 0
+        with self._connection() as connection:
+            for entry in entries:
+                if self._insert(connection, library, kind, entry) is not None:
+                    written += 1
+            if written:
+                connection.execute(BUMP_REVISION, (library,))
+        return written
+
+    def get(self, library, entry_id):
+        """Return the entry with entry_id, or None"""
+        row = self._connection().execute(
+            f"SELECT {COLUMNS} FROM prompts WHERE library = ? AND id = ?", (library, entry_id)
+        ).fetchone()
+        return self._attach_bodies([row])[0] if row else None
+
+    def delete(self, library, entry_id):
+        """Delete an entry, releasing its body; returns False if it no longer exists"""
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT digest FROM prompts WHERE library = ? AND id = ?", (library, entry_id)
+            ).fetchone()
+            if row is None:
+                return False
+            digest = row[0]
+            connection.execute("DELETE FROM prompts WHERE id = ?", (entry_id,))
+            connection.execute("UPDATE prompt_bodies SET refcount = refcount - 1 WHERE digest = ?", (digest,))
+            released = connection.execute(
+                "DELETE FROM prompt_bodies WHERE digest = ? AND refcount <= 0", (digest,)
+            ).rowcount
+            connection.execute(BUMP_REVISION, (library,))
+        if released:
+            self.bodies.discard(digest)
+        return True
+
+    def revision(self, library):
+        """Number of write transactions that changed the library; 0 for one never written"""
+        row = self._connection().execute(
+            "SELECT revision FROM library_revisions WHERE library = ?", (library,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def find(self, library, kind, prompt):
+        """Return the id of the entry holding the same (normalized) prompt text, or None"""
+        row = self._connection().execute(
+            "SELECT id FROM prompts WHERE library = ? AND kind = ? AND digest = ?",
+            (library, kind, prompt_digest(prompt))
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _filters(library, kind, subject, category, date_from, date_to):
+        """WHERE clause and parameters for the optional filters"""
+        clauses = ["library = ?", "kind = ?"]
+        params = [library, kind]
+        if subject is not None:
+            clauses.append("subject = ?")
+            params.append(subject)
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if date_from is not None:
+            clauses.append("created >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("created < ?")
+            params.append(date_to)
+        return clauses, params
+
+    def page(self, library, kind, subject=None, category=None, date_from=None, date_to=None,
+             after=None, limit=20, newest_first=True):
+        """Return (entries, next_cursor) for one page of a kind
+
+        Pass the returned cursor as `after` to fetch the following page; it is None
+        once the last page has been returned. Dates compare as the stored
+        "YYYY-MM-DD[ HH:MM]" strings, date_to being exclusive.
+        """
+        clauses, params = self._filters(library, kind, subject, category, date_from, date_to)
+        if after is not None:
+            clauses.append("id < ?" if newest_first else "id > ?")
+            params.append(after)
+        order = "DESC" if newest_first else "ASC"
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM prompts WHERE {' AND '.join(clauses)} ORDER BY id {order} LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+        entries = self._attach_bodies(rows[:limit])
+        next_cursor = entries[-1]['id'] if len(rows) > limit else None
+        return entries, next_cursor
+
+    def iter_entries(self, library, kind, batch_size=500, **filters):
+        """Yield every matching entry, oldest first, one page at a time"""
+        cursor = None
+        while True:
+            entries, cursor = self.page(
+                library, kind, after=cursor, limit=batch_size, newest_first=False, **filters
+            )
+            yield from entries
+            if cursor is None:
+                return
+
+    def count(self, library, kind, subject=None, category=None, date_from=None, date_to=None):
+        """Number of matching entries"""
+        clauses, params = self._filters(library, kind, subject, category, date_from, date_to)
+        return self._connection().execute(
+            f"SELECT COUNT(*) FROM prompts WHERE {' AND '.join(clauses)}", params
+        ).fetchone()[0]
+
+    def digests(self, library, kind):
+        """Body digests of every entry of a kind"""
+        rows = self._connection().execute(
+            "SELECT digest FROM prompts WHERE library = ? AND kind = ?", (library, kind)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def subjects(self, library, kind):
+        """Distinct subjects of a kind, alphabetically"""
+        rows = self._connection().execute(
+            "SELECT DISTINCT subject FROM prompts WHERE library = ? AND kind = ? ORDER BY subject", (library, kind)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+
+@st.cache_resource
+def get_prompt_library(path=DEFAULT_LIBRARY_PATH):
+    """Shared library repository for the whole server process"""
+    return PromptLibrary(path)
@@ -0,0 +1,298 @@
+"""Prompt test harness: pluggable model backends and a bounded concurrent runner
+
+A backend turns a prompt into a response. Backends register themselves by name with
+register_backend; the default is a deterministic local stand-in model, so prompts can
+be tried without network access or API keys and the same prompt always gives the
+same answer.
+
+Backends stream: stream(prompt, context) yields response chunks as they are
+produced. ResponseMeter wraps a stream to record time to first token and token
+throughput, both for rendering with st.write_stream and for batch runs.
+
+run_prompts sends prompts through a bounded thread pool. Every call gets a
+CallContext carrying its deadline and the batch's cancel flag; backends check it
+between units of work so a timeout or cancellation stops them promptly.
+"""
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.content_store import prompt_digest
+from utils.profiling import summarize_durations
+from utils.token_estimate import count_tokens
+
+OK = 'ok'
+TIMEOUT = 'timeout'
+CANCELLED = 'cancelled'
+ERROR = 'error'
+
+DEFAULT_TIMEOUT = 10.0
+MAX_WORKERS = 8
+
+_backends = {}
+
+
+class CallCancelled(Exception):
+    """Raised inside a backend when its call timed out or the run was cancelled"""
+
+
+class CallContext:
+    """Deadline and cancellation state for one backend call"""
+
+    def __init__(self, timeout, cancel_event):
+        self.deadline = time.perf_counter() + timeout
+        self.cancel_event = cancel_event
+        # Set by CachedBackend when the response came from the response cache
+        self.cached = False
+
+    @property
+    def timed_out(self):
+        return time.perf_counter() >= self.deadline
+
+    def check(self):
+        """Raise CallCancelled if the call should stop"""
+        if self.cancel_event.is_set() or self.timed_out:
+            raise CallCancelled()
+
+    def sleep(self, seconds):
+        """Wait up to seconds, waking early and raising CallCancelled when the call should stop"""
+        remaining = self.deadline - time.perf_counter()
+        if self.cancel_event.wait(min(seconds, max(0.0, remaining))) or seconds > remaining:
+            raise CallCancelled()
+
+
+class ModelBackend:
+    """Interface for something that answers prompts
+
+    Subclasses implement stream(prompt, context), a generator of response chunks,
+    or generate(prompt, context), which returns the whole response; each default
+    is built on the other. Call context.check() or context.sleep() while working.
+    cache_params() returns the settings that change the response text, which become
+    part of the response cache key.
+    """
+
+    name = None
+
+    def cache_params(self):
+        return {}
+
+    def stream(self, prompt, context):
+        yield self.generate(prompt, context)
+
+    def generate(self, prompt, context):
+        return "".join(self.stream(prompt, context))
+
+
+def register_backend(backend_class):
+    """Class decorator making a backend selectable by its name"""
+    _backends[backend_class.name] = backend_class
+    return backend_class
+
+
+def backend_names():
+    """Registered backend names, the default first"""
+    return list(_backends)
+
+
+def get_backend(name, **options):
+    """New instance of the named backend, passing options to its constructor"""
+    return _backends[name](**options)
+
+
+LOCAL_OPENINGS = (
+    "Great question - let's work through {topic} together.",
+    "Let's build your understanding of {topic} one piece at a time.",
+    "Before we dive into {topic}, tell me what you already know about it.",
+)
+LOCAL_SENTENCES = (
+    "First, let's make sure the key terms are clear.",
+    "Try restating the main idea in your own words.",
+    "Here is a small example to anchor the concept.",
+    "Notice which step students most often skip here.",
+    "Now try a similar problem on your own and show me your reasoning.",
+    "How does this connect to something you studied earlier?",
+    "Let's check: what would change if one of the conditions were different?",
+    "Write down the one idea you would put on a summary card.",
+)
+GOAL_TOPIC = re.compile(r":\s*([^.?!]+)")
+
+
+@register_backend
+class LocalModelBackend(ModelBackend):
+    """Deterministic stand-in model that answers locally
+
+    The response is picked from canned tutoring sentences with a generator seeded by
+    the prompt digest, and is streamed word by word after first_token_delay seconds,
+    with token_delay seconds between words.
+    """
+
+    name = "Local stand-in model (deterministic)"
+
+    def __init__(self, first_token_delay=0.05, token_delay=0.004):
+        # The delays only change how fast the response arrives, so they are not cache params
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+
+    def response_words(self, prompt):
+        """The full deterministic response for prompt, as a list of words"""
+        rng = random.Random(prompt_digest(prompt))
+        match = GOAL_TOPIC.search(prompt)
+        topic = match.group(1).strip()[:80] if match else "this topic"
+        sentences = [rng.choice(LOCAL_OPENINGS).format(topic=topic)]
+        sentences += rng.sample(LOCAL_SENTENCES, rng.randint(3, 6))
+        return " ".join(sentences).split(" ")
+
+    def stream(self, prompt, context):
+        words = self.response_words(prompt)
+        context.sleep(self.first_token_delay)
+        yield words[0]
+        for word in words[1:]:
+            context.sleep(self.token_delay)
+            yield " " + word
+
+
+class ResponseMeter:
+    """Wraps a response stream, timing the first chunk and counting the tokens that arrive"""
+
+    def __init__(self, chunks, context):
+        self._chunks = chunks
+        self.context = context
+        self.parts = []
+        self.tokens = 0
+        self.start = None
+        self.first_chunk = None
+        self.end = None
+
+    def __iter__(self):
+        return self.chunks()
+
+    def chunks(self):
+        """Yield the chunks of the underlying stream while recording their timing"""
+        self.start = time.perf_counter()
+        try:
+            for chunk in self._chunks:
+                if self.first_chunk is None:
+                    self.first_chunk = time.perf_counter()
+                self.parts.append(chunk)
+                self.tokens += count_tokens(chunk)
+                yield chunk
+        finally:
+            self.end = time.perf_counter()
+
+    @property
+    def cached(self):
+        """Whether the response was served from the response cache"""
+        return self.context.cached
+
+    @property
+    def text(self):
+        return "".join(self.parts)
+
+    @property
+    def latency(self):
+        return self.end - self.start
+
+    @property
+    def ttft(self):
+        """Seconds from the request to the first chunk, or None if nothing arrived"""
+        return self.first_chunk - self.start if self.first_chunk is not None else None
+
+    @property
+    def tokens_per_second(self):
+        """Token rate after the first chunk arrived"""
+        if self.first_chunk is None or self.end <= self.first_chunk:
+            return 0.0
+        return self.tokens / (self.end - self.first_chunk)
+
+
+def stream_prompt(backend, prompt, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+    """ResponseMeter over the backend's stream for prompt; iterating it raises CallCancelled on timeout"""
+    context = CallContext(timeout, cancel_event or threading.Event())
+    return ResponseMeter(backend.stream(prompt, context), context)
+
+
+def run_prompt(backend, prompt, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+    """Run one prompt to completion
+
+    Returns a result dict with status, response, latency and ttft (seconds), tokens,
+    tokens_per_second and whether the response was cached.
+    """
+    meter = stream_prompt(backend, prompt, timeout, cancel_event)
+    try:
+        for _ in meter:
+            pass
+        status = TIMEOUT if meter.latency > timeout else OK
+        response = meter.text
+    except CallCancelled:
+        status = TIMEOUT if meter.latency >= timeout else CANCELLED
+        response = None
+    except Exception as error:  # a failing backend must not take the whole batch down
+        status = ERROR
+        response = f"{type(error).__name__}: {error}"
+    return {
+        'status': status,
+        'response': response if status in (OK, ERROR) else None,
+        'latency': meter.latency,
+        'ttft': meter.ttft,
+        'tokens': meter.tokens if status == OK else 0,
+        'tokens_per_second': meter.tokens_per_second if status == OK else 0.0,
+        'cached': meter.cached,
+    }
+
+
+def run_prompts(backend, prompts, max_workers=4, timeout=DEFAULT_TIMEOUT, cancel_event=None, on_result=None):
+    """Run prompts concurrently on at most max_workers threads
+
+    Returns (results, stats). results line up with prompts; stats holds the wall time,
+    throughput and latency percentiles of the successful calls. on_result(index,
+    result) is called from the caller's thread as each call finishes. If the caller
+    is interrupted (for example by a Streamlit rerun), every outstanding call is
+    cancelled before the exception propagates.
+    """
+    cancel_event = cancel_event or threading.Event()
+    results = [None] * len(prompts)
+    start = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, MAX_WORKERS)),
+                                  thread_name_prefix="prompt-test")
+    try:
+        futures = {
+            executor.submit(run_prompt, backend, prompt, timeout, cancel_event): index
+            for index, prompt in enumerate(prompts)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_result is not None:
+                on_result(index, results[index])
+    except BaseException:
+        cancel_event.set()
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, run_stats(results, time.perf_counter() - start)
+
+
+def run_stats(results, wall):
+    """Wall time, throughput, cache hits and latency summary for a finished run"""
+    completed = [result for result in results if result is not None]
+    succeeded = sorted(result['latency'] for result in completed if result['status'] == OK)
+    stats = {
+        'wall': wall,
+        'count': len(completed),
+        'succeeded': len(succeeded),
+        'cached': sum(result['cached'] for result in completed),
+        'throughput': len(succeeded) / wall if wall > 0 else 0.0,
+        'tokens_per_second': sum(result['tokens'] for result in completed) / wall if wall > 0 else 0.0,
+        'statuses': {status: sum(result['status'] == status for result in completed)
+                     for status in (OK, TIMEOUT, CANCELLED, ERROR)},
+    }
+    if succeeded:
+        stats['latency'] = summarize_durations(succeeded)
+    first_tokens = sorted(
+        result['ttft'] for result in completed if result['status'] == OK and result['ttft'] is not None
+    )
+    if first_tokens:
+        stats['ttft'] = summarize_durations(first_tokens)
+    return stats
@@ -1,3 +1,115 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+from data.options import (
+    AI_ROLES, DETAIL_LEVELS, FEEDBACK_OPTIONS, GRADE_LEVELS, INTERACTION_STYLES, LEARNING_GOALS, LEARNING_STYLES,
+    UNDERSTANDING_LEVELS
+)
+
+
+def _fragments(options, sentences):
+    """Read-only {option: sentence} table, pairing each catalogue option with its sentence in order"""
+    if len(options) != len(sentences):
+        raise ValueError(f"{len(sentences)} sentences for {len(options)} options")
+    return MappingProxyType(dict(zip(options, sentences)))
+
+
+# Fragment tables for build_advanced_prompt. They are built once per process and
+# hold finished sentences (trailing punctuation included) so assembly is a lookup
+# and a single join.
+
+# 1. Role Assignment
+ROLE_FRAGMENTS = _fragments(AI_ROLES, (
+    "Act as my patient and supportive tutor.",
+    "Act as my Socratic teacher who guides learning through thoughtful questions.",
+    "Act as my study coach and learning strategist.",
+    "Act as my writing mentor and editor.",
+    "Act as my research assistant and information organizer.",
+    "Act as my practice partner and learning assessor.",
+))
+DEFAULT_ROLE_FRAGMENT = "Act as my educational assistant."
+
+# 2. Student Context
+GRADE_FRAGMENTS = _fragments(GRADE_LEVELS, (
+    "elementary school student",
+    "middle school student",
+    "high school student",
+    "college student",
+    "graduate student",
+))
+DEFAULT_GRADE_FRAGMENT = "student"
+
+# 3. Current Understanding Level
+UNDERSTANDING_FRAGMENTS = _fragments(UNDERSTANDING_LEVELS, (
+    "I'm completely new to this topic and have never studied it before.",
+    "I have basic understanding but I'm confused about key parts.",
+    "I understand the basics but struggle with applying the concepts.",
+    "I have good overall understanding but need help with specific aspects.",
+    "I have advanced understanding and want to deepen my knowledge further.",
+))
+
+# 5. Specific Learning Request
+GOAL_FRAGMENTS = _fragments(LEARNING_GOALS, (
+    "Please help me understand this concept by breaking it down clearly",
+    "Please guide me through solving this step-by-step, letting me try each step",
+    "Please help me prepare for assessment by focusing on key concepts and likely questions",
+    "Please help me see how this connects to real-world situations and applications",
+    "Please help me develop better study strategies for this material",
+    "Please guide me through analyzing and interpreting this information",
+    "Please review my work and provide constructive feedback for improvement",
+))
+DEFAULT_GOAL_FRAGMENT = "Please help me with"
+
+# 6. Interaction Style Preferences
+STYLE_FRAGMENTS = _fragments(INTERACTION_STYLES, (
+    "Instead of giving me direct answers, guide me to discover the solutions through questions and hints.",
+    "First explain the concept clearly, then give me practice opportunities to apply it.",
+    "Show me examples first, then help me work through similar problems on my own.",
+    "Break this complex topic into simple, manageable steps I can follow.",
+    "Help me connect these new ideas to concepts I already understand.",
+    "Show me concrete examples of how this applies to real-world situations.",
+))
+
+# 8. Learning Style Adaptations
+LEARNING_STYLE_FRAGMENTS = _fragments(LEARNING_STYLES, (
+    "use visual descriptions and examples I can picture",
+    "explain things in a conversational way I can hear in my mind",
+    "include hands-on examples and real-world applications",
+    "provide clear text explanations that are good for note-taking",
+    "explain things in a discussion-style format",
+    "use step-by-step logical reasoning and show cause-and-effect relationships",
+))
+
+# 9. Feedback and Assessment Preferences
+FEEDBACK_FRAGMENTS = _fragments(FEEDBACK_OPTIONS, (
+    "check my understanding at key points",
+    "warn me about common mistakes students make",
+    "suggest study strategies that work for my learning style",
+    "include memory tricks and mnemonics",
+    "provide practice problems at different difficulty levels",
+    "help me see connections to other topics I've learned",
+))
+
+# 10. Follow-up and Engagement
+FOLLOWUP_FRAGMENT = "Ask me follow-up questions to ensure I truly understand the material."
+
+# 11. Special Considerations, in the order they are appended
+SPECIAL_FRAGMENTS = (
+    ('common_mistakes', "highlight common mistakes students make with this topic"),
+    ('exam_focus', "focus on aspects most likely to appear on tests"),
+    ('career_connections', "explain how this connects to future careers"),
+    ('prerequisite_check', "check if I have the prerequisite knowledge needed")
+)
+
+# 12. Detail Level Instruction
+DETAIL_FRAGMENTS = _fragments(DETAIL_LEVELS, (
+    "Keep your explanation concise and focused on the most important points.",
+    "Provide a moderately detailed explanation with key examples.",
+    "Give a comprehensive explanation with multiple examples and detailed reasoning.",
+    "Provide an in-depth analysis with extensive examples, connections, and implications.",
+))
+
+
 def build_custom_prompt(subject, grade_level, task_type, topic, context, format_pref, detail_level):
     """Build a custom prompt based on user inputs"""
     prompt_parts = []
@@ -38,157 +150,341 @@ def build_custom_prompt(subject, grade_level, task_type, topic, context, format_
     return " ".join(prompt_parts)
 
 
-def build_advanced_prompt(prompt_data):
-    """Build an advanced educational prompt based on comprehensive user inputs"""
+@lru_cache(maxsize=256)
+def _format_fragment(selections):
+    """Render the response format sentence for a tuple of selections"""
+    return "Please structure your response to include: " + ", ".join(selections[:3]).lower() + "."
 
-    prompt_parts = []
 
-    # 1. Role Assignment - This is crucial for educational prompts
-    role_mapping = {
-        "Patient tutor - guide me step by step": "Act as my patient and supportive tutor",
-        "Socratic teacher - ask me questions to help me discover answers": "Act as my Socratic teacher who guides learning through thoughtful questions",
-        "Study coach - help me develop learning strategies": "Act as my study coach and learning strategist",
-        "Writing mentor - provide feedback and suggestions": "Act as my writing mentor and editor",
-        "Research assistant - help me find and organize information": "Act as my research assistant and information organizer",
-        "Practice partner - quiz me and give feedback": "Act as my practice partner and learning assessor"
-    }
+@lru_cache(maxsize=256)
+def _learning_style_fragment(selections):
+    """Render the learning style sentence for a tuple of selections"""
+    matched_styles = [LEARNING_STYLE_FRAGMENTS[style] for style in selections if style in LEARNING_STYLE_FRAGMENTS]
+    if matched_styles:
+        return f"Please adapt your teaching to {', '.join(matched_styles[:2])}."
+    return None
 
-    role_instruction = role_mapping.get(prompt_data.get('ai_role', ''), "Act as my educational assistant")
-    prompt_parts.append(f"{role_instruction}.")
 
-    # 2. Student Context - Critical for appropriate responses
-    grade_context = {
-        "Elementary (K-5)": "elementary school student",
-        "Middle School (6-8)": "middle school student",
-        "High School (9-12)": "high school student",
-        "College/University": "college student",
-        "Graduate School": "graduate student"
-    }
+@lru_cache(maxsize=256)
+def _feedback_fragment(selections):
+    """Render the feedback sentence for a tuple of selections"""
+    # Limit to the first three selections to avoid overly long prompts
+    feedback_requests = [FEEDBACK_FRAGMENTS[pref] for pref in selections[:3] if pref in FEEDBACK_FRAGMENTS]
+    if feedback_requests:
+        return f"Please also {', and '.join(feedback_requests)}."
+    return None
 
-    student_level = grade_context.get(prompt_data.get('grade_level', ''), "student")
-    subject_area = prompt_data.get('subject_area', 'general studies')
-    prompt_parts.append(f"I'm a {student_level} studying {subject_area.lower()}.")
-
-    # 3. Current Understanding Level - Helps AI calibrate response
-    understanding_context = {
-        "Complete beginner - never studied this before": "I'm completely new to this topic and have never studied it before",
-        "Basic understanding - know a little but confused": "I have basic understanding but I'm confused about key parts",
-        "Moderate understanding - get the basics but struggle with applications": "I understand the basics but struggle with applying the concepts",
-        "Good understanding - just need help with specific parts": "I have good overall understanding but need help with specific aspects",
-        "Advanced - want to deepen or extend my knowledge": "I have advanced understanding and want to deepen my knowledge further"
-    }
 
-    current_understanding = prompt_data.get('current_understanding', '')
-    if current_understanding in understanding_context:
-        prompt_parts.append(understanding_context[current_understanding] + ".")
-
-    # 4. Background Context - User's specific situation
-    background_context = prompt_data.get('background_context', '').strip()
-    if background_context:
-        prompt_parts.append(f"Background: {background_context}")
-
-    # 5. Specific Learning Request
-    learning_goal_context = {
-        "Understand a concept I'm confused about": "Please help me understand this concept by breaking it down clearly",
-        "Get help solving problems step-by-step": "Please guide me through solving this step-by-step, letting me try each step",
-        "Prepare for a test or assignment": "Please help me prepare for assessment by focusing on key concepts and likely questions",
-        "Connect ideas to real-world applications": "Please help me see how this connects to real-world situations and applications",
-        "Improve my study techniques": "Please help me develop better study strategies for this material",
-        "Analyze and interpret information": "Please guide me through analyzing and interpreting this information",
-        "Get feedback on my work": "Please review my work and provide constructive feedback for improvement"
-    }
+@lru_cache(maxsize=64)
+def _special_fragment(flags):
+    """Render the special considerations sentence for a tuple of enabled flags"""
+    special_requests = [text for enabled, (_, text) in zip(flags, SPECIAL_FRAGMENTS) if enabled]
+    if special_requests:
+        return f"Additionally, please {', and '.join(special_requests)}."
+    return None
 
-    learning_goal = prompt_data.get('learning_goal', '')
-    goal_instruction = learning_goal_context.get(learning_goal, "Please help me with")
-    topic_or_question = prompt_data.get('topic_or_question', 'this topic')
-    prompt_parts.append(f"{goal_instruction}: {topic_or_question}")
-
-    # 6. Interaction Style Preferences
-    style_instructions = {
-        "Guide me to discover answers myself": "Instead of giving me direct answers, guide me to discover the solutions through questions and hints",
-        "Explain clearly then let me practice": "First explain the concept clearly, then give me practice opportunities to apply it",
-        "Show examples then help me try similar problems": "Show me examples first, then help me work through similar problems on my own",
-        "Break complex topics into simple steps": "Break this complex topic into simple, manageable steps I can follow",
-        "Connect new ideas to what I already know": "Help me connect these new ideas to concepts I already understand",
-        "Help me see real-world applications": "Show me concrete examples of how this applies to real-world situations"
-    }
 
-    interaction_style = prompt_data.get('interaction_style', '')
-    if interaction_style in style_instructions:
-        prompt_parts.append(style_instructions[interaction_style] + ".")
-
-    # 7. Response Format Preferences
-    response_format = prompt_data.get('response_format', [])
-    if response_format:
-        format_request = "Please structure your response to include: " + ", ".join(response_format[:3]).lower()
-        prompt_parts.append(format_request + ".")
-
-    # 8. Learning Style Adaptations
-    learning_styles = prompt_data.get('learning_styles', [])
-    if learning_styles:
-        style_adaptations = {
-            "Visual (diagrams, charts, visual examples)": "use visual descriptions and examples I can picture",
-            "Auditory (explanations I can 'hear' in my head)": "explain things in a conversational way I can hear in my mind",
-            "Kinesthetic (hands-on examples, real-world applications)": "include hands-on examples and real-world applications",
-            "Reading/Writing (text-based explanations, note-taking)": "provide clear text explanations that are good for note-taking",
-            "Social (discussion-style explanations)": "explain things in a discussion-style format",
-            "Logical (step-by-step reasoning, cause-and-effect)": "use step-by-step logical reasoning and show cause-and-effect relationships"
-        }
-
-        matched_styles = [style_adaptations.get(style) for style in learning_styles if style in style_adaptations]
-        if matched_styles:
-            prompt_parts.append(f"Please adapt your teaching to {', '.join(matched_styles[:2])}.")
-
-    # 9. Feedback and Assessment Preferences
-    feedback_preference = prompt_data.get('feedback_preference', [])
-    if feedback_preference:
-        feedback_requests = []
-        feedback_mapping = {
-            "Check my understanding along the way": "check my understanding at key points",
-            "Point out common mistakes to avoid": "warn me about common mistakes students make",
-            "Suggest study strategies that match my learning style": "suggest study strategies that work for my learning style",
-            "Provide memory tricks and mnemonics": "include memory tricks and mnemonics",
-            "Give me practice problems at different difficulty levels": "provide practice problems at different difficulty levels",
-            "Help me make connections between topics": "help me see connections to other topics I've learned"
-        }
-
-        for pref in feedback_preference[:3]:  # Limit to avoid overly long prompts
-            if pref in feedback_mapping:
-                feedback_requests.append(feedback_mapping[pref])
-
-        if feedback_requests:
-            prompt_parts.append(f"Please also {', and '.join(feedback_requests)}.")
-
-    # 10. Follow-up and Engagement
-    followup_support = prompt_data.get('followup_support', True)
-    if followup_support:
-        prompt_parts.append("Ask me follow-up questions to ensure I truly understand the material.")
-
-    # 11. Special Considerations
-    special_requests = []
-    if prompt_data.get('common_mistakes', False):
-        special_requests.append("highlight common mistakes students make with this topic")
-    if prompt_data.get('exam_focus', False):
-        special_requests.append("focus on aspects most likely to appear on tests")
-    if prompt_data.get('career_connections', False):
-        special_requests.append("explain how this connects to future careers")
-    if prompt_data.get('prerequisite_check', False):
-        special_requests.append("check if I have the prerequisite knowledge needed")
+def _role_section(ai_role):
+    return ROLE_FRAGMENTS.get(ai_role, DEFAULT_ROLE_FRAGMENT)
 
-    if special_requests:
-        prompt_parts.append(f"Additionally, please {', and '.join(special_requests)}.")
-
-    # 12. Detail Level Instruction
-    detail_instructions = {
-        "Brief overview": "Keep your explanation concise and focused on the most important points",
-        "Moderate detail": "Provide a moderately detailed explanation with key examples",
-        "Comprehensive explanation": "Give a comprehensive explanation with multiple examples and detailed reasoning",
-        "In-depth analysis": "Provide an in-depth analysis with extensive examples, connections, and implications"
+
+def _student_section(grade_level, subject_area):
+    return f"I'm a {GRADE_FRAGMENTS.get(grade_level, DEFAULT_GRADE_FRAGMENT)} studying {subject_area.lower()}."
+
+
+def _understanding_section(current_understanding):
+    return UNDERSTANDING_FRAGMENTS.get(current_understanding)
+
+
+def _background_section(background_context):
+    background_context = background_context.strip()
+    return f"Background: {background_context}" if background_context else None
+
+
+def _goal_section(learning_goal, topic_or_question):
+    return f"{GOAL_FRAGMENTS.get(learning_goal, DEFAULT_GOAL_FRAGMENT)}: {topic_or_question}"
+
+
+def _style_section(interaction_style):
+    return STYLE_FRAGMENTS.get(interaction_style)
+
+
+def _format_section(response_format):
+    return _format_fragment(tuple(response_format)) if response_format else None
+
+
+def _learning_style_section(learning_styles):
+    return _learning_style_fragment(tuple(learning_styles)) if learning_styles else None
+
+
+def _feedback_section(feedback_preference):
+    return _feedback_fragment(tuple(feedback_preference)) if feedback_preference else None
+
+
+def _followup_section(followup_support):
+    return FOLLOWUP_FRAGMENT if followup_support else None
+
+
+def _special_section(common_mistakes, exam_focus, career_connections, prerequisite_check):
+    return _special_fragment(
+        (bool(common_mistakes), bool(exam_focus), bool(career_connections), bool(prerequisite_check))
+    )
+
+
+def _detail_section(detail_level):
+    return DETAIL_FRAGMENTS.get(detail_level)
+
+
+# Sections of an advanced prompt in output order: (name, ((field, default), ...), render).
+# render takes the field values positionally and returns the section text, or None
+# when the section is left out.
+ADVANCED_SECTIONS = (
+    ('role', (('ai_role', ''),), _role_section),
+    ('student context', (('grade_level', ''), ('subject_area', 'general studies')), _student_section),
+    ('understanding', (('current_understanding', ''),), _understanding_section),
+    ('background', (('background_context', ''),), _background_section),
+    ('goal', (('learning_goal', ''), ('topic_or_question', 'this topic')), _goal_section),
+    ('style', (('interaction_style', ''),), _style_section),
+    ('format', (('response_format', ()),), _format_section),
+    ('learning styles', (('learning_styles', ()),), _learning_style_section),
+    ('feedback', (('feedback_preference', ()),), _feedback_section),
+    ('follow-up', (('followup_support', True),), _followup_section),
+    ('special considerations', (('common_mistakes', False), ('exam_focus', False),
+                                ('career_connections', False), ('prerequisite_check', False)), _special_section),
+    ('detail', (('detail_level', ''),), _detail_section),
+)
+
+
+def _append_advanced_fragments(prompt_data, append):
+    """Emit the fragments of one advanced prompt, in section order, through append
+
+    The assembly shared by build_advanced_prompt and build_advanced_prompts. It
+    renders ADVANCED_SECTIONS in order with the section calls unrolled, which is
+    cheaper than looping over the table for every prompt.
+    """
+    get = prompt_data.get
+
+    append(_role_section(get('ai_role', '')))
+    append(_student_section(get('grade_level', ''), get('subject_area', 'general studies')))
+    for text in (
+        _understanding_section(get('current_understanding', '')),
+        _background_section(get('background_context', '')),
+        _goal_section(get('learning_goal', ''), get('topic_or_question', 'this topic')),
+        _style_section(get('interaction_style', '')),
+        _format_section(get('response_format')),
+        _learning_style_section(get('learning_styles')),
+        _feedback_section(get('feedback_preference')),
+        _followup_section(get('followup_support', True)),
+        _special_section(get('common_mistakes'), get('exam_focus'),
+                         get('career_connections'), get('prerequisite_check')),
+        _detail_section(get('detail_level', '')),
+    ):
+        if text:
+            append(text)
+
+
+def build_advanced_prompt(prompt_data):
+    """Build an advanced educational prompt based on comprehensive user inputs"""
+    prompt_parts = []
+    _append_advanced_fragments(prompt_data, prompt_parts.append)
+    return " ".join(prompt_parts)
+
+
+def build_advanced_prompts(prompt_data_iterable):
+    """Build advanced prompts for many prompt_data dicts, yielding one prompt per input
+
+    Output for each item is identical to build_advanced_prompt. One parts list, its
+    append and the join are bound once per batch and reused for every item. Items
+    are built one at a time, so it can stream arbitrarily large inputs.
+    """
+    prompt_parts = []
+    append = prompt_parts.append
+    clear = prompt_parts.clear
+    join = " ".join
+    for prompt_data in prompt_data_iterable:
+        clear()
+        _append_advanced_fragments(prompt_data, append)
+        yield join(prompt_parts)
+
+
+class PromptPreview:
+    """Incrementally maintained advanced prompt for live preview
+
+    Keeps the inputs and text of every section from the previous update, so an edit
+    re-renders only the sections whose own fields changed before re-joining.
+    """
+
+    __slots__ = ('_inputs', '_texts')
+
+    def __init__(self):
+        self._inputs = [None] * len(ADVANCED_SECTIONS)
+        self._texts = [None] * len(ADVANCED_SECTIONS)
+
+    def update(self, prompt_data):
+        """Bring the preview up to date with prompt_data; returns the names of re-rendered sections"""
+        get = prompt_data.get
+        changed = []
+        for i, (name, fields, render) in enumerate(ADVANCED_SECTIONS):
+            values = tuple(
+                tuple(value) if isinstance(value, list) else value
+                for value in (get(field, default) for field, default in fields)
+            )
+            if values != self._inputs[i]:
+                self._inputs[i] = values
+                self._texts[i] = render(*values)
+                changed.append(name)
+        return changed
+
+    @property
+    def sections(self):
+        """(name, text) for every section included in the current prompt"""
+        return [(name, text) for (name, _, _), text in zip(ADVANCED_SECTIONS, self._texts) if text]
+
+    @property
+    def prompt(self):
+        return " ".join(text for text in self._texts if text)
+
+
+# Budgeted assembly. Options that ask for the same thing share an intent tag; an
+# instruction whose tags are all covered by a higher-priority one is dropped.
+INTENT_TAGS = MappingProxyType({
+    "Get help solving problems step-by-step": frozenset({'steps'}),
+    "Break complex topics into simple steps": frozenset({'steps'}),
+    "Step-by-step explanations": frozenset({'steps'}),
+    "Logical (step-by-step reasoning, cause-and-effect)": frozenset({'steps'}),
+    "Connect ideas to real-world applications": frozenset({'real world'}),
+    "Help me see real-world applications": frozenset({'real world', 'examples'}),
+    "Real-world examples and analogies": frozenset({'real world', 'examples'}),
+    "Kinesthetic (hands-on examples, real-world applications)": frozenset({'real world', 'examples'}),
+    "Show examples then help me try similar problems": frozenset({'examples', 'practice'}),
+    "Explain clearly then let me practice": frozenset({'practice'}),
+    "Practice problems with solutions": frozenset({'practice'}),
+    "Give me practice problems at different difficulty levels": frozenset({'practice'}),
+    "Visual descriptions or diagrams": frozenset({'visual'}),
+    "Visual (diagrams, charts, visual examples)": frozenset({'visual'}),
+    "Memory aids and mnemonics": frozenset({'mnemonics'}),
+    "Provide memory tricks and mnemonics": frozenset({'mnemonics'}),
+    "Questions to test my understanding": frozenset({'check understanding'}),
+    "Check my understanding along the way": frozenset({'check understanding'}),
+    'followup_support': frozenset({'check understanding'}),
+    "Point out common mistakes to avoid": frozenset({'mistakes'}),
+    'common_mistakes': frozenset({'mistakes'}),
+    "Prepare for a test or assignment": frozenset({'exam'}),
+    'exam_focus': frozenset({'exam'}),
+    "Connect new ideas to what I already know": frozenset({'connections'}),
+    "Help me make connections between topics": frozenset({'connections'}),
+    "Improve my study techniques": frozenset({'study strategies'}),
+    "Suggest study strategies that match my learning style": frozenset({'study strategies'}),
+})
+
+# Sections in the order they are kept under a budget; role, student context and goal
+# are always kept
+BUDGET_PRIORITY = (
+    'goal', 'role', 'student context', 'understanding', 'background', 'style', 'detail',
+    'format', 'feedback', 'special considerations', 'learning styles', 'follow-up',
+)
+REQUIRED_SECTIONS = frozenset({'role', 'student context', 'goal'})
+SPECIAL_TEXTS = MappingProxyType(dict(SPECIAL_FRAGMENTS))
+
+
+def _section_items(prompt_data):
+    """{section: [option, ...]} of every instruction build_advanced_prompt would include, before deduplication
+
+    The list caps of build_advanced_prompt apply here too, so deduplication only ever
+    removes instructions from the standard prompt.
+    """
+    get = prompt_data.get
+    learning_styles = [style for style in get('learning_styles') or () if style in LEARNING_STYLE_FRAGMENTS]
+    return {
+        'role': [get('ai_role', '')],
+        'student context': [(get('grade_level', ''), get('subject_area', 'general studies'))],
+        'understanding': [get('current_understanding', '')],
+        'background': [get('background_context', '')],
+        'goal': [(get('learning_goal', ''), get('topic_or_question', 'this topic'))],
+        'style': [get('interaction_style', '')],
+        'format': list(get('response_format') or ())[:3],
+        'learning styles': learning_styles[:2],
+        'feedback': [pref for pref in list(get('feedback_preference') or ())[:3] if pref in FEEDBACK_FRAGMENTS],
+        'follow-up': ['followup_support'] if get('followup_support', True) else [],
+        'special considerations': [key for key, _ in SPECIAL_FRAGMENTS if get(key, False)],
+        'detail': [get('detail_level', '')],
     }
 
-    detail_level = prompt_data.get('detail_level', '')
-    if detail_level in detail_instructions:
-        prompt_parts.append(detail_instructions[detail_level] + ".")
 
-    # Combine all parts into a coherent prompt
-    return " ".join(prompt_parts)
\ No newline at end of file
+def _intent_tags(item):
+    # Goal items are (learning_goal, topic) pairs
+    return INTENT_TAGS.get(item[0] if isinstance(item, tuple) else item, frozenset())
+
+
+def _render_budget_section(name, items):
+    """Section text for the kept items; lists are already capped by _section_items"""
+    if not items:
+        return None
+    if name == 'role':
+        return _role_section(items[0])
+    if name == 'student context':
+        return _student_section(*items[0])
+    if name == 'understanding':
+        return _understanding_section(items[0])
+    if name == 'background':
+        return _background_section(items[0])
+    if name == 'goal':
+        return _goal_section(*items[0])
+    if name == 'style':
+        return _style_section(items[0])
+    if name == 'format':
+        return "Please structure your response to include: " + ", ".join(items).lower() + "."
+    if name == 'learning styles':
+        return f"Please adapt your teaching to {', '.join(LEARNING_STYLE_FRAGMENTS[item] for item in items)}."
+    if name == 'feedback':
+        return f"Please also {', and '.join(FEEDBACK_FRAGMENTS[item] for item in items)}."
+    if name == 'follow-up':
+        return FOLLOWUP_FRAGMENT
+    if name == 'special considerations':
+        return f"Additionally, please {', and '.join(SPECIAL_TEXTS[item] for item in items)}."
+    return _detail_section(items[0])
+
+
+def build_budgeted_prompt(prompt_data, max_tokens=None):
+    """Build the shortest advanced prompt that keeps the selected intent, optionally within max_tokens
+
+    Starts from the instructions build_advanced_prompt includes, so the result is
+    never longer than the standard prompt. Instructions repeated across sections
+    (step-by-step, real-world examples, practice, ...) are kept once, in the
+    highest-priority section that asks for them.
+    If the prompt is still over max_tokens, list items and then whole sections are
+    dropped from the lowest priority up. Role, student context and goal always stay,
+    so the result can exceed a budget smaller than those alone.
+    """
+    from utils.token_estimate import count_tokens
+
+    sections = _section_items(prompt_data)
+    covered = set()
+    for name in BUDGET_PRIORITY:
+        kept = []
+        for item in sections[name]:
+            tags = _intent_tags(item)
+            if tags and tags <= covered:
+                continue
+            covered |= tags
+            kept.append(item)
+        sections[name] = kept
+
+    texts = {name: _render_budget_section(name, items) for name, items in sections.items()}
+    if max_tokens:
+        tokens = {name: count_tokens(text) if text else 0 for name, text in texts.items()}
+        total = sum(tokens.values())
+        for name in reversed(BUDGET_PRIORITY):
+            if name in REQUIRED_SECTIONS:
+                break
+            items = sections[name]
+            while items and total > max_tokens:
+                items.pop()
+                texts[name] = _render_budget_section(name, items)
+                new_tokens = count_tokens(texts[name]) if texts[name] else 0
+                total += new_tokens - tokens[name]
+                tokens[name] = new_tokens
+            if total <= max_tokens:
+                break
+
+    return " ".join(texts[name] for name, _, _ in ADVANCED_SECTIONS if texts[name])
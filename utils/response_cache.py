@@ -0,0 +1,218 @@
+"""Cache of model responses for prompt test runs
+
+Responses are keyed by a digest of the backend name, the backend parameters that
+change its output and the normalized prompt text, so the same saved prompt or
+template sent to the same backend is answered from the cache by every session and
+after restarts.
+
+Two layers sit behind one lookup: an in-memory LRU for the hot set, over a SQLite
+store on disk. Disk entries expire after ttl seconds and the store is trimmed by
+least recent use once it grows past max_bytes. Hit and miss counters are kept per
+layer for the diagnostics page.
+
+CachedBackend puts the cache in front of any ModelBackend: a hit is returned as a
+single chunk, a miss streams from the wrapped backend and is stored only once the
+response completed.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from utils.content_store import prompt_digest
+from utils.prompt_testing import ModelBackend
+
+DEFAULT_CACHE_PATH = os.environ.get("PROMPT_RESPONSE_CACHE_PATH", "response_cache.db")
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 2000
+# Trimming removes entries until the store is this fraction of max_bytes, so it does
+# not run again on the very next write
+TRIM_TARGET = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    backend TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created)
+"""
+
+
+def response_key(backend, prompt):
+    """Digest identifying the response of backend to prompt"""
+    params = json.dumps(backend.cache_params(), sort_keys=True, default=str)
+    material = f"{backend.name}\0{params}\0{prompt_digest(prompt)}"
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe two-layer response cache: memory LRU over a SQLite store with TTL"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES,
+                 memory_entries=DEFAULT_MEMORY_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        with self._connection() as connection:
+            for statement in SCHEMA.split(';'):
+                connection.execute(statement)
+            self._disk_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def _remember(self, key, response, expires):
+        """Put an entry in the memory layer, dropping the least recently used one when full"""
+        with self._lock:
+            self._memory[key] = (response, expires)
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached response for key, or None"""
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                if cached[1] > now:
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return cached[0]
+                del self._memory[key]
+
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT response, created FROM responses WHERE key = ? AND created > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is not None:
+                connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        if row is None:
+            self._count('misses')
+            return None
+        response, created = row
+        self._remember(key, response, created + self.ttl)
+        self._count('disk_hits')
+        return response
+
+    def put(self, key, backend_name, response):
+        """Store a complete response under key in both layers"""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._connection() as connection:
+            previous = connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, backend, response, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, backend_name, response, size, now, now)
+            )
+        self._remember(key, response, now + self.ttl)
+        with self._lock:
+            self.counters['stores'] += 1
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            over_budget = self._disk_bytes > self.max_bytes
+        if over_budget:
+            self.trim()
+
+    def trim(self):
+        """Drop expired entries, then the least recently used ones until the store fits its budget"""
+        target = self.max_bytes * TRIM_TARGET
+        with self._connection() as connection:
+            evicted = connection.execute(
+                "DELETE FROM responses WHERE created <= ?", (time.time() - self.ttl,)
+            ).rowcount
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > target:
+                doomed = []
+                for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed"):
+                    if total <= target:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                connection.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                evicted += len(doomed)
+                with self._lock:
+                    for (key,) in doomed:
+                        self._memory.pop(key, None)
+        with self._lock:
+            self._disk_bytes = total
+            self.counters['evictions'] += evicted
+        return evicted
+
+    def clear(self):
+        """Drop every cached response and reset the counters"""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+        with self._lock:
+            self._memory.clear()
+            self._disk_bytes = 0
+            for counter in self.counters:
+                self.counters[counter] = 0
+
+    def stats(self):
+        """Counters plus the hit rate and the size of both layers"""
+        with self._lock:
+            stats = dict(self.counters, memory_entries=len(self._memory), disk_bytes=self._disk_bytes)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        stats['disk_entries'] = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return stats
+
+
+class CachedBackend(ModelBackend):
+    """Serves responses of the wrapped backend from a ResponseCache"""
+
+    def __init__(self, backend, cache):
+        self.backend = backend
+        self.cache = cache
+        self.name = backend.name
+
+    def cache_params(self):
+        return self.backend.cache_params()
+
+    def stream(self, prompt, context):
+        key = response_key(self.backend, prompt)
+        response = self.cache.get(key)
+        if response is not None:
+            context.cached = True
+            yield response
+            return
+        parts = []
+        for chunk in self.backend.stream(prompt, context):
+            parts.append(chunk)
+            yield chunk
+        # Only reached when the stream completed; a cancelled or failed call is not stored
+        self.cache.put(key, self.name, "".join(parts))
+
+
+@st.cache_resource
+def get_response_cache(path=DEFAULT_CACHE_PATH):
+    """Shared response cache for the whole server process"""
+    return ResponseCache(path)
@@ -0,0 +1,315 @@
+"""Full-text search over templates, techniques, tips and the user's saved prompts
+
+Content is held in an inverted index (term -> {doc_id: term frequency}) and ranked
+with BM25. The static content (templates, techniques, tips) is indexed once per
+process; each session keeps a small index of its own saved prompts that is updated
+in place on save and delete, and rebuilt when the library's revision shows another
+session (or an import) changed it.
+"""
+import heapq
+import math
+import re
+from bisect import bisect_left
+
+import streamlit as st
+
+from utils.prompt_library import CUSTOM, KINDS
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i if in into is it its me my of on or "
+    "so that the their then this to was what when where which who will with you your".split()
+)
+FROZEN_POSTINGS = 128
+# A query's last word of at least MIN_PREFIX_LENGTH characters is expanded to the most
+# frequent of up to MAX_PREFIX_CANDIDATES terms it prefixes, adding terms until their
+# postings (as read from a frozen index) reach MAX_PREFIX_POSTINGS or
+# MAX_PREFIX_EXPANSIONS terms are taken. Shorter words match only as exact terms.
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIX_CANDIDATES = 32
+MAX_PREFIX_EXPANSIONS = 12
+MAX_PREFIX_POSTINGS = 128
+
+
+def tokenize(text):
+    """Lowercase word tokens of text, without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking and incremental add/remove
+
+    An index that no longer changes can be frozen: the term-frequency part of each
+    BM25 weight is then computed once, against the index's own average document
+    length, and each posting list is kept in descending weight order, truncated to
+    its strongest FROZEN_POSTINGS entries. A query touches a bounded number of
+    postings per term regardless of corpus size. The IDF is still applied at query
+    time from the corpus-wide statistics, but a frozen index only approximates the
+    unfrozen one: lengths stay normalized by its own average, and documents past a
+    term's cut-off score nothing for that term.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.doc_lengths = {}
+        self.doc_terms = {}
+        self.documents = {}
+        self.total_length = 0
+        self.impacts = None
+        self._vocabulary = None
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, doc_id, text, document):
+        """Index text under doc_id, replacing any earlier version; document is returned with hits"""
+        if doc_id in self.documents:
+            self.remove(doc_id)
+        frequencies = {}
+        tokens = tokenize(text)
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for token, count in frequencies.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                self.postings[token] = {doc_id: count}
+                self._vocabulary = None
+            else:
+                postings[doc_id] = count
+        self.documents[doc_id] = document
+        self.doc_terms[doc_id] = tuple(frequencies)
+        self.doc_lengths[doc_id] = len(tokens)
+        self.total_length += len(tokens)
+        self.impacts = None
+
+    def remove(self, doc_id):
+        """Drop a document from the index; unknown ids are ignored"""
+        if self.documents.pop(doc_id, None) is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for token in self.doc_terms.pop(doc_id):
+            postings = self.postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[token]
+                self._vocabulary = None
+        self.impacts = None
+
+    def freeze(self, max_postings=FROZEN_POSTINGS):
+        """Precompute impact-ordered term-frequency weights; any later add or remove unfreezes the index"""
+        doc_count = len(self.documents)
+        average_length = self.total_length / doc_count if doc_count else 1.0
+        impacts = {}
+        for term, postings in self.postings.items():
+            weights = [
+                (self._term_weight(frequency, self.doc_lengths[doc_id], average_length), doc_id)
+                for doc_id, frequency in postings.items()
+            ]
+            weights.sort(key=lambda item: item[0], reverse=True)
+            impacts[term] = tuple(weights[:max_postings])
+        self.impacts = impacts
+        return self
+
+    def _term_weight(self, frequency, length, average_length):
+        """BM25 term-frequency component for one posting"""
+        k1 = self.k1
+        return frequency * (k1 + 1) / (frequency + k1 * (1 - self.b + self.b * length / average_length))
+
+    def expand_prefix(self, prefix):
+        """Indexed terms starting with prefix, used for search-as-you-type on the last query word"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        matches = []
+        for term in vocabulary[start:start + MAX_PREFIX_CANDIDATES]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def accumulate(self, terms, scores, doc_count, document_frequency, average_length):
+        """Add this index's BM25 contributions for terms into scores
+
+        The IDF of each term comes from the corpus-wide statistics passed in, so hits
+        from several indexes are ranked on one scale; a frozen index only saves the
+        term-frequency part and reads its truncated postings.
+        """
+        get = scores.get
+        if self.impacts is not None:
+            for term in terms:
+                impacts = self.impacts.get(term)
+                if not impacts:
+                    continue
+                idf = bm25_idf(doc_count, document_frequency(term))
+                for weight, doc_id in impacts:
+                    scores[doc_id] = get(doc_id, 0.0) + weight * idf
+            return
+        doc_lengths = self.doc_lengths
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = bm25_idf(doc_count, document_frequency(term))
+            for doc_id, frequency in postings.items():
+                weight = self._term_weight(frequency, doc_lengths[doc_id], average_length)
+                scores[doc_id] = get(doc_id, 0.0) + idf * weight
+
+    def search(self, query, limit=10):
+        """Return up to limit documents for query, best first"""
+        return search_indexes((self,), query, limit)
+
+
+def bm25_idf(doc_count, document_frequency):
+    """BM25 inverse document frequency (never negative)"""
+    return math.log(1 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+
+def _prefix_expansions(indexes, prefix, exclude, document_frequency):
+    """The most frequent indexed terms starting with prefix, within the prefix postings budget"""
+    candidates = {term for index in indexes for term in index.expand_prefix(prefix)}.difference(exclude)
+    expansions = []
+    postings = 0
+    for frequency, term in sorted(((document_frequency(term), term) for term in candidates), reverse=True):
+        if len(expansions) == MAX_PREFIX_EXPANSIONS or postings >= MAX_PREFIX_POSTINGS:
+            break
+        expansions.append(term)
+        postings += min(frequency, FROZEN_POSTINGS)
+    return expansions
+
+
+def search_indexes(indexes, query, limit=10):
+    """Rank documents from several indexes against query using shared corpus statistics
+
+    Document ids must be unique across the indexes. Unless the query ends in
+    whitespace, a last query word of MIN_PREFIX_LENGTH or more characters is also
+    expanded to the most frequent indexed terms it prefixes, within a postings
+    budget, so a prefix costs about as much as one more exact word however many
+    terms it matches.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return []
+
+    def document_frequency(term):
+        return sum(len(index.postings.get(term, ())) for index in indexes)
+
+    if not query[-1:].isspace() and len(terms[-1]) >= MIN_PREFIX_LENGTH:
+        terms += _prefix_expansions(indexes, terms[-1], terms, document_frequency)
+    terms = tuple(dict.fromkeys(terms))
+
+    doc_count = sum(len(index) for index in indexes)
+    if not doc_count:
+        return []
+    average_length = sum(index.total_length for index in indexes) / doc_count or 1.0
+
+    scores = {}
+    for index in indexes:
+        index.accumulate(terms, scores, doc_count, document_frequency, average_length)
+    best = heapq.nlargest(limit, scores, key=scores.get)
+    return [next(index.documents[doc_id] for index in indexes if doc_id in index.documents) for doc_id in best]
+
+
+def _snippet(text, length=140):
+    """Shorten text for display in search results"""
+    return text if len(text) <= length else text[:length].rsplit(' ', 1)[0] + "…"
+
+
+@st.cache_resource(max_entries=2)
+def get_static_index(content_version):
+    """Index the built-in templates, techniques and tips once per content version"""
+    from data.constants import PROMPT_TECHNIQUES, SUBJECT_PROMPTS, TIPS_STRATEGIES
+
+    index = SearchIndex()
+    for subject, templates in SUBJECT_PROMPTS.items():
+        for category, prompt in templates.items():
+            index.add(
+                ('template', subject, category),
+                f"{subject} {category} {prompt}",
+                {'kind': "📚 Template", 'title': f"{subject} › {category}", 'snippet': _snippet(prompt)}
+            )
+    for technique, details in PROMPT_TECHNIQUES.items():
+        index.add(
+            ('technique', technique),
+            f"{technique} {details['description']} {details['good_example']} {details['bad_example']}",
+            {'kind': "🎯 Technique", 'title': technique, 'snippet': _snippet(details['description'])}
+        )
+    for strategy, tips in TIPS_STRATEGIES.items():
+        index.add(
+            ('tip', strategy),
+            f"{strategy} {' '.join(tips)}",
+            {'kind': "💡 Tip", 'title': strategy, 'snippet': _snippet(tips[0])}
+        )
+    return index.freeze()
+
+
+def _saved_prompt_document(kind, entry):
+    """Search text and result document for a saved prompt or favorite"""
+    if kind == CUSTOM:
+        title = f"{entry['subject']} - {entry['topic']}"
+        label = "💾 My Prompt"
+    else:
+        title = f"{entry['subject']} - {entry['category']}"
+        label = "⭐ Favorite"
+    return f"{title} {entry['prompt']}", {'kind': label, 'title': title, 'snippet': _snippet(entry['prompt'])}
+
+
+def get_session_index():
+    """Return this session's index of its library's saved prompts, rebuilding it when the library changed"""
+    from utils.session_state import get_library
+
+    library, library_id = get_library()
+    revision = library.revision(library_id)
+    if st.session_state.get('search_index_revision') != revision or 'search_index' not in st.session_state:
+        index = SearchIndex()
+        for kind in KINDS:
+            for entry in library.iter_entries(library_id, kind):
+                text, document = _saved_prompt_document(kind, entry)
+                index.add((kind, entry['id']), text, document)
+        st.session_state.search_index = index
+        st.session_state.search_index_revision = revision
+    return st.session_state.search_index
+
+
+def _adopt_revision():
+    """Mark the session index current after this session's own write
+
+    Only when the write was the library's single change since the index was built;
+    otherwise another session changed it too and the next search rebuilds.
+    """
+    from utils.session_state import get_library
+
+    library, library_id = get_library()
+    revision = library.revision(library_id)
+    if st.session_state.get('search_index_revision') == revision - 1:
+        st.session_state.search_index_revision = revision
+
+
+def index_saved_prompt(kind, entry):
+    """Add a newly saved prompt or favorite to the session index"""
+    if 'search_index' in st.session_state:
+        text, document = _saved_prompt_document(kind, entry)
+        st.session_state.search_index.add((kind, entry['id']), text, document)
+        _adopt_revision()
+
+
+def unindex_saved_prompt(kind, entry_id):
+    """Remove a deleted prompt or favorite from the session index"""
+    if 'search_index' in st.session_state:
+        st.session_state.search_index.remove((kind, entry_id))
+        _adopt_revision()
+
+
+def reset_session_index():
+    """Drop the session index so it is rebuilt from the library on next use, e.g. after an import"""
+    st.session_state.pop('search_index', None)
+    st.session_state.pop('search_index_revision', None)
+
+
+def search_all(query, limit=8):
+    """Search static content and the session's saved prompts, returning the best documents"""
+    from data.constants import content_version
+
+    return search_indexes((get_static_index(content_version()), get_session_index()), query, limit)
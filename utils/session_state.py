@@ -1,8 +1,170 @@
+import io
+import secrets
+
 import streamlit as st
 
+from utils.prompt_library import CUSTOM, FAVORITE, get_prompt_library
+
+LIBRARY_PARAM = 'library'
+USER_LIBRARY_PREFIX = 'user:'
+
+
+def _signed_in_library_id():
+    """Library id of the signed-in user, or None when nobody is signed in (or the app has no login)"""
+    if not st.user.get('is_logged_in'):
+        return None
+    subject = st.user.get('sub') or st.user.get('email')
+    return f"{USER_LIBRARY_PREFIX}{subject}" if subject else None
+
+
+def _link_library_id():
+    """Library id carried by the page link, generating a new one when the link has none
+
+    The id is a capability: whoever has the link has the library, so new ids are
+    random and signed-in users' ids cannot be reached through a link.
+    """
+    library_id = st.query_params.get(LIBRARY_PARAM)
+    if not library_id or library_id.startswith(USER_LIBRARY_PREFIX):
+        library_id = secrets.token_urlsafe(12)
+        st.query_params[LIBRARY_PARAM] = library_id
+    return library_id
+
+
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'user_prompts' not in st.session_state:
-        st.session_state.user_prompts = []
-    if 'favorites' not in st.session_state:
-        st.session_state.favorites = []
\ No newline at end of file
+    if 'library_id' not in st.session_state:
+        # Each visitor gets their own library in the persistent store: the signed-in
+        # user's, or else the one named by ?library=<id>, which is added to the link
+        st.session_state.library_id = _signed_in_library_id() or _link_library_id()
+
+
+def library_is_linked():
+    """True when this session's library is reached through its link rather than a sign-in"""
+    return not st.session_state.library_id.startswith(USER_LIBRARY_PREFIX)
+
+
+def show_library_in_link():
+    """Put this session's ?library= id back in the page URL, for the page that offers it as a bookmark"""
+    if library_is_linked() and st.query_params.get(LIBRARY_PARAM) != st.session_state.library_id:
+        st.query_params[LIBRARY_PARAM] = st.session_state.library_id
+
+
+def hide_library_from_link():
+    """Take ?library= out of the page URL; the session keeps the id in library_id
+
+    Called while the URL carries something meant to be copied (a builder setup), so
+    the address bar never hands over the library along with it.
+    """
+    if LIBRARY_PARAM in st.query_params:
+        del st.query_params[LIBRARY_PARAM]
+
+
+def get_library():
+    """Return the prompt library repository and this session's library id"""
+    return get_prompt_library(), st.session_state.library_id
+
+
+def add_user_prompt(entry):
+    """Save a generated prompt; returns False if the same prompt text is already saved"""
+    from utils.search import index_saved_prompt
+
+    library, library_id = get_library()
+    entry_id = library.add(library_id, CUSTOM, entry)
+    if entry_id is None:
+        return False
+    index_saved_prompt(CUSTOM, dict(entry, id=entry_id))
+    return True
+
+
+def add_favorite(entry):
+    """Save a template to favorites; returns False if the same prompt is already a favorite"""
+    from utils.search import index_saved_prompt
+
+    library, library_id = get_library()
+    entry_id = library.add(library_id, FAVORITE, entry)
+    if entry_id is None:
+        return False
+    index_saved_prompt(FAVORITE, dict(entry, id=entry_id))
+    return True
+
+
+def remove_saved_prompt(kind, entry_id):
+    """Delete a saved prompt or favorite by id"""
+    from utils.search import unindex_saved_prompt
+
+    library, library_id = get_library()
+    library.delete(library_id, entry_id)
+    unindex_saved_prompt(kind, entry_id)
+
+
+def count_saved_prompts(kind):
+    """Number of saved prompts of a kind"""
+    library, library_id = get_library()
+    return library.count(library_id, kind)
+
+
+def page_saved_prompts(kind, subject=None, after=None, limit=10, newest_first=True):
+    """One page of saved prompts of a kind as (entries, next_cursor)"""
+    library, library_id = get_library()
+    return library.page(library_id, kind, subject=subject, after=after, limit=limit, newest_first=newest_first)
+
+
+def saved_prompt_subjects(kind):
+    """Subjects that have saved prompts of a kind"""
+    library, library_id = get_library()
+    return library.subjects(library_id, kind)
+
+
+def saved_prompt_token_stats(kind):
+    """(count, total_tokens) for every saved prompt of a kind
+
+    Entries already estimated are answered from the token cache by digest; only the
+    bodies of new ones are read from the library. Digests are unique within a kind.
+    """
+    from utils.token_estimate import cached_token_count, estimate_tokens
+
+    library, library_id = get_library()
+    digests = library.digests(library_id, kind)
+    total = 0
+    missing = []
+    for digest in digests:
+        count = cached_token_count(digest)
+        if count is None:
+            missing.append(digest)
+        else:
+            total += count
+    if missing:
+        for digest, body in library.load_bodies(missing).items():
+            total += estimate_tokens(body, digest)
+    return len(digests), total
+
+
+def saved_prompts_export(fmt, compress=False):
+    """Callable building this session's library export, for st.download_button's deferred data
+
+    The library and its id are bound now: the download runs later on a server thread
+    outside the session. Chunks are written to one buffer as they are produced.
+    """
+    from utils.library_transfer import iter_export
+
+    library, library_id = get_library()
+
+    def build():
+        buffer = io.BytesIO()
+        for chunk in iter_export(library, library_id, fmt, compress=compress):
+            buffer.write(chunk)
+        return buffer
+
+    return build
+
+
+def import_saved_prompts(stream, fmt, progress=None):
+    """Import saved prompts and favorites from a binary stream; returns the import report"""
+    from utils.library_transfer import import_library
+    from utils.search import reset_session_index
+
+    library, library_id = get_library()
+    report = import_library(library, library_id, stream, fmt, progress=progress)
+    if report['imported']:
+        reset_session_index()
+    return report
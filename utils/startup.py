@@ -0,0 +1,182 @@
+"""Cold-start prewarm and readiness
+
+A fresh server process pays for every first use: page modules import on the first
+visit to each page, content packs are read and frozen, the static search index and
+the HTML fragments are built, and the SQLite files are opened. prewarm() does all
+of that up front. Everything it fills is process-wide (module imports and
+st.cache_resource caches), so every session afterwards finds it warm.
+
+tools/serve.py runs the prewarm before the Streamlit server binds its port, so the
+server's own health endpoint (/_stcore/health) doubles as the readiness probe.
+Under a plain `streamlit run`, main() starts the same prewarm in a background thread
+when the first session arrives. Either way the process is marked ready when it
+finishes: is_ready() turns true, the Diagnostics page shows the step timings, and
+if PROMPT_HUB_READY_FILE is set a JSON summary is written to that path for an exec
+readiness probe. A step that fails is logged and skipped; pages still load lazily.
+"""
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import threading
+import time
+
+PREWARM_THREAD = "prompt-hub-prewarm"
+READY_FILE = os.environ.get("PROMPT_HUB_READY_FILE")
+PREWARM_PACKAGES = ('app_pages', 'components', 'utils')
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StartupStatus:
+    """Step timings, errors and readiness of this process's prewarm"""
+
+    def __init__(self):
+        self.steps = {}
+        self.errors = {}
+        self.started = None
+        self.finished = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the prewarm has finished; returns whether it has"""
+        return self._ready.wait(timeout)
+
+    def summary(self):
+        """JSON-serializable snapshot of the prewarm"""
+        return {
+            'ready': self.is_ready(),
+            'pid': os.getpid(),
+            'seconds': round(self.finished - self.started, 4) if self.finished else None,
+            'steps': {name: round(seconds, 4) for name, seconds in self.steps.items()},
+            'errors': dict(self.errors),
+        }
+
+
+_status = StartupStatus()
+
+
+def get_startup_status():
+    """The process-wide StartupStatus"""
+    return _status
+
+
+def is_ready():
+    """True once this process has finished prewarming"""
+    return _status.is_ready()
+
+
+def import_modules():
+    """Import every module of the app packages; returns how many were imported"""
+    count = 0
+    for package_name in PREWARM_PACKAGES:
+        package = importlib.import_module(package_name)
+        for module in pkgutil.iter_modules(package.__path__, package_name + "."):
+            importlib.import_module(module.name)
+            count += 1
+    return count
+
+
+def load_content():
+    """Read every content pack file and compile every template; returns the template count"""
+    from data.constants import SUBJECT_PROMPTS, get_manifest, load_pack_file
+    from utils.template_engine import compile_template
+
+    manifest = get_manifest()
+    load_pack_file(manifest['techniques'])
+    load_pack_file(manifest['tips'])
+    count = 0
+    for templates in SUBJECT_PROMPTS.values():
+        for template in templates.values():
+            compile_template(template)
+            count += 1
+    return count
+
+
+def build_search_index():
+    """Build the static search index for the current content; returns its document count"""
+    from data.constants import content_version
+    from utils.search import get_static_index
+
+    return len(get_static_index(content_version()))
+
+
+def render_fragments():
+    """Render the static HTML fragments of every page; returns how many were built"""
+    from utils.html_fragments import prewarm_fragments
+
+    return prewarm_fragments()
+
+
+def open_stores():
+    """Open the prompt library and response cache, creating their schemas"""
+    from utils.prompt_library import get_prompt_library
+    from utils.response_cache import get_response_cache
+
+    get_prompt_library()
+    get_response_cache()
+
+
+PREWARM_STEPS = (
+    ('import modules', import_modules),
+    ('load content', load_content),
+    ('render fragments', render_fragments),
+    ('build search index', build_search_index),
+    ('open stores', open_stores),
+)
+
+
+def _write_ready_file(summary):
+    if not READY_FILE:
+        return
+    temporary = READY_FILE + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as ready_file:
+        json.dump(summary, ready_file, indent=2)
+    os.replace(temporary, READY_FILE)
+
+
+def prewarm(status=_status):
+    """Run every prewarm step on this thread, then mark the process ready"""
+    status.started = time.perf_counter()
+    for name, step in PREWARM_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as error:  # a cold cache is better than a pod that never turns ready
+            _LOGGER.exception("Prewarm step %r failed", name)
+            status.errors[name] = f"{type(error).__name__}: {error}"
+        status.steps[name] = time.perf_counter() - start
+    status.finished = time.perf_counter()
+    status._ready.set()
+    try:
+        _write_ready_file(status.summary())
+    except OSError:
+        _LOGGER.exception("Could not write the readiness file %s", READY_FILE)
+    return status.summary()
+
+
+class _PrewarmThreadFilter(logging.Filter):
+    """Drop Streamlit's missing-ScriptRunContext warnings from the prewarm thread, which has no session by design"""
+
+    def filter(self, record):
+        return record.threadName != PREWARM_THREAD
+
+
+def start_prewarm():
+    """Start the prewarm in a background thread once per process; returns the thread"""
+    with _status._lock:
+        if _status._thread is None:
+            if READY_FILE and os.path.exists(READY_FILE):
+                os.remove(READY_FILE)  # left by a previous process
+            logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+                _PrewarmThreadFilter()
+            )
+            _status._thread = threading.Thread(target=prewarm, name=PREWARM_THREAD, daemon=True)
+            _status._thread.start()
+        return _status._thread
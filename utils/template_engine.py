@@ -0,0 +1,101 @@
+"""Placeholder filling for the bracketed prompt templates in data/constants.py
+
+Templates mark the parts a student should replace with bracketed slots such as
+[GRADE LEVEL] or [YOUR PROBLEM]. A template is parsed once into alternating literal
+and slot segments; filling it is then a single join over those segments.
+"""
+import re
+from functools import lru_cache
+
+SLOT_PATTERN = re.compile(r"\[([^\[\]]+)\]")
+
+
+class CompiledTemplate:
+    """A template split into literal and slot segments
+
+    literals always has one more item than slots: the text before the first slot,
+    between each pair of slots, and after the last slot.
+    """
+
+    __slots__ = ('text', 'literals', 'slots', 'required_slots')
+
+    def __init__(self, text):
+        self.text = text
+        literals = []
+        slots = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(text):
+            literals.append(text[position:match.start()])
+            slots.append(match.group(1))
+            position = match.end()
+        literals.append(text[position:])
+        self.literals = tuple(literals)
+        self.slots = tuple(slots)
+        self.required_slots = tuple(dict.fromkeys(slots))
+
+    def fill(self, values):
+        """Return the template with each slot replaced by values[slot]
+
+        Slots without a non-empty value keep their bracketed placeholder.
+        """
+        literals = self.literals
+        parts = [literals[0]]
+        for index, slot in enumerate(self.slots, 1):
+            value = values.get(slot)
+            parts.append(value if value else f"[{slot}]")
+            parts.append(literals[index])
+        return "".join(parts)
+
+    def fill_many(self, rows):
+        """Fill the template once per values dict in rows, returning a list of prompts"""
+        literals = self.literals
+        pairs = tuple(zip(self.slots, literals[1:]))
+        placeholders = {slot: f"[{slot}]" for slot in self.required_slots}
+        first = literals[0]
+        join = "".join
+        filled = []
+        for values in rows:
+            get = values.get
+            parts = [first]
+            for slot, literal in pairs:
+                parts.append(get(slot) or placeholders[slot])
+                parts.append(literal)
+            filled.append(join(parts))
+        return filled
+
+    def missing_slots(self, values):
+        """Return the required slots that have no non-empty value"""
+        return [slot for slot in self.required_slots if not values.get(slot)]
+
+
+@lru_cache(maxsize=1024)
+def compile_template(text):
+    """Parse a template once and reuse the compiled form for every later fill"""
+    return CompiledTemplate(text)
+
+
+def required_slots(text):
+    """List the distinct slots of a template in order of first appearance"""
+    return compile_template(text).required_slots
+
+
+def fill_template(text, values):
+    """Fill one template from a dict of slot values"""
+    return compile_template(text).fill(values)
+
+
+def fill_template_many(text, rows):
+    """Fill one template for many dicts of slot values at once"""
+    return compile_template(text).fill_many(rows)
+
+
+def slot_label(slot):
+    """Human-readable label for a slot, e.g. 'GRADE LEVEL' -> 'Grade level'"""
+    name = slot.split(' - ', 1)[0].strip()
+    return name[:1].upper() + name[1:].lower()
+
+
+def slot_hint(slot):
+    """Example text embedded in a slot after ' - ', if any"""
+    parts = slot.split(' - ', 1)
+    return parts[1].strip() if len(parts) == 2 else None
@@ -0,0 +1,81 @@
+"""Offline token count estimates for prompts
+
+There is no bundled BPE vocabulary; counts come from a heuristic that mirrors how
+byte-pair tokenizers split English text: a short word costs one token and a long
+word roughly one token per seven letters, digits group in threes, and every
+punctuation mark or non-ASCII character costs about one token. Leading spaces merge
+into the following word, as in BPE. For English prose this lands near the usual
+rule of thumb of ~4 characters or ~0.75 words per token. The result is an estimate
+for sizing prompts, not an exact count for any particular model.
+
+Estimates are cached by prompt digest, so library entries (which already carry their
+digest) are counted once per process.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from utils.content_store import normalize_prompt, prompt_digest
+
+# One match per estimated token: words are cut into runs of up to seven letters and
+# numbers into groups of up to three digits; every other visible character and every
+# run of newlines counts once
+TOKEN_PATTERN = re.compile(r"[A-Za-z]{1,7}|\d{1,3}|\n+|[^\sA-Za-z\d]")
+
+
+def count_tokens(text):
+    """Estimated token count of text"""
+    return len(TOKEN_PATTERN.findall(text))
+
+
+class TokenEstimator:
+    """Thread-safe LRU of digest -> estimated token count"""
+
+    def __init__(self, max_entries=20000):
+        self.max_entries = max_entries
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cached(self, digest):
+        """Return the cached count for digest, or None"""
+        with self._lock:
+            count = self._counts.get(digest)
+            if count is not None:
+                self._counts.move_to_end(digest)
+            return count
+
+    def _store(self, digest, count):
+        with self._lock:
+            self._counts[digest] = count
+            self._counts.move_to_end(digest)
+            if len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+
+    def estimate(self, text, digest=None):
+        """Estimated tokens in text; pass its prompt digest when it is already known"""
+        if digest is None:
+            digest = prompt_digest(text)
+        count = self.cached(digest)
+        if count is None:
+            # Count the normalized text so the value matches every text sharing the digest
+            count = count_tokens(normalize_prompt(text))
+            self._store(digest, count)
+        return count
+
+
+_estimator = TokenEstimator()
+
+
+def estimate_tokens(text, digest=None):
+    """Estimated tokens in text, cached process-wide by digest"""
+    return _estimator.estimate(text, digest)
+
+
+def cached_token_count(digest):
+    """Cached estimate for a digest, or None if it has not been counted yet"""
+    return _estimator.cached(digest)
+
+
+def format_tokens(count):
+    """Short display form of a token estimate"""
+    return f"≈{count:,} tokens"